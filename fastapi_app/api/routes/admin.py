@@ -1,9 +1,16 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, Header, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, UploadFile, File, HTTPException, Header, Depends, Query
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 
-from database.database import get_db
-from api.services.excel_service import ExcelImportService
+from database.database import get_async_read_db
+from database.models import College
+from api.schemas.college import SearchCacheStats
+from api.schemas.import_job import ImportJobAccepted, ImportStatusResponse
+from api.services.excel_service import ExcelImportService, IMPORT_CHUNK_SIZE
+from api.services.import_job_service import ImportJobService
+from api.services.search_cache import search_cache
 
 router = APIRouter()
 
@@ -17,25 +24,49 @@ def require_admin(x_admin_token: Optional[str] = Header(None)):
     return True
 
 
-@router.post("/colleges/import-excel")
+@router.post("/colleges/import-excel", response_model=ImportJobAccepted, status_code=202)
 async def import_colleges_excel(
     file: UploadFile = File(...),
+    bulk: bool = Query(True, description="Set-based upsert in chunks; false for the row-by-row importer"),
+    chunk_size: int = Query(IMPORT_CHUNK_SIZE, ge=1, le=50_000),
+    streaming: bool = Query(True, description="Spool to disk and read rows with constant memory"),
     _: bool = Depends(require_admin),
-    db: Session = Depends(get_db),
 ):
     if not file.filename.endswith((".xlsx", ".xls")):
         raise HTTPException(status_code=400, detail="Only Excel files are supported (.xlsx/.xls)")
 
-    try:
-        report = ExcelImportService.import_excel(file, db)
-        return {"status": "ok", "report": report}
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=str(e))
+    # The upload is closed once this request ends, so keep a copy for the worker
+    path = await run_in_threadpool(ExcelImportService.save_upload, file)
+    job = ImportJobService.submit(path, file.filename, bulk=bulk, chunk_size=chunk_size, streaming=streaming)
+    return ImportJobAccepted(
+        job_id=job.id,
+        status_url=f"/api/admin/colleges/import-status?job_id={job.id}",
+    )
 
 
-@router.get("/colleges/import-status")
-async def import_status(db: Session = Depends(get_db)):
-    # Minimal status for MVP – count rows
-    from fastapi_app.database.models import College
-    count = db.query(College).count()
-    return {"colleges_count": count} 
\ No newline at end of file
+@router.get("/colleges/import-status", response_model=ImportStatusResponse)
+async def import_status(
+    job_id: Optional[str] = Query(None, description="Defaults to the most recent import"),
+    db: AsyncSession = Depends(get_async_read_db),
+    _: bool = Depends(require_admin),
+):
+    if job_id:
+        job = ImportJobService.get_job(job_id)
+        if not job:
+            raise HTTPException(status_code=404, detail="Import job not found")
+    else:
+        job = ImportJobService.latest_job()
+
+    count = (await db.execute(select(func.count()).select_from(College))).scalar_one()
+    return ImportStatusResponse(colleges_count=count, job=job)
+
+
+@router.get("/search-cache", response_model=SearchCacheStats)
+async def search_cache_stats(_: bool = Depends(require_admin)):
+    return search_cache.stats()
+
+
+@router.delete("/search-cache", response_model=SearchCacheStats)
+async def clear_search_cache(_: bool = Depends(require_admin)):
+    search_cache.clear()
+    return search_cache.stats()
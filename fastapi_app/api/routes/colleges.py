@@ -1,30 +1,277 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from typing import List
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from typing import Awaitable, Callable, List, Literal, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from database.database import get_db
-from api.schemas.college import CollegeSearchRequest, CollegeResponse
-from api.services.college_service import CollegeService
+from database.database import ReadSessionLocal, get_async_read_db
+from api.schemas.college import ChangeFeedResponse, CollegeBatchSearchRequest, CollegeIdsRequest, CollegeSort, CollegeSearchRequest, CollegeMultiSearchRequest, CollegeResponse, TextSearchResult, FacetCountsResponse, NearbyCollege, Suggestion
+from api.services.catalog_service import CatalogService, RESPONSE_COLUMNS
+from api.services.change_log_service import CHANGE_FEED_LIMIT, ChangeLogService
+from api.services.college_service import AsyncCollegeService, MISSING_IDS_HEADER
+from api.services.export_service import EXPORT_FORMATS, GZIP_FORMATS, ExportService
+from api.services.geo_service import city_coordinates
+from api.services.text_search_service import TextSearchService
+from api.services.http_cache import accepts_encoding, conditional
+from api.services.json_encoding import FastJSONResponse, college_dicts, dumps
+from api.services.search_cache import search_cache, search_key
+from api.services.pagination import InvalidCursor, NEXT_CURSOR_HEADER, decode_cursor, next_cursor
 
 router = APIRouter()
 
+# Ids accepted in the GET ?ids= form; longer lists go through POST /by-ids
+MAX_QUERY_IDS = 200
+
+
+# Returned whatever ``fields`` asks for (id for lookups, name for cursors)
+ALWAYS_INCLUDED_FIELDS = ("id", "name")
+FIELDS_DESCRIPTION = (
+    "Comma-separated CollegeResponse fields to return (id and name are always included); "
+    "omit for all fields"
+)
+
+
+def _columns(fields: Optional[str]) -> tuple:
+    """Response columns for a ``fields`` projection, in schema order"""
+    if fields is None:
+        return RESPONSE_COLUMNS
+    requested = {f.strip() for f in fields.split(",") if f.strip()}
+    unknown = requested - set(RESPONSE_COLUMNS)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    requested.update(ALWAYS_INCLUDED_FIELDS)
+    return tuple(c for c in RESPONSE_COLUMNS if c in requested)
+
+
+def _college_list(colleges, response: Response) -> FastJSONResponse:
+    """College rows encoded without per-row validation, keeping headers set on ``response``"""
+    return FastJSONResponse(college_dicts(colleges), headers=dict(response.headers))
+
+
 @router.get("/", response_model=List[CollegeResponse])
 async def list_colleges(
+    request: Request,
+    response: Response,
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None, description=f"Opaque cursor from the {NEXT_CURSOR_HEADER} header of the previous page"),
+    sort: CollegeSort = Query("name_asc", description="Cursors are only issued for name_asc; other orders page by offset"),
+    ids: Optional[str] = Query(None, description=f"Comma-separated ids to fetch in this order (up to {MAX_QUERY_IDS}); paging parameters are ignored"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    columns = _columns(fields)
+    # Validate everything before answering 304, so a bad request never looks unchanged
+    requested = None
+    if ids is not None:
+        try:
+            requested = [int(i) for i in ids.split(",") if i.strip()]
+        except ValueError:
+            raise HTTPException(status_code=400, detail="ids must be comma-separated integers")
+        if not requested or len(requested) > MAX_QUERY_IDS:
+            raise HTTPException(status_code=400, detail=f"ids must list between 1 and {MAX_QUERY_IDS} ids")
+    elif cursor and sort != "name_asc":
+        raise HTTPException(status_code=400, detail="cursor is only supported with sort=name_asc")
+    try:
+        after = decode_cursor(cursor, (str, int)) if cursor and requested is None else None
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # Every page is a function of the table contents, so it revalidates against the
+    # catalog version; cursor pages are read from SQL and validated against the table
+    version = await AsyncCollegeService.catalog_version(db, fresh=after is not None)
+    unchanged = conditional(request, response, version.etag, version.last_modified)
+    if unchanged:
+        return unchanged
+
+    if requested is not None:
+        return await _colleges_by_ids(db, requested, response, columns)
+
+    colleges = await AsyncCollegeService.list_colleges(
+        db, limit=limit, offset=offset, after=after, sort=sort, columns=columns
+    )
+    cursor = next_cursor(colleges, limit, "name", "id") if sort == "name_asc" else None
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
+    return _college_list(colleges, response)
+
+
+@router.post("/by-ids", response_model=List[CollegeResponse])
+async def colleges_by_ids(
+    payload: CollegeIdsRequest,
+    response: Response,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """Colleges for a list of ids, in request order; unknown ids are listed in the X-Missing-Ids header"""
+    return await _colleges_by_ids(db, payload.ids, response, _columns(fields))
+
+
+async def _colleges_by_ids(db: AsyncSession, ids: List[int], response: Response, columns: tuple = RESPONSE_COLUMNS):
+    colleges, missing = await AsyncCollegeService.get_colleges(db, ids, columns)
+    if missing:
+        response.headers[MISSING_IDS_HEADER] = ",".join(map(str, missing))
+    return _college_list(colleges, response)
+
+
+@router.get("/text-search", response_model=List[TextSearchResult])
+async def text_search(
+    q: str = Query(..., min_length=1, max_length=200),
+    program_type: Optional[str] = Query(None),
+    budget_range: Optional[str] = Query(None),
+    location: Optional[str] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    if not TextSearchService.available():
+        raise HTTPException(status_code=501, detail="Full-text search is not available on this database")
+
+    filters = CollegeSearchRequest(program_type=program_type, budget_range=budget_range, location=location)
+    matches = await AsyncCollegeService.text_search(db, q, filters, limit=limit)
+    return [
+        TextSearchResult(**CollegeResponse.model_validate(college).model_dump(), rank=rank, snippet=snippet)
+        for college, rank, snippet in matches
+    ]
+
+
+@router.get("/suggest", response_model=List[Suggestion])
+async def suggest(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=50),
 ):
-    return CollegeService.list_colleges(db, limit=limit, offset=offset)
+    """School and program names for search-as-you-type, most programs first"""
+    return await AsyncCollegeService.suggest(q, limit=limit)
+
+
+@router.get("/near", response_model=List[NearbyCollege])
+async def near(
+    lat: Optional[float] = Query(None, ge=-90, le=90),
+    lon: Optional[float] = Query(None, ge=-180, le=180),
+    city: Optional[str] = Query(None, description="Search around a known city instead of lat/lon"),
+    country: Optional[str] = Query(None),
+    radius_km: Optional[float] = Query(None, gt=0, le=20_000),
+    k: int = Query(20, ge=1, le=200),
+):
+    """The k programs nearest a point or city, optionally within radius_km, nearest first"""
+    if city:
+        coordinates = city_coordinates(city, country)
+        if coordinates is None:
+            raise HTTPException(status_code=404, detail="Unknown city")
+        lat, lon = coordinates
+    elif lat is None or lon is None:
+        raise HTTPException(status_code=400, detail="Either lat and lon or city is required")
+
+    matches = await AsyncCollegeService.near(lat, lon, k=k, radius_km=radius_km)
+    return [NearbyCollege(**college, distance_km=distance) for college, distance in matches]
+
+
+@router.get("/changes", response_model=ChangeFeedResponse)
+async def changes(
+    since: int = Query(0, ge=0, description="Catalog version the client last synced to; 0 for everything"),
+    limit: int = Query(CHANGE_FEED_LIMIT, ge=1, le=10_000),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """Colleges inserted, updated or deleted after version ``since``, one entry per college"""
+    if not ChangeLogService.available():
+        raise HTTPException(status_code=501, detail="The change feed is not available on this database")
+    return FastJSONResponse(await AsyncCollegeService.changes(db, since, limit))
+
+
+@router.get("/facets", response_model=FacetCountsResponse)
+async def get_facets(
+    program_type: Optional[str] = Query(None),
+    budget_range: Optional[str] = Query(None),
+    location: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    filters = CollegeSearchRequest(program_type=program_type, budget_range=budget_range, location=location)
+    return await AsyncCollegeService.get_facets(db, filters)
+
+
+@router.get("/export", response_class=StreamingResponse)
+def export_colleges(
+    request: Request,
+    format: Literal["ndjson", "csv", "parquet"] = Query("ndjson"),
+    program_type: Optional[str] = Query(None),
+    budget_range: Optional[str] = Query(None),
+    location: Optional[str] = Query(None),
+    sort: CollegeSort = Query("name_asc"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+):
+    """Every program matching the search filters, streamed in one response
+
+    NDJSON and CSV are gzip-compressed when the client accepts it; Parquet needs pyarrow.
+    """
+    if not ExportService.available(format):
+        raise HTTPException(status_code=501, detail=f"{format} export is not available on this server")
+    columns = _columns(fields)
+    payload = CollegeSearchRequest(program_type=program_type, budget_range=budget_range, location=location, sort=sort)
+    compress = format in GZIP_FORMATS and accepts_encoding(request.headers.get("accept-encoding", ""), "gzip")
+    media_type, extension = EXPORT_FORMATS[format]
+    headers = {"Content-Disposition": f'attachment; filename="colleges.{extension}"', "Vary": "Accept-Encoding"}
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(
+        ExportService.stream(ReadSessionLocal, format, payload, columns, compress=compress),
+        media_type=media_type,
+        headers=headers,
+    )
 
 
 @router.get("/{college_id}", response_model=CollegeResponse)
-async def get_college(college_id: int, db: Session = Depends(get_db)):
-    college = CollegeService.get_college(db, college_id)
+async def get_college(college_id: int, request: Request, response: Response, db: AsyncSession = Depends(get_async_read_db)):
+    college = await AsyncCollegeService.get_college(db, college_id)
     if not college:
         raise HTTPException(status_code=404, detail="College not found")
-    return college
+    modified = college.updated_at or college.created_at
+    # The row's change-log version moves on every write, even two in the same second
+    row_version = await AsyncCollegeService.college_version(db, college_id)
+    if row_version is not None:
+        etag = f'"{college.id}-v{row_version}"'
+    elif modified is not None:
+        etag = f'"{college.id}-{modified:%Y%m%d%H%M%S%f}"'
+    else:
+        etag = (await AsyncCollegeService.catalog_version(db, fresh=True)).etag
+    unchanged = conditional(request, response, etag, modified)
+    return unchanged or college
 
 
 @router.post("/search", response_model=List[CollegeResponse])
-async def search_colleges(payload: CollegeSearchRequest, db: Session = Depends(get_db)):
-    return CollegeService.search_colleges(db, payload) 
\ No newline at end of file
+async def search_colleges(
+    payload: CollegeSearchRequest,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    columns = _columns(fields)
+    return await _cached_search(
+        "search", payload, columns, lambda: AsyncCollegeService.search_colleges(db, payload, columns)
+    )
+
+
+@router.post("/search/batch", response_model=List[List[CollegeResponse]])
+async def batch_search_colleges(payload: CollegeBatchSearchRequest, db: AsyncSession = Depends(get_async_read_db)):
+    """Run several searches at once; returns one result list per query, in order"""
+    results = await AsyncCollegeService.batch_search(db, payload.queries)
+    return FastJSONResponse([college_dicts(colleges) for colleges in results])
+
+
+@router.post("/search/multi", response_model=List[CollegeResponse])
+async def multi_search_colleges(
+    payload: CollegeMultiSearchRequest,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    columns = _columns(fields)
+    return await _cached_search(
+        "multi", payload, columns, lambda: AsyncCollegeService.multi_search_colleges(db, payload, columns)
+    )
+
+
+async def _cached_search(kind: str, payload, columns: tuple, search: Callable[[], Awaitable]) -> Response:
+    """Serve a search from the response cache, running and caching ``search`` on a miss"""
+    generation = CatalogService.generation()
+    key = search_key(kind, payload, columns)
+    body = search_cache.get(key, generation)
+    if body is None:
+        body = dumps(college_dicts(await search()))
+        search_cache.put(key, generation, body)
+    return FastJSONResponse(body)
@@ -3,61 +3,149 @@ User Profile API Routes
 Handles user profile creation, retrieval, and management
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from typing import List
-
-from database.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Iterator, List, Optional
+from datetime import datetime
+import json
+
+from database.database import ReadSessionLocal, get_async_db, get_async_read_db
 from api.schemas.user_profile import UserProfileCreate, UserProfileResponse, UserProfileUpdate
-from api.services.user_profile_service import UserProfileService
+from api.schemas.college import CollegeResponse
+from api.schemas.recommendation import BatchMatchRequest, Recommendation
+from api.services.user_profile_service import AsyncUserProfileService
+from api.services.recommendation_service import AsyncRecommendationService, RecommendationService
+from api.services.pagination import InvalidCursor, NEXT_CURSOR_HEADER, decode_cursor, encode_cursor, next_cursor
 
 router = APIRouter()
 
 
 @router.post("/", response_model=UserProfileResponse, status_code=201)
-async def create_user_profile(
-    profile_data: UserProfileCreate,
-    db: Session = Depends(get_db)
-):
+async def create_user_profile(profile_data: UserProfileCreate):
     """
     Create a new user profile or update existing one
     
     If a profile with the same email exists, it will be updated.
     """
-    profile = UserProfileService.create_user_profile(db, profile_data)
+    profile = await AsyncUserProfileService.create_user_profile(profile_data)
     return profile
 
 
+@router.post("/matches")
+def batch_matches(payload: BatchMatchRequest):
+    """
+    Match many profiles against the catalog at once
+    
+    Streams one JSON object per line (NDJSON): ``{"profile_id", "email", "matches":
+    [{"college_id", "score"}, ...]}`` per profile, best match first. Requested
+    emails that were not matched are reported with an ``error`` at the end:
+    "Excluded by filter" when the profile fails ``filter``, else "User profile not found".
+    """
+    return StreamingResponse(_stream_matches(payload), media_type="application/x-ndjson")
+
+
+def _stream_matches(payload: BatchMatchRequest) -> Iterator[str]:
+    # The response outlives the request's dependencies, so the stream owns its session
+    db = ReadSessionLocal()
+    try:
+        for result in RecommendationService.batch_matches(
+            db, payload.emails, payload.filter, k=payload.k, min_score=payload.min_score
+        ):
+            yield json.dumps(result) + "\n"
+    finally:
+        db.close()
+
+
 @router.get("/", response_model=List[UserProfileResponse])
 async def list_user_profiles(
+    response: Response,
     limit: int = Query(100, ge=1, le=500),
     offset: int = Query(0, ge=0),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description=f"Opaque cursor from the {NEXT_CURSOR_HEADER} header of the previous page"),
+    db: AsyncSession = Depends(get_async_read_db)
 ):
-    """List all user profiles with pagination"""
-    profiles = UserProfileService.list_user_profiles(db, limit=limit, offset=offset)
+    """
+    List all user profiles with pagination
+    
+    Pass the X-Next-Cursor header of a page as ``cursor`` to fetch the next one;
+    offset paging is still supported but gets slower on deep pages.
+    """
+    try:
+        after = decode_cursor(cursor, (datetime, int)) if cursor else None
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    profiles = await AsyncUserProfileService.list_user_profiles(db, limit=limit, offset=offset, after=after)
+    cursor = next_cursor(profiles, limit, "created_at", "id")
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
     return profiles
 
 
 @router.get("/{email}", response_model=UserProfileResponse)
 async def get_user_profile(
     email: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """Get user profile by email"""
-    profile = UserProfileService.get_user_profile(db, email)
+    profile = await AsyncUserProfileService.get_user_profile(db, email)
     if not profile:
         raise HTTPException(status_code=404, detail="User profile not found")
     return profile
 
 
+@router.get("/{email}/recommendations", response_model=List[Recommendation])
+async def get_recommendations(
+    email: str,
+    k: int = Query(20, ge=1, le=200),
+):
+    """Top-k catalog programs for a profile, best match first"""
+    recommendations = await AsyncRecommendationService.recommend(email, k)
+    if recommendations is None:
+        raise HTTPException(status_code=404, detail="User profile not found")
+    return [Recommendation(**college, score=score) for college, score in recommendations]
+
+
+@router.get("/{email}/matches", response_model=List[Recommendation])
+async def list_matches(
+    email: str,
+    response: Response,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description=f"Opaque cursor from the {NEXT_CURSOR_HEADER} header of the previous page"),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Stored catalog matches of a profile, best first
+    
+    Served from the materialized profile_matches table, which holds every
+    program scoring at least PROFILE_MATCH_MIN_SCORE and is kept current as
+    profiles and colleges change.
+    """
+    try:
+        after = decode_cursor(cursor, (float, int)) if cursor else None
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    matches = await AsyncUserProfileService.list_matches(db, email, limit=limit, after=after)
+    if matches is None:
+        raise HTTPException(status_code=404, detail="User profile not found")
+    if len(matches) == limit:
+        college, score = matches[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(score, college.id)
+    return [
+        Recommendation(**CollegeResponse.model_validate(college).model_dump(), score=score)
+        for college, score in matches
+    ]
+
+
 @router.get("/id/{profile_id}", response_model=UserProfileResponse)
 async def get_user_profile_by_id(
     profile_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """Get user profile by ID"""
-    profile = UserProfileService.get_user_profile_by_id(db, profile_id)
+    profile = await AsyncUserProfileService.get_user_profile_by_id(db, profile_id)
     if not profile:
         raise HTTPException(status_code=404, detail="User profile not found")
     return profile
@@ -67,10 +155,9 @@ async def get_user_profile_by_id(
 async def update_user_profile(
     email: str,
     profile_data: UserProfileUpdate,
-    db: Session = Depends(get_db)
 ):
     """Update user profile"""
-    profile = UserProfileService.update_user_profile(db, email, profile_data)
+    profile = await AsyncUserProfileService.update_user_profile(email, profile_data)
     if not profile:
         raise HTTPException(status_code=404, detail="User profile not found")
     return profile
@@ -79,10 +166,10 @@ async def update_user_profile(
 @router.delete("/{email}", status_code=204)
 async def delete_user_profile(
     email: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete user profile"""
-    success = UserProfileService.delete_user_profile(db, email)
+    success = await AsyncUserProfileService.delete_user_profile(db, email)
     if not success:
         raise HTTPException(status_code=404, detail="User profile not found")
     return None
@@ -1,5 +1,6 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from datetime import date
+from typing import Dict, List, Literal, Optional
 
 PROGRAM_TYPES = (
     "Graphic Design",
@@ -25,11 +26,81 @@ LOCATIONS = (
     "Any",
 )
 
+# Countries grouped by the continent values accepted in ``location``
+CONTINENT_COUNTRIES = {
+    "North America": ("USA", "United States", "Canada", "Mexico"),
+    "Europe": ("UK", "United Kingdom", "Germany", "France", "Italy", "Spain", "Netherlands", "Sweden", "Denmark", "Finland", "Norway", "Belgium", "Portugal", "Switzerland", "Austria", "Poland", "Ireland"),
+    "Asia": ("India", "China", "Japan", "South Korea", "Singapore", "Hong Kong", "Taiwan", "Thailand", "Malaysia", "Indonesia", "Philippines", "Vietnam"),
+    "Australia": ("Australia", "New Zealand"),
+}
+
+# (low, high) tuition bounds per budget range; a college matches when
+# tuition_min <= high and tuition_max is unknown or >= low
+BUDGET_BOUNDS = {
+    "Under 20k": (None, 20000),
+    "20k-40k": (20000, 40000),
+    "40k-60k": (40000, 60000),
+    "Over 60k": (60000, None),
+}
+
+# Sort keys as column tuples; every key ends in id so the order is total
+SORT_KEYS = {
+    "name": ("name", "id"),
+    "tuition": ("tuition_min", "name", "id"),  # unknown tuition sorts first
+    "location": ("location_city", "location_country", "name", "id"),
+    "program_type": ("program_type", "name", "id"),
+}
+
+# Orders accepted in ``sort``: (sort key, descending). A descending order is
+# the exact reverse of its ascending one, so both can share one index/permutation.
+SORT_ORDERS = {
+    "name_asc": ("name", False),
+    "name_desc": ("name", True),
+    "tuition_asc": ("tuition", False),
+    "tuition_desc": ("tuition", True),
+    "location": ("location", False),
+    "program_type": ("program_type", False),
+}
+
+CollegeSort = Literal["name_asc", "name_desc", "tuition_asc", "tuition_desc", "location", "program_type"]
+
 
 class CollegeSearchRequest(BaseModel):
     program_type: Optional[str] = Field(default=None)
     budget_range: Optional[str] = Field(default=None)
     location: Optional[str] = Field(default=None)
+    sort: CollegeSort = Field(default="name_asc")
+
+
+class CollegeMultiSearchRequest(BaseModel):
+    """Multi-select search: values within a field are OR-ed, fields are AND-ed.
+
+    An empty list leaves that field unconstrained, as does "Any" in locations.
+    """
+    program_types: List[str] = Field(default_factory=list)
+    budget_ranges: List[str] = Field(default_factory=list)
+    locations: List[str] = Field(default_factory=list)
+    degree_levels: List[str] = Field(default_factory=list)
+    # Programs whose tuition_max is at most this (unknown tuition_max passes)
+    max_tuition: Optional[float] = Field(default=None, ge=0)
+    sort: CollegeSort = Field(default="name_asc")
+
+
+# Upper bound on searches per POST /search/batch request
+MAX_BATCH_QUERIES = 50
+
+
+class CollegeBatchSearchRequest(BaseModel):
+    """Several searches evaluated together; results come back in the same order"""
+    queries: List[CollegeSearchRequest] = Field(..., min_length=1, max_length=MAX_BATCH_QUERIES)
+
+
+# Upper bound on ids per batch lookup (POST /by-ids; GET ?ids= is bounded by URL length)
+MAX_BATCH_IDS = 1000
+
+
+class CollegeIdsRequest(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=MAX_BATCH_IDS)
 
 
 class CollegeResponse(BaseModel):
@@ -42,11 +113,65 @@ class CollegeResponse(BaseModel):
     degree_level: str
     tuition_min: float | None = None
     tuition_max: float | None = None
-    application_deadline: Optional[str] = None
+    application_deadline: Optional[date] = None
     program_description: Optional[str] = None
     admission_requirements: Optional[str] = None
     contact_email: Optional[str] = None
     website_url: Optional[str] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
 
     class Config:
-        from_attributes = True 
\ No newline at end of file
+        from_attributes = True 
+
+
+class TextSearchResult(CollegeResponse):
+    rank: float  # BM25 score; lower is a better match
+    snippet: str  # best-matching fragment with <mark> highlights
+
+
+class NearbyCollege(CollegeResponse):
+    distance_km: float  # great-circle distance from the query point
+
+
+class CollegeChange(BaseModel):
+    version: int
+    op: Literal["upsert", "delete"]
+    id: int
+    college: Optional[CollegeResponse] = None  # current row; None for deletions
+
+
+class ChangeFeedResponse(BaseModel):
+    changes: List[CollegeChange]  # latest change per college, oldest first
+    next_since: int  # ``since`` for the next request
+    has_more: bool
+    version: int  # newest catalog version
+
+
+class Suggestion(BaseModel):
+    text: str
+    field: Literal["name", "program_name"]
+    programs: int  # programs carrying this name
+
+
+class FacetCountsResponse(BaseModel):
+    total: int
+    program_type: Dict[str, int]
+    degree_level: Dict[str, int]
+    country: Dict[str, int]
+    continent: Dict[str, int]
+    budget_range: Dict[str, int]  # a college counts in every range its tuition overlaps
+
+
+class SearchCacheStats(BaseModel):
+    hits: int
+    misses: int
+    evictions: int  # least recently used entries dropped to stay within maxsize
+    expirations: int  # entries found older than ttl_seconds
+    invalidations: int  # whole-cache drops after an import or an explicit clear
+    hit_rate: float
+    entries: int
+    bytes: int
+    maxsize: int
+    ttl_seconds: float
+    generation: int  # catalog generation the cached entries belong to
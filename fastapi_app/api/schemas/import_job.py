@@ -0,0 +1,39 @@
+"""
+Import job schemas for the admin API
+"""
+
+from pydantic import BaseModel
+from typing import Dict, Optional
+from datetime import datetime
+
+
+class ImportJobResponse(BaseModel):
+    """Progress and outcome of a background Excel import"""
+    id: str
+    filename: str
+    status: str  # queued | running | completed | failed | post_processing_failed
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    rows_processed: int
+    rows_per_second: float
+    inserted: int
+    updated: int
+    skipped: int
+    report: Optional[Dict[str, int]] = None
+    error: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
+class ImportJobAccepted(BaseModel):
+    """Returned when an import has been queued"""
+    status: str = "accepted"
+    job_id: str
+    status_url: str
+
+
+class ImportStatusResponse(BaseModel):
+    colleges_count: int
+    job: Optional[ImportJobResponse] = None
@@ -0,0 +1,29 @@
+"""
+Recommendation schemas
+"""
+
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+from api.schemas.college import CollegeResponse
+
+
+class Recommendation(CollegeResponse):
+    """A catalog program ranked for a user profile"""
+    score: float  # weighted match in [0, 1]; lower when international programs are excluded
+
+
+class ProfileFilter(BaseModel):
+    """Exact-match filter over user_profiles; unset fields are unconstrained"""
+    education_level: Optional[str] = None
+    program_interest: Optional[str] = None
+    budget_range: Optional[str] = None
+    location_preference: Optional[str] = None
+
+
+class BatchMatchRequest(BaseModel):
+    """Profiles to match: the listed emails, all profiles passing ``filter``, or both combined"""
+    emails: Optional[List[str]] = Field(default=None, max_length=100_000)
+    filter: Optional[ProfileFilter] = None
+    k: int = Field(default=10, ge=1, le=200)
+    min_score: Optional[float] = Field(default=None, ge=0, le=1)
@@ -0,0 +1,441 @@
+"""
+In-memory columnar catalog of colleges.
+
+The colleges table is small and changes only on Excel imports, so searches can
+be answered from NumPy columns instead of a SQL round-trip per request. The
+catalog is loaded at startup and rebuilt after every import; readers always see
+either the old or the new snapshot, never a partially built one.
+
+With CATALOG_SNAPSHOT_DIR set, a rebuilt catalog is also compiled into a
+snapshot file (see catalog_snapshot) that every worker memory-maps instead of
+holding its own copy. The generation file in that directory names the current
+snapshot; workers check it at most every CATALOG_SNAPSHOT_POLL seconds and map
+a newer one as soon as it is published. Mapping it starts a new generation,
+and the per-process state derived from the catalog (search response cache,
+suggestion and proximity indexes, recommendation features, list ETag) is
+rebuilt or dropped when the generation changes, so an import in one worker
+reaches all of them. Without a snapshot directory each worker only sees the
+imports it ran itself until it restarts.
+"""
+
+import glob
+import hashlib
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from database.database import project_path
+from database.models import College, CollegeChange
+from api.schemas.college import (
+    CollegeSearchRequest, CollegeMultiSearchRequest, BUDGET_BOUNDS, CONTINENT_COUNTRIES, SORT_KEYS, SORT_ORDERS,
+)
+from api.services.catalog_snapshot import CatalogSnapshot, IdPositions, write_snapshot
+
+CATALOG_ENABLED = os.getenv("IN_MEMORY_CATALOG", "true").lower() == "true"
+# Directory of the shared snapshot files, relative to the project root; empty keeps
+# the catalog private to each process
+SNAPSHOT_DIR = os.getenv("CATALOG_SNAPSHOT_DIR", "")
+if SNAPSHOT_DIR:
+    SNAPSHOT_DIR = project_path(SNAPSHOT_DIR)
+SNAPSHOT_POLL_INTERVAL = float(os.getenv("CATALOG_SNAPSHOT_POLL", "1"))
+GENERATION_FILE = "catalog.generation"
+
+# Columns returned to clients (mirrors CollegeResponse)
+RESPONSE_COLUMNS = (
+    "id",
+    "name",
+    "location_city",
+    "location_country",
+    "program_name",
+    "program_type",
+    "degree_level",
+    "tuition_min",
+    "tuition_max",
+    "application_deadline",
+    "program_description",
+    "admission_requirements",
+    "contact_email",
+    "website_url",
+    "latitude",
+    "longitude",
+)
+
+
+def _encode(values: Sequence) -> tuple:
+    """Dictionary-encode a string column into (codes, vocabulary, lookup)."""
+    vocabulary: List[str] = []
+    lookup: Dict[str, int] = {}
+    codes = np.empty(len(values), dtype=np.int32)
+    for i, value in enumerate(values):
+        code = lookup.get(value)
+        if code is None:
+            code = lookup[value] = len(vocabulary)
+            vocabulary.append(value)
+        codes[i] = code
+    return codes, vocabulary, lookup
+
+
+class ColumnarCatalog:
+    """Immutable column-oriented snapshot of the colleges table."""
+
+    def __init__(self, rows: Sequence[tuple], generation: int = 0):
+        self.generation = generation
+        self.size = len(rows)
+        columns = list(zip(*rows)) if rows else [()] * len(RESPONSE_COLUMNS)
+        self.columns: Dict[str, np.ndarray] = {}
+        for name, values in zip(RESPONSE_COLUMNS, columns):
+            column = np.empty(self.size, dtype=object)
+            column[:] = values
+            self.columns[name] = column
+
+        self.ids = np.asarray(self.columns["id"], dtype=np.int64)
+        self.tuition_min = np.array([np.nan if v is None else v for v in self.columns["tuition_min"]], dtype=np.float64)
+        self.tuition_max = np.array([np.nan if v is None else v for v in self.columns["tuition_max"]], dtype=np.float64)
+        self.program_type, self.program_type_values, self.program_type_lookup = _encode(self.columns["program_type"])
+        self.degree_level, self.degree_level_values, self.degree_level_lookup = _encode(self.columns["degree_level"])
+        self.country, self.country_values, self.country_lookup = _encode(self.columns["location_country"])
+
+        self.orders = self._build_orders()
+        self.name_order = self.orders["name_asc"]
+        self.position = {int(college_id): i for i, college_id in enumerate(self.ids)}
+        self.bitsets = self._build_bitsets()
+
+    @classmethod
+    def from_snapshot(cls, snapshot: CatalogSnapshot, generation: int = 0) -> "ColumnarCatalog":
+        """Catalog over a mapped snapshot; its arrays are views of the shared pages"""
+        catalog = cls.__new__(cls)
+        catalog.generation = generation
+        catalog.size = snapshot.size
+        catalog.columns = snapshot.columns()
+        for name in ("ids", "tuition_min", "tuition_max", "program_type", "degree_level", "country"):
+            setattr(catalog, name, snapshot.array(name))
+        for name, values in snapshot.vocabularies.items():
+            setattr(catalog, f"{name}_values", values)
+            setattr(catalog, f"{name}_lookup", {value: code for code, value in enumerate(values)})
+        catalog.orders = snapshot.orders()
+        catalog.name_order = catalog.orders["name_asc"]
+        catalog.position = IdPositions(catalog.ids)
+        catalog.bitsets = snapshot.bitsets()
+        return catalog
+
+    def _sort_rank(self, column: str) -> np.ndarray:
+        """Numeric key whose order matches SQLite's ORDER BY on ``column``"""
+        if column == "id":
+            return self.ids
+        if column in ("tuition_min", "tuition_max"):
+            # NULLs sort first in SQLite ascending order
+            values = getattr(self, column)
+            return np.where(np.isnan(values), -np.inf, values)
+        # Python str ordering is code point order, as is SQLite's BINARY collation on UTF-8
+        values = self.columns[column]
+        rank = {value: i for i, value in enumerate(sorted(set(values)))}
+        return np.fromiter((rank[v] for v in values), dtype=np.int64, count=self.size)
+
+    def _build_orders(self) -> Dict[str, np.ndarray]:
+        """Row permutation for every sort order; descending orders are reversed views"""
+        ranks: Dict[str, np.ndarray] = {}
+        ascending: Dict[str, np.ndarray] = {}
+        for key, columns in SORT_KEYS.items():
+            for column in columns:
+                if column not in ranks:
+                    ranks[column] = self._sort_rank(column)
+            # np.lexsort sorts by the last key first
+            ascending[key] = np.lexsort([ranks[c] for c in reversed(columns)]).astype(np.int64)
+        return {
+            sort: ascending[key][::-1] if descending else ascending[key]
+            for sort, (key, descending) in SORT_ORDERS.items()
+        }
+
+    def _build_bitsets(self) -> Dict[str, Dict[str, np.ndarray]]:
+        """Packed per-value row bitsets for the multi-select filter fields"""
+        packed = np.packbits
+        bitsets: Dict[str, Dict[str, np.ndarray]] = {
+            "program_type": {v: packed(self.program_type == c) for c, v in enumerate(self.program_type_values)},
+            "degree_level": {v: packed(self.degree_level == c) for c, v in enumerate(self.degree_level_values)},
+            "budget_range": {b: packed(self.mask(CollegeSearchRequest(budget_range=b))) for b in BUDGET_BOUNDS},
+            "continent": {},
+        }
+        for continent in CONTINENT_COUNTRIES:
+            bitsets["continent"][continent] = packed(self.mask(CollegeSearchRequest(location=continent)))
+        return bitsets
+
+    def mask(self, payload: CollegeSearchRequest, cache: Optional[Dict[tuple, Optional[np.ndarray]]] = None) -> np.ndarray:
+        """Boolean row mask for the filters in a search request.
+
+        ``cache`` memoizes the per-filter masks across requests evaluated together.
+        """
+        mask = np.ones(self.size, dtype=bool)
+        for field in ("program_type", "budget_range", "location"):
+            key = (field, getattr(payload, field))
+            if cache is not None and key in cache:
+                component = cache[key]
+            else:
+                component = self._filter_mask(*key)
+                if cache is not None:
+                    cache[key] = component
+            if component is not None:
+                mask &= component
+        return mask
+
+    def _filter_mask(self, field: str, value) -> Optional[np.ndarray]:
+        """Row mask for one search filter, or None when it does not constrain"""
+        if field == "program_type" and value:
+            code = self.program_type_lookup.get(value)
+            if code is None:
+                return np.zeros(self.size, dtype=bool)
+            return self.program_type == code
+
+        if field == "budget_range" and value in BUDGET_BOUNDS:
+            low, high = BUDGET_BOUNDS[value]
+            mask = np.ones(self.size, dtype=bool)
+            # NaN comparisons are False, which mirrors SQL NULL semantics
+            if high is not None:
+                mask &= self.tuition_min <= high
+            if low is not None:
+                mask &= np.isnan(self.tuition_max) | (self.tuition_max >= low)
+            return mask
+
+        if field == "location" and value in CONTINENT_COUNTRIES:
+            codes = [self.country_lookup[c] for c in CONTINENT_COUNTRIES[value] if c in self.country_lookup]
+            return np.isin(self.country, codes)
+
+        return None
+
+    def multi_mask(self, payload: CollegeMultiSearchRequest) -> np.ndarray:
+        """Row mask for a multi-select request: OR of bitsets within a field, AND across fields"""
+        bits = None
+        for field, values in (
+            ("program_type", payload.program_types),
+            ("degree_level", payload.degree_levels),
+            ("budget_range", payload.budget_ranges),
+            ("continent", [] if "Any" in payload.locations else payload.locations),
+        ):
+            if not values:
+                continue
+            field_bits = np.zeros((self.size + 7) // 8, dtype=np.uint8)
+            for value in values:
+                bitset = self.bitsets[field].get(value)
+                if bitset is not None:
+                    field_bits |= bitset
+            bits = field_bits if bits is None else bits & field_bits
+
+        if bits is None:
+            mask = np.ones(self.size, dtype=bool)
+        else:
+            mask = np.unpackbits(bits, count=self.size).astype(bool)
+
+        if payload.max_tuition is not None:
+            mask &= np.isnan(self.tuition_max) | (self.tuition_max <= payload.max_tuition)
+        return mask
+
+    def multi_search(
+        self, payload: CollegeMultiSearchRequest, limit: int = 200, columns: Sequence[str] = RESPONSE_COLUMNS
+    ) -> List[dict]:
+        return self.first(self.multi_mask(payload), payload.sort, limit, columns)
+
+    def search(
+        self, payload: CollegeSearchRequest, limit: int = 200, columns: Sequence[str] = RESPONSE_COLUMNS
+    ) -> List[dict]:
+        return self.first(self.mask(payload), payload.sort, limit, columns)
+
+    def search_many(self, payloads: Sequence[CollegeSearchRequest], limit: int = 200) -> List[List[dict]]:
+        """One result list per request; filter masks and repeated requests are evaluated once"""
+        cache: Dict[tuple, Optional[np.ndarray]] = {}
+        results: Dict[str, List[dict]] = {}
+        # Rows shared between result lists are materialized once
+        rows: Dict[int, dict] = {}
+        for payload in payloads:
+            key = payload.model_dump_json()
+            if key not in results:
+                indices = self.first_indices(self.mask(payload, cache), payload.sort, limit)
+                results[key] = [rows[i] if i in rows else rows.setdefault(i, self.row(i)) for i in indices.tolist()]
+        return [results[payload.model_dump_json()] for payload in payloads]
+
+    def first(self, mask: np.ndarray, sort: str, limit: int, columns: Sequence[str] = RESPONSE_COLUMNS) -> List[dict]:
+        """The first ``limit`` rows of ``mask`` in ``sort`` order"""
+        return self.rows(self.first_indices(mask, sort, limit), columns)
+
+    def first_indices(self, mask: np.ndarray, sort: str, limit: int) -> np.ndarray:
+        order = self.orders[sort]
+        return order[mask[order]][:limit]
+
+    def page(self, sort: str, offset: int, limit: int, columns: Sequence[str] = RESPONSE_COLUMNS) -> List[dict]:
+        """An unfiltered page in ``sort`` order; a slice of the precomputed permutation"""
+        return self.rows(self.orders[sort][offset:offset + limit], columns)
+
+    def row(self, index: int, columns: Sequence[str] = RESPONSE_COLUMNS) -> dict:
+        return {name: self.columns[name][index] for name in columns}
+
+    def rows(self, indices, columns: Sequence[str] = RESPONSE_COLUMNS) -> List[dict]:
+        return [self.row(i, columns) for i in indices]
+
+
+class CatalogVersion(NamedTuple):
+    """Validator for the colleges table as a whole (see http_cache)"""
+    etag: str
+    last_modified: Optional[datetime]
+
+
+_lock = threading.Lock()
+_catalog: Optional[ColumnarCatalog] = None
+_generation = 0
+_version: Optional[CatalogVersion] = None
+# File name of the mapped snapshot, and when to next look for a newer one
+_snapshot_name: Optional[str] = None
+_next_poll = 0.0
+
+
+class CatalogService:
+    @staticmethod
+    def get() -> Optional[ColumnarCatalog]:
+        """Current snapshot, or None when the catalog is disabled or not loaded yet."""
+        CatalogService._poll()
+        return _catalog
+
+    @staticmethod
+    def generation() -> int:
+        CatalogService._poll()
+        return _generation
+
+    @staticmethod
+    def version(db: Session) -> CatalogVersion:
+        """Validator of the current table contents, computed on refresh.
+
+        Derived from the table rather than the in-process generation so that
+        every worker, and a restarted one, issues the same ETag for the same data.
+        """
+        global _version
+        version = _version
+        if version is None:
+            version = _version = CatalogService.compute_version(db)
+        return version
+
+    @staticmethod
+    def cached_version() -> Optional[CatalogVersion]:
+        CatalogService._poll()
+        return _version
+
+    @staticmethod
+    def compute_version(db: Session) -> CatalogVersion:
+        """Validator of the table contents.
+
+        The latest change-log version moves on every write to colleges, unlike
+        the second-precision timestamps, so two edits within one second still
+        get different ETags. Count, max id and timestamps cover databases
+        without the change log.
+        """
+        count, max_id, created, updated = db.execute(
+            select(func.count(), func.max(College.id), func.max(College.created_at), func.max(College.updated_at))
+        ).one()
+        change = db.execute(select(func.max(CollegeChange.version))).scalar()
+        digest = hashlib.sha1(repr((change, count, max_id, created, updated)).encode()).hexdigest()[:16]
+        stamps = [t for t in (created, updated) if t is not None]
+        return CatalogVersion(etag=f'"{digest}"', last_modified=max(stamps) if stamps else None)
+
+    @staticmethod
+    def build(db: Session, generation: int = 0) -> ColumnarCatalog:
+        columns = [getattr(College, name) for name in RESPONSE_COLUMNS]
+        rows = db.execute(select(*columns).order_by(College.id)).all()
+        return ColumnarCatalog(rows, generation=generation)
+
+    @staticmethod
+    def refresh(db: Session) -> Optional[ColumnarCatalog]:
+        """Rebuild the snapshot from the database and swap it in atomically."""
+        global _catalog, _generation, _version
+        with _lock:
+            _generation += 1
+            _version = CatalogService.compute_version(db)
+            if not CATALOG_ENABLED:
+                return None
+            catalog = CatalogService.build(db, generation=_generation)
+            if SNAPSHOT_DIR:
+                catalog = CatalogService._publish(catalog, _version)
+            _catalog = catalog
+            return catalog
+
+    @staticmethod
+    def load(db: Session) -> Optional[ColumnarCatalog]:
+        """Startup: map the published snapshot when it matches the database, otherwise refresh"""
+        if CATALOG_ENABLED and SNAPSHOT_DIR:
+            name = CatalogService._published_name()
+            if name is not None:
+                try:
+                    snapshot = CatalogSnapshot(os.path.join(SNAPSHOT_DIR, name))
+                except (OSError, ValueError):
+                    snapshot = None
+                if snapshot is not None and snapshot.etag == CatalogService.compute_version(db).etag:
+                    with _lock:
+                        return CatalogService._install(snapshot, name)
+        return CatalogService.refresh(db)
+
+    @staticmethod
+    def _publish(catalog: ColumnarCatalog, version: CatalogVersion) -> ColumnarCatalog:
+        """Write ``catalog`` as the current snapshot and return the mapped copy (caller holds the lock)"""
+        global _snapshot_name
+        os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+        name = f"catalog-{time.time_ns()}-{os.getpid()}.snap"
+        path = os.path.join(SNAPSHOT_DIR, name)
+        last_modified = version.last_modified.isoformat() if version.last_modified else None
+        write_snapshot(path, catalog, RESPONSE_COLUMNS, (version.etag, last_modified))
+
+        pointer = os.path.join(SNAPSHOT_DIR, GENERATION_FILE)
+        with open(f"{pointer}.{os.getpid()}.tmp", "w") as fh:
+            fh.write(name)
+        os.replace(f"{pointer}.{os.getpid()}.tmp", pointer)
+        _snapshot_name = name
+
+        # Workers still on an older snapshot keep their mapping after the unlink
+        for old in glob.glob(os.path.join(SNAPSHOT_DIR, "catalog-*.snap")):
+            if os.path.basename(old) != name:
+                try:
+                    os.remove(old)
+                except OSError:
+                    pass
+        return ColumnarCatalog.from_snapshot(CatalogSnapshot(path), generation=catalog.generation)
+
+    @staticmethod
+    def _published_name() -> Optional[str]:
+        try:
+            with open(os.path.join(SNAPSHOT_DIR, GENERATION_FILE)) as fh:
+                return fh.read().strip() or None
+        except OSError:
+            return None
+
+    @staticmethod
+    def _install(snapshot: CatalogSnapshot, name: str) -> ColumnarCatalog:
+        """Swap in a snapshot published by any worker (caller holds the lock)"""
+        global _catalog, _generation, _version, _snapshot_name
+        _generation += 1
+        last_modified = datetime.fromisoformat(snapshot.last_modified) if snapshot.last_modified else None
+        _version = CatalogVersion(etag=snapshot.etag, last_modified=last_modified)
+        _catalog = ColumnarCatalog.from_snapshot(snapshot, generation=_generation)
+        _snapshot_name = name
+        return _catalog
+
+    @staticmethod
+    def _poll() -> None:
+        """Map a snapshot published by another worker since the last check"""
+        global _next_poll
+        if not (SNAPSHOT_DIR and CATALOG_ENABLED and _snapshot_name):
+            return
+        now = time.monotonic()
+        if now < _next_poll:
+            return
+        _next_poll = now + SNAPSHOT_POLL_INTERVAL
+        name = CatalogService._published_name()
+        if name is None or name == _snapshot_name:
+            return
+        with _lock:
+            if name != _snapshot_name:
+                try:
+                    snapshot = CatalogSnapshot(os.path.join(SNAPSHOT_DIR, name))
+                except (OSError, ValueError):
+                    # Replaced again before it could be mapped; the next poll picks up the newer one
+                    return
+                CatalogService._install(snapshot, name)
@@ -0,0 +1,265 @@
+"""
+Binary catalog snapshot file, memory-mapped read-only by every worker
+
+After an import the columnar catalog is compiled into one immutable file:
+fixed-width NumPy arrays (ids, tuition, filter codes, sort permutations,
+bitsets and one fixed-width column per response field) followed by a string
+table that every text column indexes into. Workers map the file read-only, so
+the arrays are zero-copy views of pages the kernel shares between processes;
+only the small vocabularies are decoded into Python objects.
+
+Layout: MAGIC, a little-endian uint64 header length, the JSON header (array
+offsets, dtypes and shapes, column kinds, vocabularies, catalog version), then
+the arrays, each aligned to ALIGNMENT bytes from the start of the data section.
+"""
+
+import json
+import mmap
+import os
+from datetime import date
+from typing import Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from api.schemas.college import SORT_ORDERS
+
+MAGIC = b"CATSNAP1"
+ALIGNMENT = 64
+# application_deadline of a row without one (dates are stored as ordinals)
+NULL_DATE = np.iinfo(np.int32).min
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def _column_kind(values: Sequence) -> str:
+    """How a response column is stored, from the type of its first non-null value"""
+    for value in values:
+        if value is None:
+            continue
+        if isinstance(value, (bool, np.bool_)):
+            break
+        if isinstance(value, (int, np.integer)):
+            return "int"
+        if isinstance(value, (float, np.floating)):
+            return "float"
+        if isinstance(value, date):
+            return "date"
+        break
+    return "str"
+
+
+class StringTable:
+    """Strings stored back to back as UTF-8, addressed by code through an offsets array"""
+
+    def __init__(self, buffer: mmap.mmap, offsets: np.ndarray, base: int):
+        self._buffer = buffer
+        self._offsets = offsets
+        self._base = base
+
+    def __getitem__(self, code: int) -> str:
+        start, end = self._offsets[code], self._offsets[code + 1]
+        return self._buffer[self._base + start:self._base + end].decode()
+
+
+class _Column:
+    """Read-only view of one response column; indexing yields the Python value"""
+
+    def __init__(self, values: np.ndarray):
+        self.values = values
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __iter__(self) -> Iterator:
+        return (self[i] for i in range(len(self.values)))
+
+
+class IntColumn(_Column):
+    def __getitem__(self, index: int):
+        return int(self.values[index])
+
+
+class FloatColumn(_Column):
+    def __getitem__(self, index: int):
+        value = float(self.values[index])
+        return None if value != value else value
+
+
+class DateColumn(_Column):
+    def __getitem__(self, index: int):
+        value = int(self.values[index])
+        return None if value == NULL_DATE else date.fromordinal(value)
+
+
+class StringColumn(_Column):
+    def __init__(self, values: np.ndarray, strings: StringTable):
+        super().__init__(values)
+        self.strings = strings
+
+    def __getitem__(self, index: int):
+        code = int(self.values[index])
+        return None if code < 0 else self.strings[code]
+
+
+def write_snapshot(path: str, catalog, columns: Sequence[str], version: Tuple[str, Optional[str]]) -> None:
+    """Compile ``catalog`` (a ColumnarCatalog) into a snapshot file at ``path``
+
+    ``version`` is the (etag, ISO last_modified) pair the snapshot was built for.
+    The file is written next to ``path`` and renamed into place, so readers
+    never see it half written.
+    """
+    arrays: Dict[str, np.ndarray] = {
+        "ids": catalog.ids,
+        "tuition_min": catalog.tuition_min,
+        "tuition_max": catalog.tuition_max,
+        "program_type": catalog.program_type,
+        "degree_level": catalog.degree_level,
+        "country": catalog.country,
+    }
+    # One permutation per sort key; descending orders are reversed views of it
+    orders = {}
+    for sort, (key, descending) in SORT_ORDERS.items():
+        permutation = catalog.orders[sort]
+        arrays[f"order:{key}"] = permutation[::-1] if descending else permutation
+        orders[sort] = [f"order:{key}", descending]
+    bitsets: Dict[str, Dict[str, str]] = {}
+    for field, values in catalog.bitsets.items():
+        bitsets[field] = {}
+        for value, bits in values.items():
+            bitsets[field][value] = f"bitset:{len(arrays)}"
+            arrays[bitsets[field][value]] = bits
+
+    kinds = {}
+    strings: List[bytes] = []
+    codes: Dict[str, int] = {}
+    for name in columns:
+        values = catalog.columns[name]
+        kind = kinds[name] = _column_kind(values)
+        if kind == "int":
+            column = np.asarray(values, dtype=np.int64)
+        elif kind == "float":
+            column = np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+        elif kind == "date":
+            column = np.array([NULL_DATE if v is None else v.toordinal() for v in values], dtype=np.int32)
+        else:
+            column = np.empty(len(values), dtype=np.int32)
+            for i, value in enumerate(values):
+                if value is None:
+                    column[i] = -1
+                    continue
+                code = codes.get(value)
+                if code is None:
+                    code = codes[value] = len(strings)
+                    strings.append(str(value).encode())
+                column[i] = code
+        arrays[f"column:{name}"] = column
+    arrays["string_offsets"] = np.concatenate(([0], np.cumsum([len(s) for s in strings], dtype=np.int64)))
+    blob = b"".join(strings)
+
+    layout, offset = {}, 0
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        arrays[name] = array
+        layout[name] = {"offset": offset, "dtype": array.dtype.str, "shape": list(array.shape)}
+        offset = _aligned(offset + array.nbytes)
+    header = json.dumps({
+        "size": catalog.size,
+        "etag": version[0],
+        "last_modified": version[1],
+        "arrays": layout,
+        "strings": {"offset": offset, "length": len(blob)},
+        "columns": kinds,
+        "orders": orders,
+        "bitsets": bitsets,
+        "vocabularies": {
+            "program_type": catalog.program_type_values,
+            "degree_level": catalog.degree_level_values,
+            "country": catalog.country_values,
+        },
+    }).encode()
+
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as fh:
+        fh.write(MAGIC)
+        fh.write(len(header).to_bytes(8, "little"))
+        fh.write(header)
+        start = _aligned(fh.tell())
+        for name, array in arrays.items():
+            fh.seek(start + layout[name]["offset"])
+            fh.write(array.tobytes())
+        fh.seek(start + offset)
+        fh.write(blob)
+        fh.flush()
+        os.fsync(fh.fileno())
+    os.replace(tmp, path)
+
+
+class CatalogSnapshot:
+    """A snapshot file mapped read-only; arrays are zero-copy views of the mapping"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as fh:
+            self._buffer = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._buffer[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a catalog snapshot")
+        length = int.from_bytes(self._buffer[len(MAGIC):len(MAGIC) + 8], "little")
+        start = len(MAGIC) + 8
+        self.header: Mapping = json.loads(self._buffer[start:start + length])
+        self._data = _aligned(start + length)
+
+        self.size: int = self.header["size"]
+        self.etag: str = self.header["etag"]
+        self.last_modified: Optional[str] = self.header["last_modified"]
+        self.vocabularies: Mapping[str, List[str]] = self.header["vocabularies"]
+
+    def array(self, name: str) -> np.ndarray:
+        spec = self.header["arrays"][name]
+        dtype = np.dtype(spec["dtype"])
+        count = int(np.prod(spec["shape"]))
+        return np.frombuffer(self._buffer, dtype=dtype, count=count, offset=self._data + spec["offset"])
+
+    def orders(self) -> Dict[str, np.ndarray]:
+        return {
+            sort: self.array(name)[::-1] if descending else self.array(name)
+            for sort, (name, descending) in self.header["orders"].items()
+        }
+
+    def bitsets(self) -> Dict[str, Dict[str, np.ndarray]]:
+        return {
+            field: {value: self.array(name) for value, name in values.items()}
+            for field, values in self.header["bitsets"].items()
+        }
+
+    def columns(self) -> Dict[str, _Column]:
+        strings = StringTable(
+            self._buffer, self.array("string_offsets"), self._data + self.header["strings"]["offset"]
+        )
+        kinds = {"int": IntColumn, "float": FloatColumn, "date": DateColumn}
+        columns: Dict[str, _Column] = {}
+        for name, kind in self.header["columns"].items():
+            values = self.array(f"column:{name}")
+            columns[name] = StringColumn(values, strings) if kind == "str" else kinds[kind](values)
+        return columns
+
+
+class IdPositions:
+    """Row position by college id over the (ascending) id column, without a per-worker dict"""
+
+    def __init__(self, ids: np.ndarray):
+        self.ids = ids
+
+    def get(self, college_id: int, default=None):
+        i = int(np.searchsorted(self.ids, college_id))
+        return i if i < len(self.ids) and self.ids[i] == college_id else default
+
+    def __contains__(self, college_id: int) -> bool:
+        return self.get(college_id) is not None
+
+    def __getitem__(self, college_id: int) -> int:
+        i = self.get(college_id)
+        if i is None:
+            raise KeyError(college_id)
+        return i
@@ -0,0 +1,118 @@
+"""
+Catalog change feed for incremental sync
+
+college_changes gets one row per insert, update and delete on colleges,
+written by SQLite triggers so every writer is covered, ExcelImportService
+included. Its autoincrement key is the catalog version. A client that last
+synced at version ``since`` only needs the latest change of each college
+changed after it, so the feed collapses changes per college, and an import
+compacts the log down to those latest changes: it stays bounded by the number
+of colleges ever stored rather than by the number of writes.
+"""
+
+from typing import Dict, List, Optional
+
+from sqlalchemy import delete, func, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from database.models import College, CollegeChange
+from api.services.catalog_service import RESPONSE_COLUMNS
+
+CHANGES_TABLE = CollegeChange.__tablename__
+CHANGE_FEED_LIMIT = 1000
+
+_available = False
+
+
+def _ddl() -> List[str]:
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS {CHANGES_TABLE}_ai AFTER INSERT ON colleges BEGIN "
+        f"INSERT INTO {CHANGES_TABLE}(college_id, op) VALUES (new.id, 'insert'); END",
+        f"CREATE TRIGGER IF NOT EXISTS {CHANGES_TABLE}_au AFTER UPDATE ON colleges BEGIN "
+        f"INSERT INTO {CHANGES_TABLE}(college_id, op) VALUES (new.id, 'update'); END",
+        f"CREATE TRIGGER IF NOT EXISTS {CHANGES_TABLE}_ad AFTER DELETE ON colleges BEGIN "
+        f"INSERT INTO {CHANGES_TABLE}(college_id, op) VALUES (old.id, 'delete'); END",
+    ]
+
+
+class ChangeLogService:
+    @staticmethod
+    def ensure(engine: Engine) -> bool:
+        """Create the triggers if missing; an empty log starts with one insert per existing college"""
+        global _available
+        if engine.dialect.name != "sqlite":
+            return False
+        with engine.begin() as conn:
+            for statement in _ddl():
+                conn.execute(text(statement))
+            if conn.execute(select(CollegeChange.version).limit(1)).first() is None:
+                conn.execute(text(
+                    f"INSERT INTO {CHANGES_TABLE}(college_id, op) SELECT id, 'insert' FROM colleges ORDER BY id"
+                ))
+        _available = True
+        return True
+
+    @staticmethod
+    def available() -> bool:
+        return _available
+
+    @staticmethod
+    def after_import(db: Session) -> None:
+        """Drop changes superseded by a later change of the same college"""
+        if not _available:
+            return
+        latest = select(func.max(CollegeChange.version)).group_by(CollegeChange.college_id)
+        db.execute(delete(CollegeChange).where(CollegeChange.version.not_in(latest)))
+        db.commit()
+
+    @staticmethod
+    def current_version(db: Session) -> int:
+        return db.query(func.max(CollegeChange.version)).scalar() or 0
+
+    @staticmethod
+    def college_version(db: Session, college_id: int) -> Optional[int]:
+        """Version of the latest change to one college, or None without the change log"""
+        if not _available:
+            return None
+        return db.execute(
+            select(func.max(CollegeChange.version)).where(CollegeChange.college_id == college_id)
+        ).scalar()
+
+    @staticmethod
+    def changes(db: Session, since: int = 0, limit: int = CHANGE_FEED_LIMIT) -> Dict:
+        """Colleges changed after version ``since``, oldest change first, with their current rows
+
+        A page ends at ``next_since``; pass it back as ``since`` for the next page.
+        """
+        latest = (
+            select(CollegeChange.college_id, func.max(CollegeChange.version).label("version"))
+            .where(CollegeChange.version > since)
+            .group_by(CollegeChange.college_id)
+            .subquery()
+        )
+        columns = [getattr(College, c) for c in RESPONSE_COLUMNS]
+        rows = db.execute(
+            select(latest.c.version, latest.c.college_id, *columns)
+            .outerjoin(College, College.id == latest.c.college_id)
+            .order_by(latest.c.version)
+            .limit(limit + 1)
+        ).all()
+
+        has_more = len(rows) > limit
+        changes = []
+        for version, college_id, *values in rows[:limit]:
+            # No current row means the college's latest change deleted it
+            college = dict(zip(RESPONSE_COLUMNS, values)) if values[0] is not None else None
+            changes.append({
+                "version": version,
+                "op": "upsert" if college is not None else "delete",
+                "id": college_id,
+                "college": college,
+            })
+        return {
+            "changes": changes,
+            "next_since": changes[-1]["version"] if changes else since,
+            "has_more": has_more,
+            "version": ChangeLogService.current_version(db),
+        }
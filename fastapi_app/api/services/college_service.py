@@ -1,52 +1,314 @@
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, undefer_group
+from sqlalchemy import false, or_, tuple_
+from typing import List, Optional, Sequence, Tuple
 
 from database import models
-from api.schemas.college import CollegeSearchRequest
+from database.database import ReadSessionLocal, run_in_session
+from api.schemas.college import (
+    CollegeSearchRequest, CollegeMultiSearchRequest, BUDGET_BOUNDS, CONTINENT_COUNTRIES, SORT_KEYS, SORT_ORDERS,
+)
+from api.services.catalog_service import CatalogService, RESPONSE_COLUMNS
+from api.services.change_log_service import ChangeLogService
+from api.services.facet_service import FacetService
+from api.services.geo_service import GeoService
+from api.services.suggest_service import SuggestService
+from api.services.text_search_service import TextSearchService
+
+SEARCH_LIMIT = 200
+# Response header listing requested ids that do not exist, comma-separated
+MISSING_IDS_HEADER = "X-Missing-Ids"
+# Ids per IN (...) query, under SQLite's bound-parameter limit
+ID_LOOKUP_SIZE = 500
+
 
 class CollegeService:
     @staticmethod
-    def list_colleges(db: Session, limit: int = 50, offset: int = 0) -> List[models.College]:
+    def row_query(db: Session, columns: Sequence[str] = RESPONSE_COLUMNS):
+        """Query selecting just ``columns``, as tuples rather than ORM objects"""
+        return db.query(*(getattr(models.College, c) for c in columns))
+
+    @staticmethod
+    def row_dicts(rows, columns: Sequence[str] = RESPONSE_COLUMNS) -> List[dict]:
+        return [dict(zip(columns, row)) for row in rows]
+
+    @staticmethod
+    def list_colleges(
+        db: Session,
+        limit: int = 50,
+        offset: int = 0,
+        after: Optional[Tuple[str, int]] = None,
+        sort: str = "name_asc",
+        columns: Sequence[str] = RESPONSE_COLUMNS,
+    ):
+        """Colleges in ``sort`` order; ``after`` is the last (name, id) of the previous name_asc page."""
+        catalog = CatalogService.get()
+        if catalog is not None and after is None:
+            return catalog.page(sort, offset, limit, columns)
+        return CollegeService.list_colleges_sql(db, limit=limit, offset=offset, after=after, sort=sort, columns=columns)
+
+    @staticmethod
+    def list_colleges_sql(
+        db: Session,
+        limit: int = 50,
+        offset: int = 0,
+        after: Optional[Tuple[str, int]] = None,
+        sort: str = "name_asc",
+        columns: Sequence[str] = RESPONSE_COLUMNS,
+    ) -> List[dict]:
+        q = CollegeService.row_query(db, columns)
+        if after is not None:
+            q = q.filter(tuple_(models.College.name, models.College.id) > after)
+        return CollegeService.row_dicts(q.order_by(*CollegeService.order_by(sort)).offset(offset).limit(limit), columns)
+
+    @staticmethod
+    def order_by(sort: str) -> list:
+        """ORDER BY clauses for a sort order; each key is backed by a composite index"""
+        key, descending = SORT_ORDERS[sort]
+        columns = [getattr(models.College, c) for c in SORT_KEYS[key]]
+        return [c.desc() for c in columns] if descending else [c.asc() for c in columns]
+
+    @staticmethod
+    def get_college(db: Session, college_id: int) -> models.College | None:
         return (
             db.query(models.College)
-            .order_by(models.College.name.asc())
-            .offset(offset)
-            .limit(limit)
-            .all()
+            .options(undefer_group(models.TEXT_GROUP))
+            .filter(models.College.id == college_id)
+            .first()
         )
 
     @staticmethod
-    def get_college(db: Session, college_id: int) -> models.College | None:
-        return db.query(models.College).filter(models.College.id == college_id).first()
+    def get_colleges(
+        db: Session, ids: Sequence[int], columns: Sequence[str] = RESPONSE_COLUMNS
+    ) -> Tuple[list, List[int]]:
+        """(colleges in requested order, ids not found); repeated ids are returned once"""
+        catalog = CatalogService.get()
+        if catalog is not None:
+            return CollegeService.get_colleges_catalog(catalog, ids, columns)
+        return CollegeService.get_colleges_sql(db, ids, columns)
+
+    @staticmethod
+    def get_colleges_catalog(
+        catalog, ids: Sequence[int], columns: Sequence[str] = RESPONSE_COLUMNS
+    ) -> Tuple[List[dict], List[int]]:
+        ids = list(dict.fromkeys(ids))
+        positions = [catalog.position.get(i) for i in ids]
+        found = catalog.rows((p for p in positions if p is not None), columns)
+        return found, [i for i, p in zip(ids, positions) if p is None]
+
+    @staticmethod
+    def get_colleges_sql(
+        db: Session, ids: Sequence[int], columns: Sequence[str] = RESPONSE_COLUMNS
+    ) -> Tuple[List[dict], List[int]]:
+        ids = list(dict.fromkeys(ids))
+        by_id = {}
+        for start in range(0, len(ids), ID_LOOKUP_SIZE):
+            batch = ids[start:start + ID_LOOKUP_SIZE]
+            rows = CollegeService.row_query(db, columns).filter(models.College.id.in_(batch))
+            by_id.update((c["id"], c) for c in CollegeService.row_dicts(rows, columns))
+        return [by_id[i] for i in ids if i in by_id], [i for i in ids if i not in by_id]
 
     @staticmethod
-    def search_colleges(db: Session, payload: CollegeSearchRequest) -> List[models.College]:
-        q = db.query(models.College)
+    def search_colleges(db: Session, payload: CollegeSearchRequest, columns: Sequence[str] = RESPONSE_COLUMNS):
+        # Served from the in-memory catalog when it is loaded; the SQL path below
+        # is the reference implementation and the fallback.
+        catalog = CatalogService.get()
+        if catalog is not None:
+            return catalog.search(payload, limit=SEARCH_LIMIT, columns=columns)
+        return CollegeService.search_colleges_sql(db, payload, columns)
 
+    @staticmethod
+    def batch_search(db: Session, payloads: Sequence[CollegeSearchRequest]) -> list:
+        """One result list per search request, evaluated together"""
+        catalog = CatalogService.get()
+        if catalog is not None:
+            return catalog.search_many(payloads, limit=SEARCH_LIMIT)
+        return CollegeService.batch_search_sql(db, payloads)
+
+    @staticmethod
+    def batch_search_sql(db: Session, payloads: Sequence[CollegeSearchRequest]) -> List[List[dict]]:
+        # Repeated requests are queried once; every query shares the caller's session
+        results = {}
+        for payload in payloads:
+            key = payload.model_dump_json()
+            if key not in results:
+                results[key] = CollegeService.search_colleges_sql(db, payload)
+        return [results[payload.model_dump_json()] for payload in payloads]
+
+    @staticmethod
+    def search_colleges_sql(
+        db: Session, payload: CollegeSearchRequest, columns: Sequence[str] = RESPONSE_COLUMNS
+    ) -> List[dict]:
+        q = CollegeService.apply_filters(CollegeService.row_query(db, columns), payload)
+        return CollegeService.row_dicts(q.order_by(*CollegeService.order_by(payload.sort)).limit(SEARCH_LIMIT), columns)
+
+    @staticmethod
+    def apply_filters(q, payload: CollegeSearchRequest):
+        """Add the structured search filters to a query selecting from colleges"""
         if payload.program_type:
             q = q.filter(models.College.program_type == payload.program_type)
 
         # Budget filtering: include if any overlap between college tuition range and requested budget
-        if payload.budget_range:
-            if payload.budget_range == "Under 20k":
-                q = q.filter(models.College.tuition_min <= 20000)
-            elif payload.budget_range == "20k-40k":
-                q = q.filter(models.College.tuition_min <= 40000, (models.College.tuition_max == None) | (models.College.tuition_max >= 20000))
-            elif payload.budget_range == "40k-60k":
-                q = q.filter(models.College.tuition_min <= 60000, (models.College.tuition_max == None) | (models.College.tuition_max >= 40000))
-            elif payload.budget_range == "Over 60k":
-                q = q.filter((models.College.tuition_max == None) | (models.College.tuition_max >= 60000))
-
-        # Location filtering: simple country contains or continent group (basic mapping could be added later)
-        if payload.location and payload.location != "Any":
-            continent = payload.location
-            if continent == "North America":
-                q = q.filter(models.College.location_country.in_(["USA", "United States", "Canada", "Mexico"]))
-            elif continent == "Europe":
-                q = q.filter(models.College.location_country.in_(["UK", "United Kingdom", "Germany", "France", "Italy", "Spain", "Netherlands", "Sweden", "Denmark", "Finland", "Norway", "Belgium", "Portugal", "Switzerland", "Austria", "Poland", "Ireland"]))
-            elif continent == "Asia":
-                q = q.filter(models.College.location_country.in_(["India", "China", "Japan", "South Korea", "Singapore", "Hong Kong", "Taiwan", "Thailand", "Malaysia", "Indonesia", "Philippines", "Vietnam"]))
-            elif continent == "Australia":
-                q = q.filter(models.College.location_country.in_(["Australia", "New Zealand"]))
-
-        return q.order_by(models.College.name.asc()).limit(200).all() 
\ No newline at end of file
+        if payload.budget_range in BUDGET_BOUNDS:
+            q = q.filter(CollegeService.budget_clause(payload.budget_range))
+
+        # Location filtering: continent group mapped to its countries
+        if payload.location in CONTINENT_COUNTRIES:
+            q = q.filter(models.College.location_country.in_(CONTINENT_COUNTRIES[payload.location]))
+
+        return q
+
+    @staticmethod
+    def budget_clause(budget_range: str):
+        low, high = BUDGET_BOUNDS[budget_range]
+        clauses = []
+        if high is not None:
+            clauses.append(models.College.tuition_min <= high)
+        if low is not None:
+            clauses.append((models.College.tuition_max == None) | (models.College.tuition_max >= low))
+        return clauses[0] if len(clauses) == 1 else clauses[0] & clauses[1]
+
+    @staticmethod
+    def multi_search_colleges(
+        db: Session, payload: CollegeMultiSearchRequest, columns: Sequence[str] = RESPONSE_COLUMNS
+    ):
+        catalog = CatalogService.get()
+        if catalog is not None:
+            return catalog.multi_search(payload, limit=SEARCH_LIMIT, columns=columns)
+        return CollegeService.multi_search_colleges_sql(db, payload, columns)
+
+    @staticmethod
+    def multi_search_colleges_sql(
+        db: Session, payload: CollegeMultiSearchRequest, columns: Sequence[str] = RESPONSE_COLUMNS
+    ) -> List[dict]:
+        q = CollegeService.row_query(db, columns)
+
+        if payload.program_types:
+            q = q.filter(models.College.program_type.in_(payload.program_types))
+
+        if payload.degree_levels:
+            q = q.filter(models.College.degree_level.in_(payload.degree_levels))
+
+        if payload.budget_ranges:
+            clauses = [CollegeService.budget_clause(b) for b in payload.budget_ranges if b in BUDGET_BOUNDS]
+            q = q.filter(or_(*clauses) if clauses else false())
+
+        if payload.locations and "Any" not in payload.locations:
+            countries = [c for loc in payload.locations for c in CONTINENT_COUNTRIES.get(loc, ())]
+            q = q.filter(models.College.location_country.in_(countries))
+
+        if payload.max_tuition is not None:
+            q = q.filter((models.College.tuition_max == None) | (models.College.tuition_max <= payload.max_tuition))
+
+        return CollegeService.row_dicts(q.order_by(*CollegeService.order_by(payload.sort)).limit(SEARCH_LIMIT), columns)
+
+
+class AsyncCollegeService:
+    """CollegeService over an AsyncSession.
+
+    Queries run through ``AsyncSession.run_sync`` so the same ORM code is shared
+    with CollegeService while the event loop stays free during database I/O.
+    run_sync itself runs on the event loop, so calls whose cost is CPU rather
+    than I/O (batch searches, index builds, nearest-neighbour queries) go to
+    the threadpool instead.
+    """
+
+    @staticmethod
+    async def list_colleges(
+        db: AsyncSession,
+        limit: int = 50,
+        offset: int = 0,
+        after: Optional[Tuple[str, int]] = None,
+        sort: str = "name_asc",
+        columns: Sequence[str] = RESPONSE_COLUMNS,
+    ):
+        catalog = CatalogService.get()
+        if catalog is not None and after is None:
+            return catalog.page(sort, offset, limit, columns)
+        return await db.run_sync(
+            CollegeService.list_colleges_sql, limit=limit, offset=offset, after=after, sort=sort, columns=columns
+        )
+
+    @staticmethod
+    async def catalog_version(db: AsyncSession, fresh: bool = False):
+        """Validator of the data a response is built from
+
+        The cached version belongs to the in-memory catalog. A response read
+        from SQL (``fresh``, or any response with the catalog disabled) is
+        validated against the table itself, since another worker may have
+        changed it since this one last refreshed.
+        """
+        if fresh or CatalogService.get() is None:
+            return await db.run_sync(CatalogService.compute_version)
+        version = CatalogService.cached_version()
+        if version is None:
+            version = await db.run_sync(CatalogService.version)
+        return version
+
+    @staticmethod
+    async def get_college(db: AsyncSession, college_id: int) -> models.College | None:
+        return await db.run_sync(CollegeService.get_college, college_id)
+
+    @staticmethod
+    async def get_colleges(
+        db: AsyncSession, ids: Sequence[int], columns: Sequence[str] = RESPONSE_COLUMNS
+    ) -> Tuple[list, List[int]]:
+        catalog = CatalogService.get()
+        if catalog is not None:
+            return CollegeService.get_colleges_catalog(catalog, ids, columns)
+        return await db.run_sync(CollegeService.get_colleges_sql, ids, columns)
+
+    @staticmethod
+    async def search_colleges(
+        db: AsyncSession, payload: CollegeSearchRequest, columns: Sequence[str] = RESPONSE_COLUMNS
+    ):
+        catalog = CatalogService.get()
+        if catalog is not None:
+            return catalog.search(payload, limit=SEARCH_LIMIT, columns=columns)
+        return await db.run_sync(CollegeService.search_colleges_sql, payload, columns)
+
+    @staticmethod
+    async def batch_search(db: AsyncSession, payloads: Sequence[CollegeSearchRequest]) -> list:
+        catalog = CatalogService.get()
+        if catalog is not None:
+            return await run_in_threadpool(catalog.search_many, payloads, limit=SEARCH_LIMIT)
+        return await db.run_sync(CollegeService.batch_search_sql, payloads)
+
+    @staticmethod
+    async def multi_search_colleges(
+        db: AsyncSession, payload: CollegeMultiSearchRequest, columns: Sequence[str] = RESPONSE_COLUMNS
+    ):
+        catalog = CatalogService.get()
+        if catalog is not None:
+            return catalog.multi_search(payload, limit=SEARCH_LIMIT, columns=columns)
+        return await db.run_sync(CollegeService.multi_search_colleges_sql, payload, columns)
+
+    @staticmethod
+    async def text_search(db: AsyncSession, query: str, filters: CollegeSearchRequest, limit: int = 20):
+        return await db.run_sync(TextSearchService.search, query, filters, limit=limit)
+
+    @staticmethod
+    async def college_version(db: AsyncSession, college_id: int) -> Optional[int]:
+        return await db.run_sync(ChangeLogService.college_version, college_id)
+
+    @staticmethod
+    async def changes(db: AsyncSession, since: int, limit: int) -> dict:
+        return await db.run_sync(ChangeLogService.changes, since, limit)
+
+    @staticmethod
+    async def get_facets(db: AsyncSession, filters: CollegeSearchRequest):
+        return await db.run_sync(FacetService.get_facets, filters)
+
+    @staticmethod
+    async def suggest(query: str, limit: int = 10) -> List[dict]:
+        index = SuggestService.get()
+        if index is None:
+            index = await run_in_session(ReadSessionLocal, SuggestService.index)
+        return await run_in_threadpool(index.suggest, query, limit)
+
+    @staticmethod
+    async def near(
+        latitude: float, longitude: float, k: int = 20, radius_km: Optional[float] = None
+    ) -> List[Tuple[dict, float]]:
+        return await run_in_session(ReadSessionLocal, GeoService.near, latitude, longitude, k=k, radius_km=radius_km)
@@ -1,10 +1,23 @@
 import io
-from typing import Dict, List
-from sqlalchemy.orm import Session
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from sqlalchemy import func, insert, or_, select, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session, undefer_group
 from datetime import datetime
 from openpyxl import load_workbook
 
-from database.models import College
+from database.models import TEXT_GROUP, College
+from api.services.catalog_service import CatalogService
+from api.services.change_log_service import ChangeLogService
+from api.services.facet_service import FacetDelta, FacetService, FACET_COLUMNS
+from api.services.geo_service import city_coordinates
+from api.services.profile_match_service import ProfileMatchService
+from api.services.suggest_service import SuggestService
+from api.services.text_search_service import TextSearchService
 
 REQUIRED_COLUMNS = [
     "name",
@@ -17,80 +30,451 @@ REQUIRED_COLUMNS = [
     "tuition_max",
 ]
 
+# Every College column read from the sheet
+COLUMNS = REQUIRED_COLUMNS + [
+    "application_deadline",
+    "program_description",
+    "admission_requirements",
+    "contact_email",
+    "website_url",
+    "latitude",
+    "longitude",
+]
+
+# Natural key matched by the uq_college_program_country constraint
+KEY_COLUMNS = ("name", "program_name", "location_country")
+
+IMPORT_CHUNK_SIZE = int(os.getenv("IMPORT_CHUNK_SIZE", "1000"))
+SPOOL_BUFFER_SIZE = 1024 * 1024
+KEY_LOOKUP_SIZE = 500
+
+# Called with the running inserted/updated/skipped counts after each written batch
+ProgressCallback = Optional[Callable[[Dict], None]]
+
+
+class PostImportError(Exception):
+    """The rows were committed but a follow-up step (indexes, caches, matches) failed."""
+
+    def __init__(self, report: Dict, error: Exception):
+        super().__init__(f"Rows were imported, but post-processing failed: {error}")
+        self.report = report
+
+
 class ExcelImportService:
     @staticmethod
-    def import_excel(file, db: Session) -> Dict:
-        content = file.file.read()
-        wb = load_workbook(io.BytesIO(content), data_only=True)
-        ws = wb.active
+    def import_excel(
+        file,
+        db: Session,
+        bulk: bool = True,
+        chunk_size: int = IMPORT_CHUNK_SIZE,
+        streaming: bool = True,
+        progress: ProgressCallback = None,
+    ) -> Dict:
+        """Import an uploaded workbook (UploadFile-like object or path to a saved upload).
+
+        ``streaming`` reads the sheet one row at a time from a spooled copy
+        instead of loading the whole workbook into memory. It applies to both
+        write modes: ``bulk`` upserts batches of ``chunk_size`` rows, otherwise
+        rows are written one at a time and flushed every ``chunk_size`` rows.
+        """
+        mark = ProfileMatchService.import_mark(db)
+        if streaming and bulk:
+            report = ExcelImportService._import_stream(file, db, chunk_size, progress)
+        elif streaming:
+            with ExcelImportService._stream_rows(file) as (rows, col_index):
+                report = ExcelImportService._import_rows(rows, col_index, db, chunk_size, progress)
+        else:
+            if isinstance(file, str):
+                with open(file, "rb") as fh:
+                    content = fh.read()
+            else:
+                content = file.file.read()
+            wb = load_workbook(io.BytesIO(content), data_only=True)
+            ws = wb.active
+
+            rows = ws.iter_rows(values_only=True)
+            col_index = ExcelImportService._header_index(next(rows, ()))
+
+            if bulk:
+                report = ExcelImportService._import_bulk(rows, col_index, db, chunk_size, progress)
+            else:
+                report = ExcelImportService._import_rows(rows, col_index, db, chunk_size, progress)
+
+        try:
+            TextSearchService.after_import(db)
+            ChangeLogService.after_import(db)
+            CatalogService.refresh(db)
+            SuggestService.refresh(db)
+            ProfileMatchService.after_import(db, mark)
+        except Exception as e:
+            db.rollback()
+            raise PostImportError(report, e) from e
+        return report
+
+    @staticmethod
+    def _import_stream(file, db: Session, chunk_size: int, progress: ProgressCallback = None) -> Dict:
+        """Constant-memory import: spool -> read-only rows -> parse -> normalize -> validate -> batch write.
+
+        Only the current batch and its existing-key lookup are held in memory, so
+        peak usage does not grow with the workbook.
+        """
+        report = {"inserted": 0, "updated": 0, "skipped": 0}
+        with ExcelImportService._stream_rows(file) as (rows, col_index):
+            records = ExcelImportService._parse_stage(rows, col_index, report)
+            records = ExcelImportService._normalize_stage(records, report)
+            records = ExcelImportService._validate_stage(records, report)
+            for batch in ExcelImportService._batch_stage(records, chunk_size):
+                ExcelImportService._write_batch(db, batch, report)
+                if progress:
+                    progress(dict(report))
+
+        db.commit()
+        return report
+
+    @staticmethod
+    @contextmanager
+    def _stream_rows(file) -> Iterator[Tuple[Iterator[tuple], Dict[str, int]]]:
+        """Yield the data rows of a spooled workbook opened read-only, and its header index."""
+        with ExcelImportService._spool(file) as path:
+            wb = load_workbook(path, read_only=True, data_only=True)
+            try:
+                rows = wb.active.iter_rows(values_only=True)
+                yield rows, ExcelImportService._header_index(next(rows, ()))
+            finally:
+                wb.close()
+
+    @staticmethod
+    def save_upload(file) -> str:
+        """Copy an upload to a temporary file in fixed-size blocks; the caller removes it."""
+        fd, path = tempfile.mkstemp(suffix=".xlsx")
+        try:
+            with os.fdopen(fd, "wb") as out:
+                shutil.copyfileobj(file.file, out, SPOOL_BUFFER_SIZE)
+        except Exception:
+            os.remove(path)
+            raise
+        return path
+
+    @staticmethod
+    @contextmanager
+    def _spool(file):
+        """Yield a path to the workbook, spooling uploads to a temporary file."""
+        if isinstance(file, str):
+            yield file
+            return
+        path = ExcelImportService.save_upload(file)
+        try:
+            yield path
+        finally:
+            os.remove(path)
+
+    @staticmethod
+    def _parse_stage(rows: Iterable[tuple], col_index: Dict[str, int], report: Dict) -> Iterator[Dict]:
+        for row in rows:
+            try:
+                yield ExcelImportService._extract(row, col_index)
+            except Exception:
+                report["skipped"] += 1
+
+    @staticmethod
+    def _normalize_stage(records: Iterable[Dict], report: Dict) -> Iterator[Dict]:
+        for raw in records:
+            try:
+                yield ExcelImportService._normalize(raw)
+            except Exception:
+                report["skipped"] += 1
+
+    @staticmethod
+    def _validate_stage(records: Iterable[Dict], report: Dict) -> Iterator[Dict]:
+        for data in records:
+            if ExcelImportService._is_valid(data):
+                yield data
+            else:
+                report["skipped"] += 1
+
+    @staticmethod
+    def _batch_stage(records: Iterable[Dict], chunk_size: int) -> Iterator[List[Dict]]:
+        batch: List[Dict] = []
+        for data in records:
+            batch.append(data)
+            if len(batch) >= chunk_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    @staticmethod
+    def _write_batch(db: Session, batch: List[Dict], report: Dict) -> None:
+        """Upsert one batch, looking up only the batch's own keys in the database.
+
+        One lookup returns both the ids and the current facet values of existing rows.
+        """
+        latest: Dict[Tuple[str, str, str], Dict] = {}
+        for data in batch:
+            key = tuple(data[c] for c in KEY_COLUMNS)
+            if key in latest:
+                # Repeated within the batch: last occurrence wins, counted as an update
+                report["updated"] += 1
+            latest[key] = data
+
+        existing = ExcelImportService._lookup(db, list(latest), "id", *FACET_COLUMNS)
 
-        headers = [str(cell.value).strip() if cell.value is not None else "" for cell in next(ws.iter_rows(min_row=1, max_row=1))]
+        inserts, updates = [], []
+        for key, data in latest.items():
+            if key in existing:
+                updates.append(dict(data, id=existing[key]["id"]))
+            else:
+                inserts.append(data)
+        report["inserted"] += len(inserts)
+        report["updated"] += len(updates)
+
+        if inserts:
+            ExcelImportService._write_chunk(db, "insert", inserts, previous={})
+        if updates:
+            ExcelImportService._write_chunk(db, "update", updates, previous=existing)
+
+    @staticmethod
+    def _lookup(db: Session, keys: List[Tuple[str, str, str]], *columns: str) -> Dict[Tuple[str, str, str], Dict]:
+        """Current values of ``columns`` for the rows with the given natural keys"""
+        key_columns = [getattr(College, c) for c in KEY_COLUMNS]
+        found = {}
+        # Sliced to stay under SQLite's bound-parameter limit for large chunk sizes
+        for start in range(0, len(keys), KEY_LOOKUP_SIZE):
+            stmt = (
+                select(*key_columns, *(getattr(College, c) for c in columns))
+                .where(tuple_(*key_columns).in_(keys[start:start + KEY_LOOKUP_SIZE]))
+            )
+            for row in db.execute(stmt).mappings():
+                found[tuple(row[c] for c in KEY_COLUMNS)] = dict(row)
+        return found
+
+    @staticmethod
+    def _header_index(header_row) -> Dict[str, int]:
+        headers = [str(value).strip() if value is not None else "" for value in header_row]
 
         missing = [c for c in REQUIRED_COLUMNS if c not in headers]
         if missing:
             raise ValueError(f"Missing required columns: {', '.join(missing)}")
 
-        col_index = {h: headers.index(h) for h in headers}
+        return {h: headers.index(h) for h in headers}
 
+    @staticmethod
+    def _parse_row(row: tuple, col_index: Dict[str, int]) -> Optional[Dict]:
+        """Map one sheet row to College column values; None when the natural key is incomplete."""
+        data = ExcelImportService._normalize(ExcelImportService._extract(row, col_index))
+        return data if ExcelImportService._is_valid(data) else None
+
+    @staticmethod
+    def _extract(row: tuple, col_index: Dict[str, int]) -> Dict:
+        """Raw cell values by column name ("" for missing columns and empty cells)."""
+        def get(col: str):
+            idx = col_index.get(col)
+            if idx is None or idx >= len(row):
+                return ""
+            val = row[idx]
+            return val if val is not None else ""
+
+        return {col: get(col) for col in COLUMNS}
+
+    @staticmethod
+    def _normalize(raw: Dict) -> Dict:
+        data = {col: str(raw[col]).strip() for col in COLUMNS}
+        data["tuition_min"] = ExcelImportService._to_float(raw["tuition_min"])
+        data["tuition_max"] = ExcelImportService._to_float(raw["tuition_max"])
+        data["application_deadline"] = ExcelImportService._parse_date(raw["application_deadline"])
+        data["latitude"] = ExcelImportService._to_float(raw["latitude"])
+        data["longitude"] = ExcelImportService._to_float(raw["longitude"])
+        if data["latitude"] is None or data["longitude"] is None:
+            # Sheets rarely carry coordinates; join the offline city table
+            data["latitude"], data["longitude"] = (
+                city_coordinates(data["location_city"], data["location_country"]) or (None, None)
+            )
+        return data
+
+    @staticmethod
+    def _is_valid(data: Dict) -> bool:
+        return all(data[c] for c in KEY_COLUMNS)
+
+    @staticmethod
+    def _import_rows(
+        rows: Iterable[tuple],
+        col_index: Dict[str, int],
+        db: Session,
+        chunk_size: int = IMPORT_CHUNK_SIZE,
+        progress: ProgressCallback = None,
+    ) -> Dict:
+        """Row-at-a-time import: one lookup query per spreadsheet row."""
         inserted, updated, skipped = 0, 0, 0
-        for row in ws.iter_rows(min_row=2):
+        facets = FacetDelta()
+        for count, row in enumerate(rows, start=1):
+            if count % chunk_size == 0:
+                # Write pending rows so the session does not hold the whole sheet
+                db.flush()
+                if progress:
+                    progress({"inserted": inserted, "updated": updated, "skipped": skipped})
             try:
-                def get(col: str):
-                    idx = col_index.get(col)
-                    if idx is None:
-                        return ""
-                    val = row[idx].value
-                    return val if val is not None else ""
-
-                key_name = str(get("name")).strip()
-                key_program = str(get("program_name")).strip()
-                key_country = str(get("location_country")).strip()
-
-                if not key_name or not key_program or not key_country:
+                data = ExcelImportService._parse_row(row, col_index)
+                if data is None:
                     skipped += 1
                     continue
 
                 college = (
                     db.query(College)
+                    # Loaded so that unchanged text columns compare equal and are not rewritten
+                    .options(undefer_group(TEXT_GROUP))
                     .filter(
-                        College.name == key_name,
-                        College.program_name == key_program,
-                        College.location_country == key_country,
+                        College.name == data["name"],
+                        College.program_name == data["program_name"],
+                        College.location_country == data["location_country"],
                     )
                     .first()
                 )
 
-                data = {
-                    "name": key_name,
-                    "location_city": str(get("location_city")).strip(),
-                    "location_country": key_country,
-                    "program_name": key_program,
-                    "program_type": str(get("program_type")).strip(),
-                    "degree_level": str(get("degree_level")).strip(),
-                    "tuition_min": ExcelImportService._to_float(get("tuition_min")),
-                    "tuition_max": ExcelImportService._to_float(get("tuition_max")),
-                    "application_deadline": ExcelImportService._parse_date(get("application_deadline")),
-                    "program_description": str(get("program_description")).strip(),
-                    "admission_requirements": str(get("admission_requirements")).strip(),
-                    "contact_email": str(get("contact_email")).strip(),
-                    "website_url": str(get("website_url")).strip(),
-                }
-
                 if college:
+                    facets.remove({c: getattr(college, c) for c in FACET_COLUMNS})
                     for k, v in data.items():
                         setattr(college, k, v)
                     updated += 1
                 else:
                     db.add(College(**data))
                     inserted += 1
+                facets.add(data)
 
             except Exception:
                 skipped += 1
                 continue
 
+        FacetService.apply(db, facets)
         db.commit()
         return {"inserted": inserted, "updated": updated, "skipped": skipped}
 
+    @staticmethod
+    def _import_bulk(
+        rows: Iterable[tuple],
+        col_index: Dict[str, int],
+        db: Session,
+        chunk_size: int,
+        progress: ProgressCallback = None,
+    ) -> Dict:
+        """Set-based import: existing keys are loaded once and rows are written in chunks."""
+        existing = ExcelImportService._existing_keys(db)
+        report = {"inserted": 0, "updated": 0, "skipped": 0}
+        for kind, chunk in ExcelImportService._classify(rows, col_index, existing, chunk_size, report):
+            ExcelImportService._write_chunk(db, kind, chunk)
+            if progress:
+                progress(dict(report))
+
+        db.commit()
+        return report
+
+    @staticmethod
+    def _existing_keys(db: Session) -> Dict[Tuple[str, str, str], Optional[int]]:
+        stmt = select(College.name, College.program_name, College.location_country, College.id)
+        return {(name, program, country): college_id for name, program, country, college_id in db.execute(stmt)}
+
+    @staticmethod
+    def _classify(
+        rows: Iterable[tuple],
+        col_index: Dict[str, int],
+        existing: Dict[Tuple[str, str, str], Optional[int]],
+        chunk_size: int,
+        report: Dict,
+    ) -> Iterator[Tuple[str, List[Dict]]]:
+        """Split parsed rows into ("insert" | "update", rows) batches, tallying ``report``.
+
+        A key repeated within the file counts as an update and the last occurrence
+        wins, as it does for keys already in the database.
+        """
+        inserts: List[Dict] = []
+        updates: List[Dict] = []
+        pending: Dict[Tuple[str, str, str], int] = {}  # key -> position in ``inserts``
+        for row in rows:
+            try:
+                data = ExcelImportService._parse_row(row, col_index)
+            except Exception:
+                data = None
+            if data is None:
+                report["skipped"] += 1
+                continue
+
+            key = tuple(data[c] for c in KEY_COLUMNS)
+            if key in pending:
+                inserts[pending[key]] = data
+                report["updated"] += 1
+            elif key in existing:
+                # id is None for keys inserted by an earlier chunk of this file
+                data["id"] = existing[key]
+                updates.append(data)
+                report["updated"] += 1
+            else:
+                existing[key] = None
+                pending[key] = len(inserts)
+                inserts.append(data)
+                report["inserted"] += 1
+
+            if len(inserts) >= chunk_size:
+                yield "insert", inserts
+                inserts, pending = [], {}
+            if len(updates) >= chunk_size:
+                yield "update", updates
+                updates = []
+
+        if inserts:
+            yield "insert", inserts
+        if updates:
+            yield "update", updates
+
+    @staticmethod
+    def _write_chunk(
+        db: Session, kind: str, chunk: List[Dict], previous: Optional[Dict[Tuple[str, str, str], Dict]] = None
+    ) -> None:
+        """Write a chunk and move facet counts by (old row -> last occurrence of each key in the chunk)
+
+        ``previous`` holds the current facet values by key when the caller has
+        already looked them up; otherwise updates look them up here.
+        """
+        latest = {tuple(data[c] for c in KEY_COLUMNS): data for data in chunk}
+        if previous is None:
+            previous = ExcelImportService._lookup(db, list(latest), *FACET_COLUMNS) if kind == "update" else {}
+        facets = FacetDelta()
+        for key, data in latest.items():
+            if key in previous:
+                facets.remove(previous[key])
+            facets.add(data)
+
+        ExcelImportService._write_rows(db, kind, chunk)
+        FacetService.apply(db, facets)
+
+    @staticmethod
+    def _write_rows(db: Session, kind: str, chunk: List[Dict]) -> None:
+        dialect = db.get_bind().dialect.name
+        if dialect in ("sqlite", "postgresql"):
+            # One executemany of INSERT ... ON CONFLICT DO UPDATE against
+            # uq_college_program_country handles both batch kinds
+            upsert = (sqlite.insert if dialect == "sqlite" else postgresql.insert)(College)
+            values = {c: upsert.excluded[c] for c in chunk[0] if c != "id" and c not in KEY_COLUMNS}
+            # Rows whose values are all unchanged are left alone, so a re-import
+            # neither moves updated_at nor fires the change-log trigger
+            changed = or_(*(getattr(College, c).is_distinct_from(value) for c, value in values.items()))
+            values["updated_at"] = func.current_timestamp()
+            upsert = upsert.on_conflict_do_update(index_elements=list(KEY_COLUMNS), set_=values, where=changed)
+            db.execute(upsert, [{k: v for k, v in data.items() if k != "id"} for data in chunk])
+        elif kind == "insert":
+            db.execute(insert(College), chunk)
+        else:
+            now = datetime.utcnow()
+            by_id = [dict(data, updated_at=now) for data in chunk if data["id"] is not None]
+            if by_id:
+                db.execute(update(College), by_id)
+            for data in chunk:
+                if data["id"] is None:
+                    values = {k: v for k, v in data.items() if k != "id" and k not in KEY_COLUMNS}
+                    db.execute(
+                        update(College)
+                        .where(*(getattr(College, c) == data[c] for c in KEY_COLUMNS))
+                        .values(updated_at=now, **values)
+                    )
+
     @staticmethod
     def _to_float(value):
         try:
@@ -112,4 +496,4 @@ class ExcelImportService:
             try:
                 return datetime.strptime(str(value), "%d/%m/%Y").date()
             except Exception:
-                return None 
\ No newline at end of file
+                return None
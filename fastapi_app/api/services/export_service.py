@@ -0,0 +1,162 @@
+"""
+Streaming export of the whole (optionally filtered) catalog
+
+Rows are read through a server-side cursor EXPORT_CHUNK_SIZE at a time
+(``yield_per``) and each chunk is encoded and sent before the next is fetched,
+so memory stays flat however large the catalog is. NDJSON and CSV bodies can
+be gzip-compressed on the fly; Parquet is written one row group per chunk and
+needs pyarrow, which is optional.
+"""
+
+import csv
+import io
+import os
+import zlib
+from typing import Callable, Iterable, Iterator, List, Sequence
+
+from sqlalchemy.orm import Session
+
+from database import models
+from api.schemas.college import CollegeSearchRequest
+from api.services.catalog_service import RESPONSE_COLUMNS
+from api.services.college_service import CollegeService
+from api.services.json_encoding import dumps
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - pyarrow is optional
+    pa = pq = None
+
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", "1000"))
+
+# format -> (media type, file extension)
+EXPORT_FORMATS = {
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+# Formats that are worth gzip-compressing (Parquet pages are compressed already)
+GZIP_FORMATS = ("ndjson", "csv")
+
+
+def _arrow_type(column: str):
+    python_type = getattr(models.College, column).type.python_type
+    if python_type is int:
+        return pa.int64()
+    if python_type is float:
+        return pa.float64()
+    if python_type.__name__ == "date":
+        return pa.date32()
+    return pa.string()
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands its contents out by chunk
+
+    The Parquet writer records column chunk offsets from ``tell()``, so the
+    position keeps counting while drained bytes are released.
+    """
+
+    def __init__(self):
+        self._parts: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._parts.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        body, self._parts = b"".join(self._parts), []
+        return body
+
+
+class ExportService:
+    @staticmethod
+    def available(fmt: str) -> bool:
+        return fmt != "parquet" or pq is not None
+
+    @staticmethod
+    def rows(
+        db: Session,
+        payload: CollegeSearchRequest,
+        columns: Sequence[str] = RESPONSE_COLUMNS,
+        chunk_size: int = EXPORT_CHUNK_SIZE,
+    ) -> Iterator[List[dict]]:
+        """Chunks of row dicts matching the search filters, in ``payload.sort`` order"""
+        q = CollegeService.apply_filters(CollegeService.row_query(db, columns), payload)
+        statement = q.order_by(*CollegeService.order_by(payload.sort)).statement
+        result = db.execute(statement, execution_options={"yield_per": chunk_size})
+        for rows in result.partitions():
+            yield CollegeService.row_dicts(rows, columns)
+
+    @staticmethod
+    def stream(
+        session_factory: Callable[[], Session],
+        fmt: str,
+        payload: CollegeSearchRequest,
+        columns: Sequence[str] = RESPONSE_COLUMNS,
+        compress: bool = False,
+        chunk_size: int = EXPORT_CHUNK_SIZE,
+    ) -> Iterator[bytes]:
+        """Encoded body chunks; the session lives exactly as long as the stream"""
+        db = session_factory()
+        try:
+            chunks = ExportService.rows(db, payload, columns, chunk_size)
+            body = ENCODERS[fmt](chunks, columns)
+            yield from ExportService.gzip(body) if compress else body
+        finally:
+            db.close()
+
+    @staticmethod
+    def gzip(body: Iterable[bytes]) -> Iterator[bytes]:
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        for part in body:
+            compressed = compressor.compress(part)
+            if compressed:
+                yield compressed
+        yield compressor.flush()
+
+    @staticmethod
+    def ndjson(chunks: Iterable[List[dict]], columns: Sequence[str]) -> Iterator[bytes]:
+        for rows in chunks:
+            yield b"".join(dumps(row) + b"\n" for row in rows)
+
+    @staticmethod
+    def csv(chunks: Iterable[List[dict]], columns: Sequence[str]) -> Iterator[bytes]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        for rows in chunks:
+            writer.writerows([row[c] for c in columns] for row in rows)
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            # Header of an empty export
+            yield buffer.getvalue().encode()
+
+    @staticmethod
+    def parquet(chunks: Iterable[List[dict]], columns: Sequence[str]) -> Iterator[bytes]:
+        schema = pa.schema([pa.field(c, _arrow_type(c)) for c in columns])
+        sink = _ChunkSink()
+        with pq.ParquetWriter(sink, schema, compression="zstd") as writer:
+            for rows in chunks:
+                writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+                yield sink.drain()
+        yield sink.drain()
+
+
+ENCODERS = {
+    "ndjson": ExportService.ndjson,
+    "csv": ExportService.csv,
+    "parquet": ExportService.parquet,
+}
@@ -0,0 +1,178 @@
+"""
+Facet counts for the college catalog
+
+Unfiltered counts live in college_facet_counts, which ExcelImportService keeps
+current by applying per-row deltas as it writes, so the common request never
+scans colleges. Counts restricted by search filters come from the in-memory
+catalog when it is loaded and from GROUP BY queries otherwise.
+"""
+
+from collections import Counter
+from typing import Dict, Iterable, List, Mapping, Tuple
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from database.models import College, FacetCount
+from api.schemas.college import CollegeSearchRequest, BUDGET_BOUNDS, BUDGET_RANGES, CONTINENT_COUNTRIES
+from api.services.catalog_service import CatalogService
+
+# College columns a row's facet values are derived from
+FACET_COLUMNS = ("program_type", "degree_level", "location_country", "tuition_min", "tuition_max")
+FACETS = ("program_type", "degree_level", "country", "continent", "budget_range")
+TOTAL = ("total", "")
+OTHER_CONTINENT = "Other"
+
+COUNTRY_CONTINENT = {country: continent for continent, countries in CONTINENT_COUNTRIES.items() for country in countries}
+
+
+def in_budget(budget_range: str, tuition_min, tuition_max) -> bool:
+    """Python form of the budget_range search filter (NULL tuition_min never matches a cap)"""
+    low, high = BUDGET_BOUNDS[budget_range]
+    if high is not None and (tuition_min is None or tuition_min > high):
+        return False
+    if low is not None and tuition_max is not None and tuition_max < low:
+        return False
+    return True
+
+
+def facet_values(row: Mapping) -> List[Tuple[str, str]]:
+    """(facet, value) pairs a college counts towards; a college can fall in several budget ranges."""
+    country = row["location_country"]
+    values = [
+        TOTAL,
+        ("program_type", row["program_type"]),
+        ("degree_level", row["degree_level"]),
+        ("country", country),
+        ("continent", COUNTRY_CONTINENT.get(country, OTHER_CONTINENT)),
+    ]
+    values.extend(
+        ("budget_range", budget) for budget in BUDGET_RANGES
+        if in_budget(budget, row["tuition_min"], row["tuition_max"])
+    )
+    return values
+
+
+class FacetDelta:
+    """Accumulated changes to facet counts"""
+
+    def __init__(self):
+        self.counts: Counter = Counter()
+
+    def add(self, row: Mapping, sign: int = 1) -> None:
+        for key in facet_values(row):
+            self.counts[key] += sign
+
+    def remove(self, row: Mapping) -> None:
+        self.add(row, -1)
+
+    def __bool__(self) -> bool:
+        return any(self.counts.values())
+
+
+class FacetService:
+    @staticmethod
+    def apply(db: Session, delta: FacetDelta) -> None:
+        """Add a delta to the maintained counts (in the caller's transaction)"""
+        if not delta:
+            return
+        stored = {(f.facet, f.value): f for f in db.query(FacetCount).all()}
+        for (facet, value), change in delta.counts.items():
+            if not change:
+                continue
+            row = stored.get((facet, value))
+            if row is None:
+                db.add(FacetCount(facet=facet, value=value, count=change))
+            elif row.count + change == 0:
+                db.delete(row)
+            else:
+                row.count += change
+        db.flush()
+
+    @staticmethod
+    def rebuild(db: Session) -> None:
+        """Recompute the maintained counts from colleges (first start or repair)"""
+        delta = FacetDelta()
+        columns = [getattr(College, c) for c in FACET_COLUMNS]
+        for row in db.execute(select(*columns).execution_options(yield_per=10_000)).mappings():
+            delta.add(row)
+        db.query(FacetCount).delete()
+        FacetService.apply(db, delta)
+        db.commit()
+
+    @staticmethod
+    def ensure(db: Session) -> None:
+        """Build the maintained counts if they have never been computed"""
+        if db.query(FacetCount).first() is None and db.query(College.id).first() is not None:
+            FacetService.rebuild(db)
+
+    @staticmethod
+    def get_facets(db: Session, filters: CollegeSearchRequest) -> Dict:
+        if not (filters.program_type or filters.budget_range or filters.location):
+            counts = {(f.facet, f.value): f.count for f in db.query(FacetCount).all()}
+        else:
+            catalog = CatalogService.get()
+            if catalog is not None:
+                counts = FacetService._catalog_counts(catalog, filters)
+            else:
+                counts = FacetService._sql_counts(db, filters)
+        return FacetService._to_response(counts)
+
+    @staticmethod
+    def _catalog_counts(catalog, filters: CollegeSearchRequest) -> Dict[Tuple[str, str], int]:
+        mask = catalog.mask(filters)
+        counts = {TOTAL: int(mask.sum())}
+        for facet, codes, vocabulary in (
+            ("program_type", catalog.program_type, catalog.program_type_values),
+            ("degree_level", catalog.degree_level, catalog.degree_level_values),
+            ("country", catalog.country, catalog.country_values),
+        ):
+            for code, n in enumerate(np.bincount(codes[mask], minlength=len(vocabulary))):
+                if n:
+                    counts[(facet, vocabulary[code])] = int(n)
+        for (facet, country), n in list(counts.items()):
+            if facet == "country":
+                key = ("continent", COUNTRY_CONTINENT.get(country, OTHER_CONTINENT))
+                counts[key] = counts.get(key, 0) + n
+        for budget in BUDGET_RANGES:
+            n = int(catalog.mask(CollegeSearchRequest(budget_range=budget))[mask].sum())
+            if n:
+                counts[("budget_range", budget)] = n
+        return counts
+
+    @staticmethod
+    def _sql_counts(db: Session, filters: CollegeSearchRequest) -> Dict[Tuple[str, str], int]:
+        from api.services.college_service import CollegeService
+
+        counts: Dict[Tuple[str, str], int] = {}
+        for facet, column in (
+            ("program_type", College.program_type),
+            ("degree_level", College.degree_level),
+            ("country", College.location_country),
+        ):
+            q = CollegeService.apply_filters(db.query(column, func.count()), filters).group_by(column)
+            for value, n in q.all():
+                counts[(facet, value)] = n
+        counts[TOTAL] = sum(n for (facet, _), n in counts.items() if facet == "program_type")
+        for (facet, country), n in list(counts.items()):
+            if facet == "country":
+                key = ("continent", COUNTRY_CONTINENT.get(country, OTHER_CONTINENT))
+                counts[key] = counts.get(key, 0) + n
+        for budget in BUDGET_RANGES:
+            q = CollegeService.apply_filters(db.query(func.count(College.id)), filters)
+            n = CollegeService.apply_filters(q, CollegeSearchRequest(budget_range=budget)).scalar()
+            if n:
+                counts[("budget_range", budget)] = n
+        return counts
+
+    @staticmethod
+    def _to_response(counts: Mapping[Tuple[str, str], int]) -> Dict:
+        response = {facet: {} for facet in FACETS}
+        for (facet, value), n in sorted(counts.items(), key=lambda item: (-item[1], item[0][1])):
+            if facet in response:
+                response[facet][value] = n
+        # Budget ranges in their natural order rather than by count
+        response["budget_range"] = {b: response["budget_range"][b] for b in BUDGET_RANGES if b in response["budget_range"]}
+        response["total"] = counts.get(TOTAL, 0)
+        return response
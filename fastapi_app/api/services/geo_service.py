@@ -0,0 +1,250 @@
+"""
+Geographic proximity search over the college catalog
+
+Programs are placed at their city's coordinates (filled in by the Excel
+importer from data/city_coordinates.py). Each coordinate becomes a unit vector
+on the sphere, where straight-line (chord) distance is a monotonic function of
+great-circle distance, so an ordinary 3-D KD-tree answers "nearest k" and
+"within r km" exactly. The tree is static: points are permuted so that every
+node owns one contiguous slice, and nodes whose bounding box lies wholly inside
+the query ball are taken as a slice without testing their points. Like the
+recommendation features, the index is cached per catalog generation.
+"""
+
+import heapq
+import math
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from database.models import College
+from data.city_coordinates import CITY_COORDINATES, COUNTRY_ALIASES
+from api.services.catalog_service import CatalogService, ColumnarCatalog
+from api.services.suggest_service import fold
+
+EARTH_RADIUS_KM = 6371.0088
+KDTREE_LEAF_SIZE = 64
+
+_CITIES: Dict[Tuple[str, str], Tuple[float, float]] = {}
+for (_city, _country), _coordinates in CITY_COORDINATES.items():
+    _CITIES.setdefault((fold(_city), fold(_country)), _coordinates)
+    _CITIES.setdefault((fold(_city), ""), _coordinates)
+_COUNTRIES = {fold(alias): fold(country) for alias, country in COUNTRY_ALIASES.items()}
+
+
+def city_coordinates(city: str, country: Optional[str] = None) -> Optional[Tuple[float, float]]:
+    """(latitude, longitude) of a known city, or None
+
+    Matching ignores case and diacritics. Without a country the first listed
+    city of that name is used.
+    """
+    country = fold(country or "")
+    return _CITIES.get((fold(city or ""), _COUNTRIES.get(country, country)))
+
+
+def unit_vectors(latitudes, longitudes) -> np.ndarray:
+    lat = np.radians(np.asarray(latitudes, dtype=np.float64))
+    lon = np.radians(np.asarray(longitudes, dtype=np.float64))
+    cos_lat = np.cos(lat)
+    return np.column_stack((cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)))
+
+
+def chord_for_km(km: float) -> float:
+    """Chord length on the unit sphere for a great-circle distance"""
+    return 2.0 * math.sin(min(km / EARTH_RADIUS_KM, math.pi) / 2.0)
+
+
+def km_for_chord(chord) -> np.ndarray:
+    return 2.0 * EARTH_RADIUS_KM * np.arcsin(np.clip(np.asarray(chord) / 2.0, 0.0, 1.0))
+
+
+class KDTree:
+    """Static KD-tree over (n, 3) points; queries return point indices and squared distances"""
+
+    def __init__(self, points: np.ndarray, leaf_size: int = KDTREE_LEAF_SIZE):
+        self.points = np.ascontiguousarray(points, dtype=np.float64)
+        self.perm = np.arange(len(self.points), dtype=np.int64)
+        starts, ends, lows, highs = [], [], [], []
+        children: List[int] = []
+
+        def node(start: int, end: int) -> int:
+            box = self.points[self.perm[start:end]]
+            starts.append(start)
+            ends.append(end)
+            lows.append(box.min(axis=0) if end > start else np.full(3, np.inf))
+            highs.append(box.max(axis=0) if end > start else np.full(3, -np.inf))
+            children.append(-1)
+            return len(starts) - 1
+
+        stack = [node(0, len(self.points))]
+        while stack:
+            current = stack.pop()
+            start, end = starts[current], ends[current]
+            spread = highs[current] - lows[current]
+            # Identical points cannot be split; they stay together in one leaf
+            if end - start <= leaf_size or spread.max() == 0:
+                continue
+            dim = int(np.argmax(spread))
+            mid = (start + end) // 2
+            segment = self.perm[start:end]
+            self.perm[start:end] = segment[np.argpartition(self.points[segment, dim], mid - start)]
+            # Children are allocated in pairs, so the right child is left + 1
+            children[current] = node(start, mid)
+            node(mid, end)
+            stack.extend((children[current], children[current] + 1))
+
+        self.starts = np.array(starts, dtype=np.int64)
+        self.ends = np.array(ends, dtype=np.int64)
+        self.lows = np.array(lows).reshape(-1, 3)
+        self.highs = np.array(highs).reshape(-1, 3)
+        self.children = np.array(children, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def _box_distance2(self, node: int, point: np.ndarray) -> float:
+        gap = np.maximum(self.lows[node] - point, 0.0) + np.maximum(point - self.highs[node], 0.0)
+        return float(gap @ gap)
+
+    def _leaf(self, node: int, point: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        indices = self.perm[self.starts[node]:self.ends[node]]
+        diff = self.points[indices] - point
+        return indices, np.einsum("ij,ij->i", diff, diff)
+
+    def query_radius(self, point: np.ndarray, chord: float) -> Tuple[np.ndarray, np.ndarray]:
+        """All points within ``chord`` of ``point``, unordered"""
+        limit = chord * chord
+        found_indices, found_distances = [], []
+        stack = [0] if len(self) else []
+        while stack:
+            node = stack.pop()
+            if self._box_distance2(node, point) > limit:
+                continue
+            far = np.maximum(np.abs(point - self.lows[node]), np.abs(point - self.highs[node]))
+            child = self.children[node]
+            if child < 0 or far @ far <= limit:
+                indices, distances = self._leaf(node, point)
+                if far @ far > limit:
+                    keep = distances <= limit
+                    indices, distances = indices[keep], distances[keep]
+                found_indices.append(indices)
+                found_distances.append(distances)
+            else:
+                stack.extend((child, child + 1))
+        if not found_indices:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        return np.concatenate(found_indices), np.concatenate(found_distances)
+
+    def query_nearest(self, point: np.ndarray, k: int, chord: float = math.inf) -> Tuple[np.ndarray, np.ndarray]:
+        """The ``k`` points nearest ``point`` within ``chord``, nearest first; ties by index"""
+        bound = chord * chord
+        best_indices = np.empty(0, dtype=np.int64)
+        best_distances = np.empty(0)
+        heap = [(self._box_distance2(0, point), 0)] if len(self) else []
+        while heap:
+            distance, node = heapq.heappop(heap)
+            if distance > bound:
+                break
+            child = self.children[node]
+            if child >= 0:
+                for c in (child, child + 1):
+                    heapq.heappush(heap, (self._box_distance2(c, point), c))
+                continue
+            indices, distances = self._leaf(node, point)
+            keep = distances <= bound
+            best_indices = np.concatenate((best_indices, indices[keep]))
+            best_distances = np.concatenate((best_distances, distances[keep]))
+            order = np.lexsort((best_indices, best_distances))[:k]
+            best_indices, best_distances = best_indices[order], best_distances[order]
+            if len(best_indices) == k:
+                bound = float(best_distances[-1])
+        return best_indices, best_distances
+
+
+class GeoIndex:
+    """KD-tree over the catalog rows that have coordinates"""
+
+    def __init__(self, catalog: ColumnarCatalog):
+        self.catalog = catalog
+        self.generation = catalog.generation
+        latitudes = np.array([np.nan if v is None else v for v in catalog.columns["latitude"]], dtype=np.float64)
+        longitudes = np.array([np.nan if v is None else v for v in catalog.columns["longitude"]], dtype=np.float64)
+        known = ~(np.isnan(latitudes) | np.isnan(longitudes))
+        # Tree point i is catalog row positions[i]; rows are in id order, so
+        # index ties break by college id
+        self.positions = np.flatnonzero(known)
+        self.tree = KDTree(unit_vectors(latitudes[known], longitudes[known]))
+
+    def near(
+        self, latitude: float, longitude: float, k: int = 20, radius_km: Optional[float] = None
+    ) -> List[Tuple[dict, float]]:
+        """(college row, distance in km) for the ``k`` nearest programs, optionally within ``radius_km``"""
+        point = unit_vectors([latitude], [longitude])[0]
+        chord = math.inf if radius_km is None else chord_for_km(radius_km)
+        indices, distances = self.tree.query_nearest(point, k, chord)
+        kilometres = km_for_chord(np.sqrt(distances))
+        return [
+            (self.catalog.row(self.positions[i]), round(float(km), 1))
+            for i, km in zip(indices, kilometres)
+        ]
+
+
+_lock = threading.Lock()
+_index: Optional[GeoIndex] = None
+
+
+class GeoService:
+    @staticmethod
+    def ensure(db: Session) -> int:
+        """Fill in coordinates of known cities for rows imported without them; returns rows updated
+
+        The filled rows count as changed: they get a new updated_at and a
+        change-log entry, so the catalog version (computed after this at
+        startup) and the change feed carry the coordinates to cached clients.
+        """
+        cities = db.execute(
+            select(College.location_city, College.location_country)
+            .where(College.latitude.is_(None) | College.longitude.is_(None))
+            .group_by(College.location_city, College.location_country)
+        ).all()
+        updated = 0
+        for city, country in cities:
+            coordinates = city_coordinates(city, country)
+            if coordinates is None:
+                continue
+            result = db.execute(
+                update(College)
+                .where(College.location_city == city, College.location_country == country)
+                .where(College.latitude.is_(None) | College.longitude.is_(None))
+                # Coordinates are response fields: bump updated_at so cached copies revalidate
+                .values(latitude=coordinates[0], longitude=coordinates[1], updated_at=func.current_timestamp())
+            )
+            updated += result.rowcount
+        db.commit()
+        return updated
+
+    @staticmethod
+    def index(db: Session) -> GeoIndex:
+        """Proximity index for the current catalog generation, built on first use."""
+        global _index
+        generation = CatalogService.generation()
+        index = _index
+        if index is not None and index.generation == generation:
+            return index
+        with _lock:
+            if _index is None or _index.generation != generation:
+                catalog = CatalogService.get()
+                if catalog is None or catalog.generation != generation:
+                    # Catalog disabled: build a private snapshot to index
+                    catalog = CatalogService.build(db, generation=generation)
+                _index = GeoIndex(catalog)
+            return _index
+
+    @staticmethod
+    def near(
+        db: Session, latitude: float, longitude: float, k: int = 20, radius_km: Optional[float] = None
+    ) -> List[Tuple[dict, float]]:
+        return GeoService.index(db).near(latitude, longitude, k=k, radius_km=radius_km)
@@ -0,0 +1,81 @@
+"""
+HTTP validators for conditional GETs
+
+Responses carry a strong ETag, Last-Modified and Cache-Control so that
+clients and a caching proxy in front of the API can revalidate instead of
+re-downloading. A request whose If-None-Match lists the current ETag (or,
+without If-None-Match, whose If-Modified-Since is not older than
+Last-Modified) gets an empty 304 Not Modified.
+"""
+
+import os
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+from fastapi import Request, Response
+
+HTTP_CACHE_MAX_AGE = int(os.getenv("HTTP_CACHE_MAX_AGE", "60"))
+CACHE_CONTROL = f"public, max-age={HTTP_CACHE_MAX_AGE}"
+
+
+def http_date(value: datetime) -> str:
+    """RFC 7231 date for a naive UTC (SQLite CURRENT_TIMESTAMP) or aware datetime"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def validator_headers(etag: str, last_modified: Optional[datetime] = None) -> dict:
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    return headers
+
+
+def not_modified(request: Request, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        # Weak comparison, as RFC 7232 prescribes for If-None-Match
+        return "*" in tags or etag in tags or f"W/{etag}" in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if last_modified.tzinfo is None:
+            last_modified = last_modified.replace(tzinfo=timezone.utc)
+        # HTTP dates have second precision
+        return last_modified.replace(microsecond=0) <= since
+    return False
+
+
+def accepts_encoding(accept_encoding: str, coding: str) -> bool:
+    """Whether an Accept-Encoding header allows ``coding``; q=0 marks a coding as not acceptable"""
+    qualities = {}
+    for item in accept_encoding.split(","):
+        name, *params = item.split(";")
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if name.strip():
+            qualities[name.strip().lower()] = quality
+    return qualities.get(coding, qualities.get("*", 0.0)) > 0
+
+
+def conditional(
+    request: Request, response: Response, etag: str, last_modified: Optional[datetime] = None
+) -> Optional[Response]:
+    """Set validators on ``response``; returns a 304 response when the client's copy is current"""
+    headers = validator_headers(etag, last_modified)
+    if not_modified(request, etag, last_modified):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
@@ -0,0 +1,196 @@
+"""
+Import Job Service - runs Excel imports in the background
+
+Uploads are saved to a temporary file by the request handler and imported by a
+single worker thread, so requests return immediately and imports submitted to
+one process never overlap. Each API worker process has its own thread, though:
+imports sent to different workers run concurrently and are only serialized by
+the database's write lock (with SQLite, the second waits up to busy_timeout
+for the first to commit and fails if it has not).
+
+Job state is written to one JSON file per job in IMPORT_JOBS_DIR, replaced
+atomically on every change, so GET /api/admin/colleges/import-status answers
+from any worker, not only the one that accepted the upload. It is not kept in
+the database: an import holds the write transaction until it commits, and
+SQLite would block progress updates behind it. Only finished jobs are dropped
+to keep MAX_TRACKED_JOBS.
+
+A job that fails before its rows are committed ends as "failed" with nothing
+written. One whose rows were committed but whose follow-up steps (full-text
+index, change-log compaction, catalog, suggestion and match refresh) failed
+ends as "post_processing_failed": the data is in, derived state may be stale
+until the next import or restart.
+"""
+
+import glob
+import json
+import os
+import re
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from database.database import DB_DIR, SessionLocal, project_path
+from api.services.excel_service import ExcelImportService, PostImportError
+
+MAX_TRACKED_JOBS = 50
+# Shared by every worker; relative paths are resolved against the project root
+IMPORT_JOBS_DIR = project_path(os.getenv("IMPORT_JOBS_DIR") or os.path.join(DB_DIR, "import_jobs"))
+FINISHED_STATUSES = ("completed", "failed", "post_processing_failed")
+_JOB_ID = re.compile(r"[0-9a-f]{32}")
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="excel-import")
+_lock = threading.Lock()
+
+# Stored in the job file; options are kept for the worker that runs the job
+_FIELDS = (
+    "id", "filename", "options", "status", "created_at", "started_at", "finished_at",
+    "inserted", "updated", "skipped", "report", "error",
+)
+_TIMES = ("created_at", "started_at", "finished_at")
+
+
+class ImportJob:
+    """Progress of one background import"""
+
+    def __init__(self, filename: str, options: Dict):
+        self.id = uuid.uuid4().hex
+        self.filename = filename
+        self.options = options
+        self.status = "queued"
+        self.created_at = datetime.utcnow()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self.inserted = 0
+        self.updated = 0
+        self.skipped = 0
+        self.report: Optional[Dict] = None
+        self.error: Optional[str] = None
+
+    @property
+    def rows_processed(self) -> int:
+        return self.inserted + self.updated + self.skipped
+
+    @property
+    def rows_per_second(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        elapsed = ((self.finished_at or datetime.utcnow()) - self.started_at).total_seconds()
+        return round(self.rows_processed / elapsed, 1) if elapsed > 0 else 0.0
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+    def update_progress(self, counts: Dict) -> None:
+        self.inserted = counts["inserted"]
+        self.updated = counts["updated"]
+        self.skipped = counts["skipped"]
+        ImportJobService._save(self)
+
+    def to_dict(self) -> Dict:
+        data = {name: getattr(self, name) for name in _FIELDS}
+        for name in _TIMES:
+            data[name] = data[name].isoformat() if data[name] else None
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "ImportJob":
+        job = cls.__new__(cls)
+        for name in _FIELDS:
+            value = data.get(name)
+            setattr(job, name, datetime.fromisoformat(value) if name in _TIMES and value else value)
+        return job
+
+
+class ImportJobService:
+    @staticmethod
+    def submit(path: str, filename: str, **options) -> ImportJob:
+        """Queue an import of the saved upload at ``path``; the file is removed when done."""
+        job = ImportJob(filename, options)
+        ImportJobService._save(job)
+        ImportJobService._evict()
+        _executor.submit(ImportJobService._run, job, path)
+        return job
+
+    @staticmethod
+    def get_job(job_id: str) -> Optional[ImportJob]:
+        if not _JOB_ID.fullmatch(job_id):
+            return None
+        return ImportJobService._load(os.path.join(IMPORT_JOBS_DIR, f"{job_id}.json"))
+
+    @staticmethod
+    def latest_job() -> Optional[ImportJob]:
+        jobs = ImportJobService._jobs()
+        return jobs[-1] if jobs else None
+
+    @staticmethod
+    def _run(job: ImportJob, path: str) -> None:
+        job.status = "running"
+        job.started_at = datetime.utcnow()
+        ImportJobService._save(job)
+        db = SessionLocal()
+        try:
+            report = ExcelImportService.import_excel(path, db, progress=job.update_progress, **job.options)
+            job.update_progress(report)
+            job.report = report
+            job.status = "completed"
+        except PostImportError as e:
+            db.rollback()
+            job.update_progress(e.report)
+            job.report = e.report
+            job.error = str(e)
+            job.status = "post_processing_failed"
+        except Exception as e:
+            db.rollback()
+            job.error = str(e)
+            job.status = "failed"
+        finally:
+            db.close()
+            os.remove(path)
+            job.finished_at = datetime.utcnow()
+            ImportJobService._save(job)
+
+    @staticmethod
+    def _save(job: ImportJob) -> None:
+        """Write the job file; readers see either the previous or the new state"""
+        os.makedirs(IMPORT_JOBS_DIR, exist_ok=True)
+        path = os.path.join(IMPORT_JOBS_DIR, f"{job.id}.json")
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w") as fh:
+            json.dump(job.to_dict(), fh)
+        os.replace(tmp, path)
+
+    @staticmethod
+    def _load(path: str) -> Optional[ImportJob]:
+        try:
+            with open(path) as fh:
+                return ImportJob.from_dict(json.load(fh))
+        except (OSError, ValueError):
+            # Missing, or removed by another worker's eviction
+            return None
+
+    @staticmethod
+    def _jobs() -> List[ImportJob]:
+        """Tracked jobs of every worker, oldest first"""
+        paths = glob.glob(os.path.join(IMPORT_JOBS_DIR, "*.json"))
+        jobs = [job for job in map(ImportJobService._load, paths) if job is not None]
+        return sorted(jobs, key=lambda job: job.created_at)
+
+    @staticmethod
+    def _evict() -> None:
+        """Drop the oldest finished jobs beyond MAX_TRACKED_JOBS; queued and running jobs are kept"""
+        with _lock:
+            jobs = ImportJobService._jobs()
+            excess = len(jobs) - MAX_TRACKED_JOBS
+            for job in jobs:
+                if excess <= 0:
+                    break
+                if job.finished:
+                    try:
+                        os.remove(os.path.join(IMPORT_JOBS_DIR, f"{job.id}.json"))
+                    except OSError:
+                        pass
+                    excess -= 1
@@ -0,0 +1,54 @@
+"""
+Fast JSON encoding for college lists
+
+College rows come from our own database or the in-memory catalog, so list
+endpoints skip per-object Pydantic validation: rows are plain dicts of the
+RESPONSE_COLUMNS (which mirror CollegeResponse field for field) and are
+encoded straight to bytes with orjson. Routes keep their response_model, so
+the OpenAPI schema is unchanged. Without orjson installed the standard
+library encoder is used instead.
+"""
+
+import json
+from datetime import date
+from typing import Any, Iterable, List, Mapping
+
+from fastapi import Response
+
+from api.services.catalog_service import RESPONSE_COLUMNS
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is in requirements.txt
+    orjson = None
+
+
+def _default(value: Any):
+    if isinstance(value, date):
+        return value.isoformat()
+    if hasattr(value, "item"):  # numpy scalars
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(value: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(value, separators=(",", ":"), default=_default).encode()
+
+
+def college_dicts(items: Iterable) -> List[dict]:
+    """Row dicts for college rows given as dicts or ORM objects"""
+    return [
+        item if isinstance(item, Mapping) else {c: getattr(item, c) for c in RESPONSE_COLUMNS}
+        for item in items
+    ]
+
+
+class FastJSONResponse(Response):
+    """JSON response rendered with ``dumps``; bytes content is sent as is"""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return content if isinstance(content, bytes) else dumps(content)
@@ -0,0 +1,50 @@
+"""
+Keyset (cursor) pagination helpers
+
+A cursor is the sort key of the last row on a page, JSON-encoded and wrapped in
+URL-safe base64 so clients treat it as opaque. The next page starts strictly
+after that key, which an index on the sort columns can seek to directly instead
+of walking and discarding OFFSET rows.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Mapping, Optional, Sequence
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(*key) -> str:
+    values = [v.isoformat() if isinstance(v, datetime) else v for v in key]
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, types: Sequence[type]) -> tuple:
+    """Decode a cursor into a tuple whose items are converted to ``types``."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError("wrong number of key values")
+        return tuple(
+            datetime.fromisoformat(v) if t is datetime else t(v)
+            for v, t in zip(values, types)
+        )
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor(f"Invalid cursor: {e}") from e
+
+
+def next_cursor(items: Sequence, limit: int, *attributes: str) -> Optional[str]:
+    """Cursor for the page after ``items`` (ORM objects or row dicts), or None when this was the last page."""
+    if len(items) < limit:
+        return None
+    last = items[-1]
+    if isinstance(last, Mapping):
+        return encode_cursor(*(last[a] for a in attributes))
+    return encode_cursor(*(getattr(last, a) for a in attributes))
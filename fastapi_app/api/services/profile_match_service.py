@@ -0,0 +1,168 @@
+"""
+Profile Match Service - materialized profile x college match scores
+
+profile_matches holds every (profile, college) pair scoring at least
+MATCH_MIN_SCORE with the RecommendationService model. Keeping a threshold
+rather than a per-profile top-k makes maintenance exact and local: a changed
+profile only rescores its own row of the matrix, and an import only rescores
+the columns of the colleges it touched.
+"""
+
+import os
+from datetime import datetime
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import delete, func, insert, select, tuple_
+from sqlalchemy.orm import Session, undefer_group
+
+from database import models
+from api.services.recommendation_service import (
+    PROFILE_FETCH_SIZE, MATCH_CHUNK_CELLS, SCORE_DECIMALS, CatalogFeatures, RecommendationService,
+)
+
+MATCH_MIN_SCORE = float(os.getenv("PROFILE_MATCH_MIN_SCORE", "0.65"))
+DELETE_SLICE_SIZE = 500
+
+ImportMark = Tuple[int, datetime]
+
+
+class ProfileMatchService:
+    @staticmethod
+    def refresh_profile(db: Session, profile: models.UserProfile) -> int:
+        """Recompute the matches of one profile; returns the number stored
+
+        Runs in the caller's transaction, which commits the profile and its
+        matches together.
+        """
+        features = RecommendationService.features(db)
+        db.execute(delete(models.ProfileMatch).where(models.ProfileMatch.profile_id == profile.id))
+        scores = features.weight_matrix([profile]).T @ features.matrix.T
+        rows = ProfileMatchService._rows([profile], scores, features.catalog.ids)
+        ProfileMatchService._insert(db, rows)
+        return len(rows)
+
+    @staticmethod
+    def remove_profile(db: Session, profile_id: int) -> None:
+        db.execute(delete(models.ProfileMatch).where(models.ProfileMatch.profile_id == profile_id))
+
+    @staticmethod
+    def refresh_colleges(db: Session, college_ids: Sequence[int]) -> None:
+        """Rescore the given colleges against every profile"""
+        features = RecommendationService.features(db)
+        for start in range(0, len(college_ids), DELETE_SLICE_SIZE):
+            batch = college_ids[start:start + DELETE_SLICE_SIZE]
+            db.execute(delete(models.ProfileMatch).where(models.ProfileMatch.college_id.in_(batch)))
+
+        # Colleges no longer in the catalog just lose their matches
+        position = features.catalog.position
+        indices = np.array([position[i] for i in college_ids if i in position], dtype=np.int64)
+        if len(indices):
+            ProfileMatchService._score(db, features, features.matrix[indices], features.catalog.ids[indices])
+        db.commit()
+
+    @staticmethod
+    def rebuild(db: Session) -> None:
+        """Recompute the whole table"""
+        features = RecommendationService.features(db)
+        db.execute(delete(models.ProfileMatch))
+        ProfileMatchService._score(db, features, features.matrix, features.catalog.ids)
+        db.commit()
+
+    @staticmethod
+    def ensure(db: Session) -> None:
+        """Build the table if it has never been computed"""
+        if db.query(models.ProfileMatch).first() is None and db.query(models.UserProfile.id).first() is not None:
+            ProfileMatchService.rebuild(db)
+
+    @staticmethod
+    def import_mark(db: Session) -> ImportMark:
+        """Highest college id and database time before an import, for after_import"""
+        max_id = db.execute(select(func.max(models.College.id))).scalar() or 0
+        now = db.execute(select(func.current_timestamp())).scalar()
+        return max_id, now
+
+    @staticmethod
+    def after_import(db: Session, mark: ImportMark) -> None:
+        """Rescore the colleges inserted or updated since ``mark``"""
+        max_id, started = mark
+        touched = [
+            college_id
+            for (college_id,) in db.execute(
+                select(models.College.id).where(
+                    (models.College.id > max_id) | (models.College.updated_at >= started)
+                )
+            )
+        ]
+        if not touched:
+            return
+        catalog_size = RecommendationService.features(db).catalog.size
+        if len(touched) * 2 > catalog_size:
+            # Most of the catalog changed: one pass over whole profile chunks is cheaper
+            ProfileMatchService.rebuild(db)
+        else:
+            ProfileMatchService.refresh_colleges(db, touched)
+
+    @staticmethod
+    def list_matches(
+        db: Session, email: str, limit: int = 50, after: Optional[Tuple[float, int]] = None
+    ) -> Optional[List[Tuple[models.College, float]]]:
+        """Stored matches of a profile, best first, or None if there is no such profile
+
+        ``after`` is the last (score, college_id) of the previous page.
+        """
+        profile_id = db.execute(
+            select(models.UserProfile.id).where(models.UserProfile.email == email)
+        ).scalar()
+        if profile_id is None:
+            return None
+        q = (
+            db.query(models.College, models.ProfileMatch.score)
+            .join(models.ProfileMatch, models.ProfileMatch.college_id == models.College.id)
+            .filter(models.ProfileMatch.profile_id == profile_id)
+            .options(undefer_group(models.TEXT_GROUP))
+        )
+        if after is not None:
+            q = q.filter(tuple_(models.ProfileMatch.score, models.ProfileMatch.college_id) < after)
+        q = q.order_by(models.ProfileMatch.score.desc(), models.ProfileMatch.college_id.desc())
+        return [(college, score) for college, score in q.limit(limit).all()]
+
+    @staticmethod
+    def _score(db: Session, features: CatalogFeatures, matrix: np.ndarray, college_ids: np.ndarray) -> None:
+        """Score ``matrix`` rows (colleges) against all profiles, chunked, and insert matches"""
+        chunk_size = max(1, min(PROFILE_FETCH_SIZE, MATCH_CHUNK_CELLS // max(len(matrix), 1)))
+        # Materialize each chunk before inserting so the read cursor is not shared with writes
+        last_id = 0
+        while True:
+            profiles = (
+                db.query(models.UserProfile)
+                .filter(models.UserProfile.id > last_id)
+                .order_by(models.UserProfile.id)
+                .limit(chunk_size)
+                .all()
+            )
+            if not profiles:
+                break
+            scores = features.weight_matrix(profiles).T @ matrix.T
+            ProfileMatchService._insert(db, ProfileMatchService._rows(profiles, scores, college_ids))
+            last_id = profiles[-1].id
+
+    @staticmethod
+    def _rows(profiles: Sequence[models.UserProfile], scores: np.ndarray, college_ids: np.ndarray) -> List[dict]:
+        """Insert rows for the profiles x colleges ``scores`` at or above the threshold"""
+        scores = np.round(scores, SCORE_DECIMALS)
+        profile_index, college_index = np.nonzero(scores >= MATCH_MIN_SCORE)
+        return [
+            {
+                "profile_id": profiles[p].id,
+                "college_id": int(college_ids[c]),
+                "score": round(float(scores[p, c]), SCORE_DECIMALS),
+            }
+            for p, c in zip(profile_index, college_index)
+        ]
+
+    @staticmethod
+    def _insert(db: Session, rows: Iterable[dict]) -> None:
+        rows = list(rows)
+        if rows:
+            db.execute(insert(models.ProfileMatch), rows)
@@ -0,0 +1,284 @@
+"""
+Recommendation Service - ranks catalog programs for user profiles
+
+Every program is a row of a feature matrix (one-hot program type, degree level
+and continent, plus a budget-fit score per budget range) and every profile is a
+weight vector over the same columns, so scoring the whole catalog is a single
+matrix product. The matrix is derived from the columnar catalog and cached until
+the catalog generation changes. Batch matching stacks profile vectors into a
+matrix and scores them in chunks sized to bound the profiles x programs matrix.
+"""
+
+import json
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from database import models
+from database.database import ReadSessionLocal, run_in_session
+from api.schemas.college import BUDGET_BOUNDS, CONTINENT_COUNTRIES
+from api.schemas.recommendation import ProfileFilter
+from api.services.catalog_service import CatalogService, ColumnarCatalog
+
+# Component weights; a program matching on every component scores 1.0
+PROGRAM_WEIGHT = 0.40
+BUDGET_WEIGHT = 0.25
+LOCATION_WEIGHT = 0.20
+DEGREE_WEIGHT = 0.15
+# Subtracted for programs outside the preferred continent when the profile
+# does not include international programs
+INTERNATIONAL_PENALTY = 0.5
+# Budget fit falls linearly to 0 this far outside the requested range
+BUDGET_SLACK = 20000.0
+UNKNOWN_BUDGET_SCORE = 0.5
+# Scores are ranked and reported at this precision, so float32 rounding noise
+# between the single and batched products cannot reorder ties
+SCORE_DECIMALS = 4
+
+# Upper bound on profiles x programs cells scored at once (float32, so ~64 MB)
+MATCH_CHUNK_CELLS = 16_000_000
+PROFILE_FETCH_SIZE = 500
+
+BIAS = ("bias", "")
+
+
+def degree_levels(profile: models.UserProfile) -> List[str]:
+    """Degree levels of a profile (stored as a JSON list); empty means any"""
+    if not profile.degree_level:
+        return []
+    try:
+        levels = json.loads(profile.degree_level)
+    except ValueError:
+        return []
+    return [level for level in levels if isinstance(level, str)] if isinstance(levels, list) else []
+
+
+def budget_fit(tuition_min: np.ndarray, tuition_max: np.ndarray, low: Optional[float], high: Optional[float]) -> np.ndarray:
+    """1.0 where the tuition range overlaps [low, high], decaying with the distance outside it"""
+    gap = np.zeros(len(tuition_min), dtype=np.float64)
+    # fmax ignores NaN, so a missing bound only drops its side of the gap
+    if high is not None:
+        gap = np.fmax(gap, tuition_min - high)
+    if low is not None:
+        gap = np.fmax(gap, low - tuition_max)
+    fit = np.clip(1.0 - gap / BUDGET_SLACK, 0.0, 1.0)
+    fit[np.isnan(tuition_min) & np.isnan(tuition_max)] = UNKNOWN_BUDGET_SCORE
+    return fit
+
+
+class CatalogFeatures:
+    """Feature matrix of a catalog snapshot, one row per program"""
+
+    def __init__(self, catalog: ColumnarCatalog):
+        self.catalog = catalog
+        self.generation = catalog.generation
+
+        blocks: List[np.ndarray] = [np.ones(catalog.size, dtype=np.float32)]
+        keys: List[Tuple[str, str]] = [BIAS]
+        for code, value in enumerate(catalog.program_type_values):
+            blocks.append(catalog.program_type == code)
+            keys.append(("program_type", value))
+        for code, value in enumerate(catalog.degree_level_values):
+            blocks.append(catalog.degree_level == code)
+            keys.append(("degree_level", value))
+        for budget_range, (low, high) in BUDGET_BOUNDS.items():
+            blocks.append(budget_fit(catalog.tuition_min, catalog.tuition_max, low, high))
+            keys.append(("budget_range", budget_range))
+        for continent, countries in CONTINENT_COUNTRIES.items():
+            codes = [catalog.country_lookup[c] for c in countries if c in catalog.country_lookup]
+            blocks.append(np.isin(catalog.country, codes))
+            keys.append(("continent", continent))
+
+        self.columns: Dict[Tuple[str, str], int] = {key: j for j, key in enumerate(keys)}
+        self.matrix = np.column_stack(blocks).astype(np.float32)
+
+        # Ties in score are broken by (name, id), as in the default list order
+        self.name_rank = np.empty(catalog.size, dtype=np.int64)
+        self.name_rank[catalog.orders["name_asc"]] = np.arange(catalog.size)
+
+    def weights(self, profile: models.UserProfile) -> np.ndarray:
+        """Weight vector of a profile over the feature columns"""
+        w = np.zeros(len(self.columns), dtype=np.float32)
+        bias = self.columns[BIAS]
+
+        column = self.columns.get(("program_type", profile.program_interest))
+        if column is not None:
+            w[column] += PROGRAM_WEIGHT
+
+        column = self.columns.get(("budget_range", profile.budget_range))
+        if column is not None:
+            w[column] += BUDGET_WEIGHT
+
+        column = self.columns.get(("continent", profile.location_preference))
+        if column is None:
+            # "Any" (or an unknown preference) matches every location
+            w[bias] += LOCATION_WEIGHT
+        else:
+            w[column] += LOCATION_WEIGHT
+            if profile.include_international == "false":
+                w[bias] -= INTERNATIONAL_PENALTY
+                w[column] += INTERNATIONAL_PENALTY
+
+        levels = degree_levels(profile)
+        if not levels:
+            w[bias] += DEGREE_WEIGHT
+        for level in set(levels):
+            column = self.columns.get(("degree_level", level))
+            if column is not None:
+                w[column] += DEGREE_WEIGHT
+        return w
+
+    def weight_matrix(self, profiles: Sequence[models.UserProfile]) -> np.ndarray:
+        """Features x profiles weight matrix"""
+        if not profiles:
+            return np.zeros((len(self.columns), 0), dtype=np.float32)
+        return np.column_stack([self.weights(p) for p in profiles])
+
+    def scores(self, profile: models.UserProfile) -> np.ndarray:
+        scores = self.matrix @ self.weights(profile)
+        return np.round(scores, SCORE_DECIMALS, out=scores)
+
+    def top_k(self, scores: np.ndarray, k: int) -> np.ndarray:
+        """Row indices of the ``k`` best scores, best first"""
+        if k <= 0 or not len(scores):
+            return np.empty(0, dtype=np.int64)
+        if k >= len(scores):
+            candidates = np.arange(len(scores))
+        else:
+            # Everything tied with the k-th best is a candidate, so the
+            # tie-break below is exact rather than up to argpartition
+            threshold = np.partition(scores, len(scores) - k)[len(scores) - k]
+            candidates = np.flatnonzero(scores >= threshold)
+        order = np.lexsort((self.name_rank[candidates], -scores[candidates]))
+        return candidates[order[:k]]
+
+    def recommend(self, profile: models.UserProfile, k: int) -> List[Tuple[dict, float]]:
+        scores = self.scores(profile)
+        return [(self.catalog.row(i), round(float(scores[i]), SCORE_DECIMALS)) for i in self.top_k(scores, k)]
+
+    def match_chunks(
+        self, profiles: Iterable[models.UserProfile], k: int, min_score: Optional[float] = None
+    ) -> Iterator[Tuple[models.UserProfile, List[Tuple[int, float]]]]:
+        """(profile, [(college id, score), ...]) for each profile, scored chunk by chunk"""
+        chunk_size = max(1, MATCH_CHUNK_CELLS // max(self.catalog.size, 1))
+        chunk: List[models.UserProfile] = []
+        for profile in profiles:
+            chunk.append(profile)
+            if len(chunk) >= chunk_size:
+                yield from self._match_chunk(chunk, k, min_score)
+                chunk = []
+        if chunk:
+            yield from self._match_chunk(chunk, k, min_score)
+
+    def _match_chunk(self, profiles: List[models.UserProfile], k: int, min_score: Optional[float]):
+        # profiles x programs, one contiguous row of scores per profile
+        scores = self.weight_matrix(profiles).T @ self.matrix.T
+        np.round(scores, SCORE_DECIMALS, out=scores)
+        for profile, row in zip(profiles, scores):
+            top = self.top_k(row, k)
+            if min_score is not None:
+                top = top[row[top] >= min_score]
+            yield profile, [(int(self.catalog.ids[i]), round(float(row[i]), SCORE_DECIMALS)) for i in top]
+
+
+_lock = threading.Lock()
+_features: Optional[CatalogFeatures] = None
+
+
+class RecommendationService:
+    @staticmethod
+    def features(db: Session) -> CatalogFeatures:
+        """Feature matrix for the current catalog generation, built on first use."""
+        global _features
+        generation = CatalogService.generation()
+        features = _features
+        if features is not None and features.generation == generation:
+            return features
+        with _lock:
+            if _features is None or _features.generation != generation:
+                catalog = CatalogService.get()
+                if catalog is None or catalog.generation != generation:
+                    # Catalog disabled: build a private snapshot for scoring
+                    catalog = CatalogService.build(db, generation=generation)
+                _features = CatalogFeatures(catalog)
+            return _features
+
+    @staticmethod
+    def recommend(db: Session, email: str, k: int = 20) -> Optional[List[Tuple[dict, float]]]:
+        """Top-k (college row, score) pairs for a profile, or None if there is no such profile"""
+        profile = db.query(models.UserProfile).filter(models.UserProfile.email == email).first()
+        if profile is None:
+            return None
+        return RecommendationService.features(db).recommend(profile, k)
+
+    @staticmethod
+    def select_profiles(
+        db: Session, emails: Optional[Sequence[str]] = None, filters: Optional[ProfileFilter] = None
+    ) -> Iterator[models.UserProfile]:
+        """Profiles by email list and/or filter, streamed in id order"""
+        def query():
+            q = db.query(models.UserProfile)
+            if filters is not None:
+                for field, value in filters.model_dump(exclude_none=True).items():
+                    q = q.filter(getattr(models.UserProfile, field) == value)
+            return q.order_by(models.UserProfile.id)
+
+        if emails is None:
+            yield from query().yield_per(PROFILE_FETCH_SIZE)
+            return
+        for start in range(0, len(emails), PROFILE_FETCH_SIZE):
+            batch = emails[start:start + PROFILE_FETCH_SIZE]
+            yield from query().filter(models.UserProfile.email.in_(batch)).all()
+
+    @staticmethod
+    def batch_matches(
+        db: Session,
+        emails: Optional[Sequence[str]] = None,
+        filters: Optional[ProfileFilter] = None,
+        k: int = 10,
+        min_score: Optional[float] = None,
+        features: Optional[CatalogFeatures] = None,
+    ) -> Iterator[dict]:
+        """One result dict per selected profile, then one per requested email that was not matched
+
+        Those report ``error`` "Excluded by filter" (with the profile id) when the
+        profile exists but fails ``filters``, else "User profile not found".
+        ``features`` defaults to the shared matrix of the current catalog.
+        """
+        features = features or RecommendationService.features(db)
+        profiles = RecommendationService.select_profiles(db, emails, filters)
+        found = set()
+        for profile, matches in features.match_chunks(profiles, k, min_score):
+            if emails is not None:
+                found.add(profile.email)
+            yield {
+                "profile_id": profile.id,
+                "email": profile.email,
+                "matches": [{"college_id": college_id, "score": score} for college_id, score in matches],
+            }
+        missing = [email for email in dict.fromkeys(emails or ()) if email not in found]
+        excluded: Dict[str, int] = {}
+        for start in range(0, len(missing), PROFILE_FETCH_SIZE):
+            batch = missing[start:start + PROFILE_FETCH_SIZE]
+            excluded.update(
+                db.query(models.UserProfile.email, models.UserProfile.id).filter(models.UserProfile.email.in_(batch))
+            )
+        for email in missing:
+            if email in excluded:
+                yield {"profile_id": excluded[email], "email": email, "error": "Excluded by filter"}
+            else:
+                yield {"profile_id": None, "email": email, "error": "User profile not found"}
+
+
+class AsyncRecommendationService:
+    """RecommendationService off the event loop (see AsyncCollegeService)
+
+    Scoring, and building the feature matrix after a catalog change, is CPU
+    work, so it runs on the threadpool with its own read-only Session.
+    """
+
+    @staticmethod
+    async def recommend(email: str, k: int = 20) -> Optional[List[Tuple[dict, float]]]:
+        return await run_in_session(ReadSessionLocal, RecommendationService.recommend, email, k)
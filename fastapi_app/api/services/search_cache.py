@@ -0,0 +1,111 @@
+"""
+Response cache for the structured search endpoints
+
+The structured filter space is tiny (program type x budget x location x sort),
+so most searches repeat. Responses are cached as already-serialized JSON bytes
+under a normalized key, in an LRU bounded by SEARCH_CACHE_SIZE entries, each
+living at most SEARCH_CACHE_TTL seconds. Entries belong to one catalog
+generation: the first lookup after an import bumps the generation and drops
+the whole cache.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Sequence, Tuple
+
+from pydantic import BaseModel
+
+from api.schemas.college import BUDGET_BOUNDS, CONTINENT_COUNTRIES, CollegeSearchRequest
+from api.services.catalog_service import RESPONSE_COLUMNS
+
+SEARCH_CACHE_SIZE = int(os.getenv("SEARCH_CACHE_SIZE", "1024"))
+SEARCH_CACHE_TTL = float(os.getenv("SEARCH_CACHE_TTL", "600"))
+
+
+def search_key(kind: str, payload: BaseModel, columns: Sequence[str] = RESPONSE_COLUMNS) -> str:
+    """Cache key for a search request and projection; filters that constrain nothing are dropped
+
+    Unknown budget ranges and locations are ignored by both search paths, and an
+    empty program type means "any", so they share the key of the unfiltered search.
+    """
+    if isinstance(payload, CollegeSearchRequest):
+        payload = CollegeSearchRequest(
+            program_type=payload.program_type or None,
+            budget_range=payload.budget_range if payload.budget_range in BUDGET_BOUNDS else None,
+            location=payload.location if payload.location in CONTINENT_COUNTRIES else None,
+            sort=payload.sort,
+        )
+    projection = "" if tuple(columns) == RESPONSE_COLUMNS else ",".join(columns)
+    return f"{kind}:{projection}:{payload.model_dump_json()}"
+
+
+class SearchCache:
+    """Thread-safe LRU of serialized responses with a TTL, scoped to one catalog generation"""
+
+    def __init__(self, maxsize: int = SEARCH_CACHE_SIZE, ttl: float = SEARCH_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._generation = 0
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "invalidations": 0}
+
+    def get(self, key: str, generation: int) -> Optional[bytes]:
+        with self._lock:
+            self._sync(generation)
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] < time.monotonic():
+                del self._entries[key]
+                self._stats["expirations"] += 1
+                entry = None
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry[1]
+
+    def put(self, key: str, generation: int, body: bytes) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._sync(generation)
+            if generation != self._generation:
+                # Computed from a catalog that has since been replaced
+                return
+            self._entries[key] = (time.monotonic() + self.ttl, body)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._stats["invalidations"] += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "hit_rate": self._stats["hits"] / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "bytes": sum(len(body) for _, body in self._entries.values()),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+                "generation": self._generation,
+            }
+
+    def _sync(self, generation: int) -> None:
+        """Drop every entry when a newer catalog generation is seen (caller holds the lock)"""
+        if generation > self._generation:
+            if self._entries:
+                self._entries.clear()
+                self._stats["invalidations"] += 1
+            self._generation = generation
+
+
+search_cache = SearchCache()
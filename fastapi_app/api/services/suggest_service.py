@@ -0,0 +1,234 @@
+"""
+Search-as-you-type suggestions for school and program names
+
+Suggestions are the distinct values of colleges.name and colleges.program_name,
+ranked by how many programs carry them. Text is folded (diacritics stripped,
+case-folded, punctuation to spaces) so "umea" finds "Umeå Institute of Design"
+and "bauhaus weimar" finds "Bauhaus-Universität Weimar".
+
+Every query word is matched as a prefix of some word of the suggestion. The
+folded vocabulary is kept sorted, which makes it a flattened prefix trie: the
+words under any prefix are one contiguous range found by bisection. A query
+word matching no vocabulary prefix falls back to a trigram index over the
+vocabulary, so small typos ("parsns") still match. Trigram overlap is low for
+transpositions in short words ("wiemar" shares 2 of 10 trigrams with
+"weimar"), so the words sharing the most trigrams are also compared by
+Damerau-Levenshtein distance, as whole words and as prefixes.
+
+Suggestion ids are ranks, so the best matches are the smallest ids. Postings
+are stored as one flat array in vocabulary order, which makes the postings of
+any prefix a zero-copy slice. When the most selective query word has few
+postings its candidates are checked against the folded text directly; broad
+words are intersected as boolean masks over rank space. The index is built at
+startup and rebuilt for every new catalog generation, so an import in one
+worker reaches the others once they map the catalog snapshot it published.
+"""
+
+import bisect
+import re
+import threading
+import unicodedata
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from database.models import College
+from api.services.catalog_service import CatalogService
+
+SUGGEST_FIELDS = ("name", "program_name")
+# Words compared by trigram similarity when a query word has no prefix match
+FUZZY_MIN_SIMILARITY = 0.4
+FUZZY_MAX_WORDS = 20
+# Words sharing the most trigrams with a query word that are compared by edit
+# distance; query words shorter than FUZZY_EDIT_MIN_LENGTH are not, and words
+# of FUZZY_TWO_EDITS_LENGTH or more letters may be two edits away
+FUZZY_EDIT_CANDIDATES = 200
+FUZZY_EDIT_MIN_LENGTH = 4
+FUZZY_TWO_EDITS_LENGTH = 8
+# Query words with at most this many postings are verified candidate by
+# candidate; broader ones are intersected as masks
+SMALL_DRIVER = 4096
+
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+def fold(text: str) -> str:
+    """Diacritic- and case-folded text with punctuation collapsed to single spaces"""
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return _NON_WORD.sub(" ", stripped.casefold()).strip()
+
+
+def trigrams(word: str) -> set:
+    padded = f" {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(a: str, b: str) -> int:
+    """Damerau-Levenshtein distance (optimal string alignment): an adjacent
+    transposition counts as one edit, like an insertion, deletion or substitution"""
+    previous2: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+class SuggestIndex:
+    """Immutable suggestion index over (text, field, count) entries"""
+
+    def __init__(self, entries: Sequence[Tuple[str, str, int]], generation: int = 0):
+        self.generation = generation
+        # Entry ids are ranks: most programs first, then shorter, then alphabetical
+        ranked = sorted(entries, key=lambda e: (-e[2], len(e[0]), e[0], e[1]))
+        self.texts = [e[0] for e in ranked]
+        self.fields = [e[1] for e in ranked]
+        self.counts = [e[2] for e in ranked]
+
+        self.folded = [f" {fold(text)} " for text in self.texts]
+
+        postings: Dict[str, List[int]] = defaultdict(list)
+        for entry_id, folded in enumerate(self.folded):
+            for word in set(folded.split()):
+                postings[word].append(entry_id)
+        self.words = sorted(postings)
+        # Postings of word w are flat[offsets[w]:offsets[w + 1]], ascending
+        lengths = np.array([len(postings[w]) for w in self.words], dtype=np.int64)
+        self.offsets = np.concatenate(([0], np.cumsum(lengths))).astype(np.int64)
+        self.flat = np.fromiter(
+            (i for w in self.words for i in postings.pop(w)), dtype=np.int32, count=int(self.offsets[-1])
+        )
+
+        grams: Dict[str, List[int]] = defaultdict(list)
+        for word_id, word in enumerate(self.words):
+            for gram in trigrams(word):
+                grams[gram].append(word_id)
+        self.grams = {g: np.array(ids, dtype=np.int32) for g, ids in grams.items()}
+        self.gram_counts = np.array([len(trigrams(w)) for w in self.words], dtype=np.int32)
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def suggest(self, query: str, limit: int = 10) -> List[dict]:
+        tokens = [self._token(word) for word in dict.fromkeys(fold(query).split())]
+        if not tokens or any(token is None for token in tokens):
+            return []
+        tokens.sort(key=lambda token: len(token[0]))
+        driver = tokens[0][0]
+
+        if len(driver) <= SMALL_DRIVER:
+            found: List[int] = []
+            others = [needles for _, needles in tokens[1:]]
+            for i in np.unique(driver):
+                folded = self.folded[i]
+                if all(any(needle in folded for needle in needles) for needles in others):
+                    found.append(int(i))
+                    if len(found) == limit:
+                        break
+        else:
+            mask = np.zeros(len(self.texts), dtype=bool)
+            mask[driver] = True
+            for postings, _ in tokens[1:]:
+                other = np.zeros(len(self.texts), dtype=bool)
+                other[postings] = True
+                mask &= other
+            found = np.flatnonzero(mask)[:limit].tolist()
+        return [{"text": self.texts[i], "field": self.fields[i], "programs": self.counts[i]} for i in found]
+
+    def _token(self, word: str):
+        """(postings, substrings any of which match) for a query word, or None if nothing matches"""
+        lo = bisect.bisect_left(self.words, word)
+        hi = bisect.bisect_left(self.words, word + "\uffff", lo)
+        if hi > lo:
+            return self.flat[self.offsets[lo]:self.offsets[hi]], (f" {word}",)
+        word_ids = self._similar_words(word)
+        if not word_ids:
+            return None
+        postings = np.concatenate([self.flat[self.offsets[w]:self.offsets[w + 1]] for w in word_ids])
+        return postings, tuple(f" {self.words[w]} " for w in word_ids)
+
+    def _similar_words(self, word: str) -> List[int]:
+        """Vocabulary words close to ``word``, best first
+
+        Words within the edit budget come first, nearest first, then words by
+        trigram (Jaccard) similarity.
+        """
+        query = [self.grams[g] for g in trigrams(word) if g in self.grams]
+        if not query:
+            return []
+        word_ids, shared = np.unique(np.concatenate(query), return_counts=True)
+        similarity = shared / (len(trigrams(word)) + self.gram_counts[word_ids] - shared)
+
+        edits = {}
+        if len(word) >= FUZZY_EDIT_MIN_LENGTH:
+            budget = 2 if len(word) >= FUZZY_TWO_EDITS_LENGTH else 1
+            for i in np.argsort(-shared, kind="stable")[:FUZZY_EDIT_CANDIDATES]:
+                candidate = self.words[word_ids[i]]
+                if len(candidate) + budget < len(word):
+                    continue
+                # A longer word also matches when the query is a misspelt prefix of it
+                distance = min(edit_distance(word, candidate), edit_distance(word, candidate[:len(word)]))
+                if distance <= budget:
+                    edits[int(i)] = distance
+
+        keep = [i for i in range(len(word_ids)) if i in edits or similarity[i] >= FUZZY_MIN_SIMILARITY]
+        keep.sort(key=lambda i: (edits.get(i, 3), -similarity[i]))
+        return [int(word_ids[i]) for i in keep[:FUZZY_MAX_WORDS]]
+
+
+_lock = threading.Lock()
+_index: Optional[SuggestIndex] = None
+
+
+class SuggestService:
+    @staticmethod
+    def get() -> Optional[SuggestIndex]:
+        """Index of the current catalog generation, or None when it has to be (re)built"""
+        index = _index
+        if index is None or index.generation != CatalogService.generation():
+            return None
+        return index
+
+    @staticmethod
+    def index(db: Session) -> SuggestIndex:
+        """Index for the current catalog generation, built on first use."""
+        global _index
+        generation = CatalogService.generation()
+        index = _index
+        if index is not None and index.generation == generation:
+            return index
+        with _lock:
+            if _index is None or _index.generation != generation:
+                _index = SuggestService.build(db, generation=generation)
+            return _index
+
+    @staticmethod
+    def build(db: Session, generation: int = 0) -> SuggestIndex:
+        entries: List[Tuple[str, str, int]] = []
+        for field in SUGGEST_FIELDS:
+            column = getattr(College, field)
+            rows = db.execute(select(column, func.count()).group_by(column)).all()
+            entries.extend((text, field, count) for text, count in rows if text)
+        return SuggestIndex(entries, generation=generation)
+
+    @staticmethod
+    def refresh(db: Session) -> SuggestIndex:
+        """Rebuild the index from the database and swap it in atomically."""
+        global _index
+        with _lock:
+            index = SuggestService.build(db, generation=CatalogService.generation())
+            _index = index
+            return index
+
+    @staticmethod
+    def suggest(db: Session, query: str, limit: int = 10) -> List[dict]:
+        return SuggestService.index(db).suggest(query, limit)
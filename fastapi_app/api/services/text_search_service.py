@@ -0,0 +1,112 @@
+"""
+Full-text search over college programs (SQLite FTS5)
+
+colleges_fts is an external-content FTS5 index over the text columns of
+colleges. Triggers keep it in step with every insert, update and delete, and
+the Excel importer merges the index segments its batches leave behind. The
+unicode61 tokenizer folds diacritics, so "Umea" matches "Umeå".
+"""
+
+import re
+from typing import List, Optional, Tuple
+
+from sqlalchemy import column, func, literal_column, table, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, undefer_group
+
+from database.models import College, TEXT_GROUP
+from api.schemas.college import CollegeSearchRequest
+
+FTS_TABLE = "colleges_fts"
+FTS_COLUMNS = ("name", "program_name", "program_description", "admission_requirements")
+SNIPPET_TOKENS = 12
+# Pages merged per import; bounds the work done to compact new index segments
+MERGE_PAGES = 500
+
+_fts = table(FTS_TABLE, column("rowid"))
+_fts_ref = literal_column(FTS_TABLE)
+_available = False
+
+
+def _ddl() -> List[str]:
+    cols = ", ".join(FTS_COLUMNS)
+    new_cols = ", ".join(f"new.{c}" for c in FTS_COLUMNS)
+    old_cols = ", ".join(f"old.{c}" for c in FTS_COLUMNS)
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+        f"{cols}, content='colleges', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON colleges BEGIN "
+        f"INSERT INTO {FTS_TABLE}(rowid, {cols}) VALUES (new.id, {new_cols}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON colleges BEGIN "
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {cols}) VALUES ('delete', old.id, {old_cols}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF {cols} ON colleges BEGIN "
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {cols}) VALUES ('delete', old.id, {old_cols}); "
+        f"INSERT INTO {FTS_TABLE}(rowid, {cols}) VALUES (new.id, {new_cols}); END",
+    ]
+
+
+def build_match_query(query: str) -> Optional[str]:
+    """Turn free text into an FTS5 query: every word must match, the last one as a prefix.
+
+    Words are quoted so user input can never be parsed as FTS5 syntax.
+    """
+    terms = re.findall(r"\w+", query)
+    if not terms:
+        return None
+    quoted = [f'"{t}"' for t in terms]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+class TextSearchService:
+    @staticmethod
+    def ensure_index(engine: Engine) -> bool:
+        """Create the FTS table and triggers if missing; populate it when newly created."""
+        global _available
+        if engine.dialect.name != "sqlite":
+            return False
+        with engine.begin() as conn:
+            exists = conn.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                {"name": FTS_TABLE},
+            ).first()
+            for statement in _ddl():
+                conn.execute(text(statement))
+            if not exists:
+                conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+        _available = True
+        return True
+
+    @staticmethod
+    def available() -> bool:
+        return _available
+
+    @staticmethod
+    def after_import(db: Session) -> None:
+        """Merge index segments written by an import (the rows themselves arrive via triggers)."""
+        if _available:
+            db.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rank) VALUES ('merge', :pages)"), {"pages": MERGE_PAGES})
+            db.commit()
+
+    @staticmethod
+    def search(
+        db: Session, query: str, filters: CollegeSearchRequest, limit: int = 20
+    ) -> List[Tuple[College, float, str]]:
+        """BM25-ranked (college, rank, snippet) matches, narrowed by the structured filters"""
+        from api.services.college_service import CollegeService
+
+        match = build_match_query(query)
+        if match is None:
+            return []
+
+        rank = func.bm25(_fts_ref).label("rank")
+        snippet = func.snippet(_fts_ref, -1, "<mark>", "</mark>", "…", SNIPPET_TOKENS).label("snippet")
+        q = (
+            db.query(College, rank, snippet)
+            .select_from(_fts)
+            .join(College, College.id == _fts.c.rowid)
+            .filter(_fts_ref.op("MATCH")(match))
+            .options(undefer_group(TEXT_GROUP))
+        )
+        q = CollegeService.apply_filters(q, filters)
+        return [tuple(row) for row in q.order_by(rank, College.id).limit(limit).all()]
@@ -2,12 +2,17 @@
 User Profile Service - Business logic for user profile operations
 """
 
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import tuple_
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Tuple
+from datetime import datetime
 import json
 
 from database import models
+from database.database import SessionLocal, run_in_session
 from api.schemas.user_profile import UserProfileCreate, UserProfileUpdate
+from api.services.profile_match_service import ProfileMatchService
 
 
 class UserProfileService:
@@ -29,6 +34,8 @@ class UserProfileService:
             existing.location_preference = profile_data.location_preference
             existing.degree_level = json.dumps(profile_data.degree_level) if profile_data.degree_level else None
             existing.include_international = "true" if profile_data.include_international else "false"
+            # Matches are replaced in the same transaction, so a failed rescore leaves the profile unchanged
+            ProfileMatchService.refresh_profile(db, existing)
             db.commit()
             db.refresh(existing)
             return existing
@@ -46,6 +53,8 @@ class UserProfileService:
         )
         
         db.add(new_profile)
+        db.flush()  # assigns the id the matches refer to
+        ProfileMatchService.refresh_profile(db, new_profile)
         db.commit()
         db.refresh(new_profile)
         return new_profile
@@ -65,12 +74,27 @@ class UserProfileService:
         ).first()
 
     @staticmethod
-    def list_user_profiles(db: Session, limit: int = 100, offset: int = 0) -> List[models.UserProfile]:
-        """List all user profiles with pagination"""
-        return db.query(models.UserProfile).order_by(
-            models.UserProfile.created_at.desc()
+    def list_user_profiles(
+        db: Session, limit: int = 100, offset: int = 0, after: Optional[Tuple[datetime, int]] = None
+    ) -> List[models.UserProfile]:
+        """List all user profiles with pagination, newest first
+
+        ``after`` is the last (created_at, id) of the previous page.
+        """
+        q = db.query(models.UserProfile)
+        if after is not None:
+            q = q.filter(tuple_(models.UserProfile.created_at, models.UserProfile.id) < after)
+        return q.order_by(
+            models.UserProfile.created_at.desc(), models.UserProfile.id.desc()
         ).offset(offset).limit(limit).all()
 
+    @staticmethod
+    def list_matches(
+        db: Session, email: str, limit: int = 50, after: Optional[Tuple[float, int]] = None
+    ) -> Optional[List[Tuple[models.College, float]]]:
+        """Materialized matches of a profile, best first (see ProfileMatchService)"""
+        return ProfileMatchService.list_matches(db, email, limit=limit, after=after)
+
     @staticmethod
     def update_user_profile(db: Session, email: str, profile_data: UserProfileUpdate) -> Optional[models.UserProfile]:
         """Update user profile"""
@@ -97,6 +121,7 @@ class UserProfileService:
         if profile_data.include_international is not None:
             profile.include_international = "true" if profile_data.include_international else "false"
         
+        ProfileMatchService.refresh_profile(db, profile)
         db.commit()
         db.refresh(profile)
         return profile
@@ -111,7 +136,47 @@ class UserProfileService:
         if not profile:
             return False
         
+        ProfileMatchService.remove_profile(db, profile.id)
         db.delete(profile)
         db.commit()
         return True
 
+
+class AsyncUserProfileService:
+    """UserProfileService over an AsyncSession (see AsyncCollegeService)
+
+    Creating or updating a profile rescores it against the whole catalog, so
+    those run on the threadpool with their own Session.
+    """
+
+    @staticmethod
+    async def create_user_profile(profile_data: UserProfileCreate) -> models.UserProfile:
+        return await run_in_session(SessionLocal, UserProfileService.create_user_profile, profile_data)
+
+    @staticmethod
+    async def get_user_profile(db: AsyncSession, email: str) -> Optional[models.UserProfile]:
+        return await db.run_sync(UserProfileService.get_user_profile, email)
+
+    @staticmethod
+    async def get_user_profile_by_id(db: AsyncSession, profile_id: int) -> Optional[models.UserProfile]:
+        return await db.run_sync(UserProfileService.get_user_profile_by_id, profile_id)
+
+    @staticmethod
+    async def list_user_profiles(
+        db: AsyncSession, limit: int = 100, offset: int = 0, after: Optional[Tuple[datetime, int]] = None
+    ) -> List[models.UserProfile]:
+        return await db.run_sync(UserProfileService.list_user_profiles, limit=limit, offset=offset, after=after)
+
+    @staticmethod
+    async def list_matches(
+        db: AsyncSession, email: str, limit: int = 50, after: Optional[Tuple[float, int]] = None
+    ) -> Optional[List[Tuple[models.College, float]]]:
+        return await db.run_sync(UserProfileService.list_matches, email, limit=limit, after=after)
+
+    @staticmethod
+    async def update_user_profile(email: str, profile_data: UserProfileUpdate) -> Optional[models.UserProfile]:
+        return await run_in_session(SessionLocal, UserProfileService.update_user_profile, email, profile_data)
+
+    @staticmethod
+    async def delete_user_profile(db: AsyncSession, email: str) -> bool:
+        return await db.run_sync(UserProfileService.delete_user_profile, email)
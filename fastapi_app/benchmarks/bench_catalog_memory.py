@@ -0,0 +1,121 @@
+"""
+Memory per worker: a private catalog in every process vs the shared snapshot.
+
+Starts 4 and 16 worker processes that each load the catalog of a synthetic
+database, either built privately from the database (one copy of every row per
+worker) or memory-mapped from one snapshot file. Each worker then serves every
+sort order and reads every row once, so all of the catalog is resident.
+Memory is read from /proc/<pid>/smaps_rollup while all workers are alive:
+RSS counts shared snapshot pages in every worker, PSS splits them between
+the workers sharing them, and USS is what a worker holds privately. The
+baseline is a worker that imported the app without loading a catalog.
+
+    python -m benchmarks.bench_catalog_memory [rows [workers ...]]
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROWS = 100_000
+WORKERS = (4, 16)
+MODES = ("none", "private", "snapshot")
+
+
+def memory_kb() -> dict:
+    fields = {}
+    with open("/proc/self/smaps_rollup") as fh:
+        for line in fh:
+            name, _, value = line.partition(":")
+            if name in ("Rss", "Pss", "Private_Clean", "Private_Dirty"):
+                fields[name] = int(value.split()[0])
+    return {"rss": fields["Rss"], "pss": fields["Pss"], "uss": fields["Private_Clean"] + fields["Private_Dirty"]}
+
+
+def worker(mode: str, db_url: str, snapshot_path: str):
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from api.schemas.college import CollegeSearchRequest, SORT_ORDERS
+    from api.services.catalog_service import CatalogService, ColumnarCatalog
+    from api.services.catalog_snapshot import CatalogSnapshot
+
+    catalog = None
+    if mode == "private":
+        engine = create_engine(db_url)
+        db = sessionmaker(bind=engine)()
+        catalog = CatalogService.build(db)
+        db.close()
+        engine.dispose()
+    elif mode == "snapshot":
+        catalog = ColumnarCatalog.from_snapshot(CatalogSnapshot(snapshot_path))
+    if catalog is not None:
+        for sort in SORT_ORDERS:
+            catalog.search(CollegeSearchRequest(location="Europe", sort=sort))
+        for start in range(0, catalog.size, 1000):
+            catalog.page("name_asc", start, 1000)
+
+    print("ready", flush=True)
+    sys.stdin.readline()  # measured once every worker is up
+    print(json.dumps(memory_kb()), flush=True)
+
+
+def measure(mode: str, workers: int, db_url: str, snapshot_path: str) -> list:
+    command = [sys.executable, "-m", "benchmarks.bench_catalog_memory", "--worker", mode, db_url, snapshot_path]
+    procs = [
+        subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+        for _ in range(workers)
+    ]
+    for proc in procs:
+        assert proc.stdout.readline().strip() == "ready"
+    results = []
+    for proc in procs:
+        proc.stdin.write("\n")
+        proc.stdin.flush()
+        results.append(json.loads(proc.stdout.readline()))
+    for proc in procs:
+        proc.stdin.close()
+        proc.wait()
+    return results
+
+
+def run(rows: int, worker_counts):
+    from api.services.catalog_service import CatalogService, RESPONSE_COLUMNS
+    from api.services.catalog_snapshot import write_snapshot
+    from benchmarks.common import make_database
+
+    engine, Session, path = make_database(rows)
+    snapshot_path = tempfile.mkstemp(suffix=".snap")[1]
+    db = Session()
+    try:
+        version = CatalogService.compute_version(db)
+        write_snapshot(snapshot_path, CatalogService.build(db), RESPONSE_COLUMNS, (version.etag, None))
+        print(f"{rows:,} programs, snapshot file {os.path.getsize(snapshot_path) / 1e6:.1f} MB")
+        for workers in worker_counts:
+            baseline = None
+            for mode in MODES:
+                results = measure(mode, workers, str(engine.url), snapshot_path)
+                mean = {k: sum(r[k] for r in results) / len(results) / 1024 for k in ("rss", "pss", "uss")}
+                if baseline is None:
+                    baseline = mean
+                print(
+                    f"  {workers:>2} workers, {mode:<8} catalog | per worker RSS {mean['rss']:6.1f} MB"
+                    f" (+{mean['rss'] - baseline['rss']:5.1f}) | PSS {mean['pss']:6.1f} MB"
+                    f" (+{mean['pss'] - baseline['pss']:5.1f}) | USS {mean['uss']:6.1f} MB"
+                    f" | total PSS {mean['pss'] * workers:7.1f} MB"
+                )
+    finally:
+        db.close()
+        engine.dispose()
+        os.remove(path)
+        os.remove(snapshot_path)
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--worker"]:
+        worker(*sys.argv[2:5])
+    else:
+        args = [int(a) for a in sys.argv[1:]]
+        run(args[0] if args else ROWS, args[1:] or WORKERS)
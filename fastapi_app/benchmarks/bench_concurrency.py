@@ -0,0 +1,107 @@
+"""
+Request latency for GET /api/colleges/ while an Excel import is running.
+
+Before the async database layer, every handler used a blocking Session on the
+event loop, so list requests queued up behind the import. This script reports
+p50/p99 latency for list requests on an idle server and during an import.
+
+    python -m benchmarks.bench_concurrency [catalog_rows] [import_rows]
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+CONCURRENCY = 8
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def hammer(client, latencies, stop):
+    while not stop.is_set():
+        start = time.perf_counter()
+        response = await client.get("/api/colleges/", params={"limit": 50, "offset": 1000})
+        response.raise_for_status()
+        latencies.append((time.perf_counter() - start) * 1000)
+
+
+async def measure(client, duration=None, during=None):
+    latencies, stop = [], asyncio.Event()
+    workers = [asyncio.create_task(hammer(client, latencies, stop)) for _ in range(CONCURRENCY)]
+    if during is not None:
+        await during
+    else:
+        await asyncio.sleep(duration)
+    stop.set()
+    await asyncio.gather(*workers)
+    return latencies
+
+
+def report(label, latencies):
+    print(
+        f"{label:<14} n={len(latencies):>5} | p50 {statistics.median(latencies):8.2f} ms"
+        f" | p99 {percentile(latencies, 99):8.2f} ms | max {max(latencies):8.2f} ms"
+    )
+
+
+async def run(catalog_rows: int, import_rows: int):
+    fd, db_path = tempfile.mkstemp(suffix=".db", prefix="bench_")
+    os.close(fd)
+    # Must be set before anything imports database.database, or the import
+    # would write to data/app.db instead of the benchmark database
+    if "database.database" in sys.modules:
+        raise RuntimeError("database.database was imported before DATABASE_URL was set")
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+
+    import httpx
+    from benchmarks.common import build_workbook, make_database
+
+    make_database(catalog_rows, path=db_path)[0].dispose()
+    from database.database import SQLALCHEMY_DATABASE_URL
+    from main import app
+
+    assert SQLALCHEMY_DATABASE_URL == f"sqlite:///{db_path}", SQLALCHEMY_DATABASE_URL
+
+    fd, xlsx_path = tempfile.mkstemp(suffix=".xlsx")
+    os.close(fd)
+    build_workbook(import_rows, xlsx_path, seed=7)
+
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=600) as client:
+            report("idle", await measure(client, duration=3))
+
+            async def do_import():
+                with open(xlsx_path, "rb") as fh:
+                    start = time.perf_counter()
+                    response = await client.post(
+                        "/api/admin/colleges/import-excel",
+                        headers={"X-Admin-Token": "bench"},
+                        files={"file": ("bench.xlsx", fh)},
+                    )
+                    response.raise_for_status()
+                status_url = response.json()["status_url"]
+                while True:
+                    job = (await client.get(status_url, headers={"X-Admin-Token": "bench"})).json()["job"]
+                    if job["status"] in ("completed", "failed", "post_processing_failed"):
+                        break
+                    await asyncio.sleep(0.25)
+                print(f"import of {import_rows:,} rows {job['status']} in {time.perf_counter() - start:.1f} s")
+
+            report("during import", await measure(client, during=do_import()))
+    finally:
+        os.remove(xlsx_path)
+        os.remove(db_path)
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]]
+    catalog_rows = args[0] if args else 50_000
+    import_rows = args[1] if len(args) > 1 else 20_000
+    asyncio.run(run(catalog_rows, import_rows))
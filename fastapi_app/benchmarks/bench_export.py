@@ -0,0 +1,70 @@
+"""
+Full-catalog export: 200-row offset pages vs the streaming export.
+
+Paging is what partners mirroring the catalog do today through
+GET /api/colleges/ (one query and response per 200 rows, with offset scans
+growing along the way). The export streams the same rows from one
+server-side cursor in EXPORT_CHUNK_SIZE chunks. Reports total time, bytes
+sent and the peak Python heap (tracemalloc) while producing the body.
+
+    python -m benchmarks.bench_export [rows ...]
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+from api.schemas.college import CollegeSearchRequest
+from api.services.college_service import CollegeService
+from api.services.export_service import ExportService
+from api.services.json_encoding import dumps
+from benchmarks.common import make_database
+
+SIZES = (100_000,)
+PAGE_LIMIT = 200
+
+
+def measure(label: str, produce):
+    tracemalloc.start()
+    start = time.perf_counter()
+    size = sum(len(part) for part in produce())
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"  {label:<22} | {elapsed * 1000:8.0f} ms | {size / 1e6:7.1f} MB sent | peak heap {peak / 1e6:7.1f} MB")
+
+
+def run(rows: int):
+    engine, Session, path = make_database(rows)
+    payload = CollegeSearchRequest()
+
+    def pages():
+        db = Session()
+        try:
+            offset = 0
+            while True:
+                page = CollegeService.list_colleges_sql(db, limit=PAGE_LIMIT, offset=offset)
+                if not page:
+                    return
+                yield dumps(page)
+                offset += PAGE_LIMIT
+        finally:
+            db.close()
+
+    try:
+        print(f"{rows:,} programs")
+        measure(f"offset pages of {PAGE_LIMIT}", pages)
+        for fmt in ("ndjson", "csv", "parquet"):
+            if ExportService.available(fmt):
+                measure(f"export {fmt}", lambda: ExportService.stream(Session, fmt, payload))
+        measure("export ndjson + gzip", lambda: ExportService.stream(Session, "ndjson", payload, compress=True))
+    finally:
+        engine.dispose()
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    sizes = [int(s) for s in sys.argv[1:]] or SIZES
+    for size in sizes:
+        run(size)
@@ -0,0 +1,105 @@
+"""
+Proximity search latency at catalog scale.
+
+Places programs around the cities of data/city_coordinates.py (campuses
+scattered over each metro area, plus a share spread uniformly over the globe)
+and times radius queries and bounded nearest-k queries on the KD-tree against
+a brute-force great-circle scan. Every radius query's result set is checked
+against the scan before timings are reported.
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from data.city_coordinates import CITY_COORDINATES
+from api.services.geo_service import EARTH_RADIUS_KM, KDTree, chord_for_km, unit_vectors
+
+SIZES = (100_000, 1_000_000)
+RADII_KM = (10, 50, 200, 1000)
+QUERIES = 200
+K = 20
+METRO_SIGMA_DEGREES = 0.25
+UNIFORM_SHARE = 0.2
+
+
+def synthetic_points(size: int, seed: int = 5):
+    rng = np.random.default_rng(seed)
+    centres = np.array(list(CITY_COORDINATES.values()))
+    clustered = size - int(size * UNIFORM_SHARE)
+    picks = centres[rng.integers(0, len(centres), clustered)]
+    lat = np.clip(picks[:, 0] + rng.normal(0, METRO_SIGMA_DEGREES, clustered), -90, 90)
+    lon = (picks[:, 1] + rng.normal(0, METRO_SIGMA_DEGREES, clustered) + 180) % 360 - 180
+    # Uniform on the sphere: latitude from arcsin of a uniform sine
+    lat = np.concatenate((lat, np.degrees(np.arcsin(rng.uniform(-1, 1, size - clustered)))))
+    lon = np.concatenate((lon, rng.uniform(-180, 180, size - clustered)))
+    return lat, lon
+
+
+def haversine_km(lat, lon, qlat, qlon) -> np.ndarray:
+    p1, p2 = np.radians(qlat), np.radians(lat)
+    h = np.sin((p2 - p1) / 2) ** 2 + np.cos(p1) * np.cos(p2) * np.sin(np.radians(lon - qlon) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(h))
+
+
+def percentiles(samples):
+    return np.percentile(np.array(samples) * 1000, [50, 99])
+
+
+def run(size: int):
+    lat, lon = synthetic_points(size)
+    start = time.perf_counter()
+    tree = KDTree(unit_vectors(lat, lon))
+    build_ms = (time.perf_counter() - start) * 1000
+    print(f"{size:>10,} programs | KD-tree build {build_ms:8.1f} ms")
+
+    rng = np.random.default_rng(11)
+    centres = np.array(list(CITY_COORDINATES.values()))
+    # Half the queries at city centres (dense), half anywhere (mostly sparse)
+    query_lat = np.concatenate((centres[rng.integers(0, len(centres), QUERIES // 2), 0], rng.uniform(-60, 70, QUERIES // 2)))
+    query_lon = np.concatenate((centres[rng.integers(0, len(centres), QUERIES // 2), 1], rng.uniform(-180, 180, QUERIES // 2)))
+    query_points = unit_vectors(query_lat, query_lon)
+
+    for radius in RADII_KM:
+        chord = chord_for_km(radius)
+        tree_times, scan_times, hits = [], [], 0
+        for qlat, qlon, point in zip(query_lat, query_lon, query_points):
+            start = time.perf_counter()
+            indices, _ = tree.query_radius(point, chord)
+            tree_times.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            expected = np.flatnonzero(haversine_km(lat, lon, qlat, qlon) <= radius)
+            scan_times.append(time.perf_counter() - start)
+
+            # Points within float rounding of the boundary may fall either way
+            got = set(indices.tolist())
+            differ = got.symmetric_difference(expected.tolist())
+            if any(abs(haversine_km(lat[i], lon[i], qlat, qlon) - radius) > 1e-6 for i in differ):
+                raise AssertionError(f"Radius mismatch at ({qlat:.3f}, {qlon:.3f}) r={radius} km")
+            hits += len(indices)
+        tree_p50, tree_p99 = percentiles(tree_times)
+        scan_p50, _ = percentiles(scan_times)
+        print(
+            f"    radius {radius:>5} km | {hits / QUERIES:10.0f} hits/query"
+            f" | kd-tree p50 {tree_p50:7.2f} ms p99 {tree_p99:7.2f} ms | scan p50 {scan_p50:7.1f} ms"
+        )
+
+    for radius in (None, 200):
+        chord = np.inf if radius is None else chord_for_km(radius)
+        times = []
+        for point in query_points:
+            start = time.perf_counter()
+            tree.query_nearest(point, K, chord)
+            times.append(time.perf_counter() - start)
+        p50, p99 = percentiles(times)
+        label = "unbounded" if radius is None else f"<= {radius} km"
+        print(f"    nearest-{K} {label:>9} | kd-tree p50 {p50:7.2f} ms p99 {p99:7.2f} ms")
+
+
+if __name__ == "__main__":
+    sizes = [int(s) for s in sys.argv[1:]] or SIZES
+    print(f"{QUERIES} queries per radius; half at city centres, half at random points")
+    for size in sizes:
+        run(size)
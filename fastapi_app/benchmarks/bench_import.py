@@ -0,0 +1,86 @@
+"""
+Excel import throughput: row-by-row vs bulk upsert vs streaming bulk upsert.
+
+Each run starts from a database holding half of the workbook's programs, so
+the import is an even mix of updates and inserts. All modes must produce the
+same report and the same table contents, and importing the same workbook a
+second time must log no changes (unchanged rows are not rewritten).
+
+    python -m benchmarks.bench_import [rows ...]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from sqlalchemy import select
+
+from api.services.change_log_service import ChangeLogService
+from api.services.excel_service import ExcelImportService
+from benchmarks.common import build_workbook, make_database
+from database.models import College
+
+SIZES = (1_000, 10_000, 50_000)
+
+
+class Upload:
+    """Minimal stand-in for fastapi.UploadFile"""
+
+    def __init__(self, path):
+        self.filename = os.path.basename(path)
+        self.file = open(path, "rb")
+
+
+def snapshot(db):
+    columns = [c for c in College.__table__.columns if c.name not in ("id", "created_at", "updated_at")]
+    return sorted(db.execute(select(*columns)).all())
+
+
+def run_mode(xlsx_path, size, **options):
+    engine, Session, db_path = make_database(size // 2)
+    ChangeLogService.ensure(engine)
+    db = Session()
+    uploads = [Upload(xlsx_path), Upload(xlsx_path)]
+    try:
+        start = time.perf_counter()
+        report = ExcelImportService.import_excel(uploads[0], db, **options)
+        elapsed = time.perf_counter() - start
+        rows = snapshot(db)
+
+        version = ChangeLogService.current_version(db)
+        ExcelImportService.import_excel(uploads[1], db, **options)
+        logged = ChangeLogService.current_version(db) - version
+        if logged:
+            raise AssertionError(f"re-importing the same workbook logged {logged:,} changes")
+        return report, elapsed, rows
+    finally:
+        for upload in uploads:
+            upload.file.close()
+        db.close()
+        engine.dispose()
+        os.remove(db_path)
+
+
+def run(size):
+    fd, xlsx_path = tempfile.mkstemp(suffix=".xlsx")
+    os.close(fd)
+    try:
+        build_workbook(size, xlsx_path)
+        row_report, row_s, row_rows = run_mode(xlsx_path, size, bulk=False, streaming=False)
+        bulk_report, bulk_s, bulk_rows = run_mode(xlsx_path, size, bulk=True, streaming=False)
+        stream_report, stream_s, stream_rows = run_mode(xlsx_path, size, bulk=True, streaming=True)
+        for report, rows in ((bulk_report, bulk_rows), (stream_report, stream_rows)):
+            if report != row_report or rows != row_rows:
+                raise AssertionError(f"import diverges from row import: {row_report} vs {report}")
+        print(
+            f"{size:>8,} rows {bulk_report} | row-by-row {row_s:7.2f} s"
+            f" | bulk {bulk_s:7.2f} s | streaming {stream_s:7.2f} s"
+        )
+    finally:
+        os.remove(xlsx_path)
+
+
+if __name__ == "__main__":
+    for size in [int(s) for s in sys.argv[1:]] or SIZES:
+        run(size)
@@ -0,0 +1,79 @@
+"""
+Peak memory of an Excel import: full in-memory load vs streaming ingestion,
+for both the bulk upsert and the row-by-row write mode.
+
+Workbooks are enlarged versions of the seed_colleges.py sheet. Each import runs
+in a fresh interpreter so ru_maxrss reflects that import alone; the in-memory
+catalog is disabled to keep its footprint out of the measurement.
+
+    python -m benchmarks.bench_import_memory [rows ...]
+"""
+
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+
+SIZES = (10_000, 50_000, 200_000)
+
+
+def worker(xlsx_path, streaming, bulk):
+    from api.services.excel_service import ExcelImportService
+    from benchmarks.bench_import import Upload
+    from benchmarks.common import make_database
+
+    engine, Session, db_path = make_database(0)
+    db = Session()
+    upload = Upload(xlsx_path)
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    try:
+        report = ExcelImportService.import_excel(upload, db, streaming=streaming, bulk=bulk)
+    finally:
+        upload.file.close()
+        db.close()
+        engine.dispose()
+        os.remove(db_path)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({"report": report, "baseline_kb": baseline, "peak_kb": peak}))
+
+
+def measure(xlsx_path, streaming, bulk=True):
+    env = dict(os.environ, IN_MEMORY_CATALOG="false")
+    command = [
+        sys.executable, "-m", "benchmarks.bench_import_memory", "--worker", xlsx_path, str(int(streaming)), str(int(bulk))
+    ]
+    out = subprocess.run(
+        command,
+        check=True, capture_output=True, text=True, env=env,
+    ).stdout
+    result = json.loads(out.strip().splitlines()[-1])
+    return (result["peak_kb"] - result["baseline_kb"]) / 1024, result["report"]
+
+
+def run(size):
+    from benchmarks.common import build_workbook
+
+    fd, xlsx_path = tempfile.mkstemp(suffix=".xlsx")
+    os.close(fd)
+    try:
+        build_workbook(size, xlsx_path)
+        file_mb = os.path.getsize(xlsx_path) / 1024 / 1024
+        for bulk in (True, False):
+            full_mb, _ = measure(xlsx_path, streaming=False, bulk=bulk)
+            stream_mb, _ = measure(xlsx_path, streaming=True, bulk=bulk)
+            print(
+                f"{size:>8,} rows ({file_mb:6.1f} MB xlsx) {'bulk' if bulk else 'rows':<4} | full load +{full_mb:8.1f} MB"
+                f" | streaming +{stream_mb:6.1f} MB peak RSS"
+            )
+    finally:
+        os.remove(xlsx_path)
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--worker"]:
+        worker(sys.argv[2], sys.argv[3] == "1", sys.argv[4] == "1")
+    else:
+        for size in [int(s) for s in sys.argv[1:]] or SIZES:
+            run(size)
@@ -0,0 +1,47 @@
+"""
+Deep-page latency for GET /api/colleges/: OFFSET/LIMIT vs keyset cursor.
+
+    python -m benchmarks.bench_pagination [rows] [page_size]
+"""
+
+import os
+import sys
+
+from api.services.college_service import CollegeService
+from benchmarks.common import make_database, timeit
+
+PAGES = (1, 500, 5_000)
+
+
+def run(rows: int, page_size: int):
+    engine, Session, path = make_database(rows)
+    db = Session()
+    try:
+        print(f"{rows:,} programs, {page_size} per page")
+        # Pages past the end of a small dataset are measured as its last page
+        last_page = max(1, -(-rows // page_size))
+        for page in sorted({min(page, last_page) for page in PAGES}):
+            offset = (page - 1) * page_size
+            after = None
+            if offset:
+                last = CollegeService.list_colleges_sql(db, limit=1, offset=offset - 1)[0]
+                after = (last["name"], last["id"])
+
+            by_offset = CollegeService.list_colleges_sql(db, limit=page_size, offset=offset)
+            by_cursor = CollegeService.list_colleges_sql(db, limit=page_size, after=after)
+            if [c["id"] for c in by_offset] != [c["id"] for c in by_cursor]:
+                raise AssertionError(f"page {page} differs between offset and cursor")
+
+            offset_ms = timeit(lambda: CollegeService.list_colleges_sql(db, limit=page_size, offset=offset))
+            cursor_ms = timeit(lambda: CollegeService.list_colleges_sql(db, limit=page_size, after=after))
+            db.expunge_all()
+            print(f"  page {page:>5,} | offset {offset_ms:8.2f} ms | cursor {cursor_ms:6.2f} ms")
+    finally:
+        db.close()
+        engine.dispose()
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]]
+    run(args[0] if args else 1_000_000, args[1] if len(args) > 1 else 50)
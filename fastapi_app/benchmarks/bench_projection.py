@@ -0,0 +1,55 @@
+"""
+Response size and latency of list/search pages with and without ``fields=``.
+
+Encodes list pages and search results with every column and with the
+card projection the results page renders, on both the SQL path and the
+in-memory catalog. Reports bytes per page and query-plus-encode time.
+"""
+
+import os
+import sys
+
+from api.schemas.college import CollegeSearchRequest
+from api.services.catalog_service import CatalogService, RESPONSE_COLUMNS
+from api.services.college_service import CollegeService, SEARCH_LIMIT
+from api.services.json_encoding import dumps
+from benchmarks.common import make_database, timeit
+
+ROWS = 100_000
+PAGE_SIZE = 50
+# Fields the result cards show; id and name are always included
+CARD_FIELDS = (
+    "id", "name", "location_city", "location_country", "program_name", "program_type",
+    "degree_level", "tuition_min", "tuition_max", "application_deadline",
+)
+PAYLOAD = CollegeSearchRequest(program_type="Fashion", location="Europe")
+
+
+def report(label: str, fetch):
+    for name, columns in (("all fields", RESPONSE_COLUMNS), ("card fields", CARD_FIELDS)):
+        size = len(dumps(fetch(columns)))
+        ms = timeit(lambda: dumps(fetch(columns)))
+        print(f"  {label:<16} {name:<12} | {size:>8,} bytes | {ms:7.2f} ms")
+
+
+def run(rows: int):
+    engine, Session, path = make_database(rows)
+    db = Session()
+    try:
+        catalog = CatalogService.build(db)
+        offset = rows // 2
+        print(f"{rows:,} programs, list pages of {PAGE_SIZE} at offset {offset:,}, searches of up to {SEARCH_LIMIT}")
+        report("list sql", lambda c: CollegeService.list_colleges_sql(db, limit=PAGE_SIZE, offset=offset, columns=c))
+        report("list catalog", lambda c: catalog.page("name_asc", offset, PAGE_SIZE, c))
+        report("search sql", lambda c: CollegeService.search_colleges_sql(db, PAYLOAD, c))
+        report("search catalog", lambda c: catalog.search(PAYLOAD, limit=SEARCH_LIMIT, columns=c))
+    finally:
+        db.close()
+        engine.dispose()
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    sizes = [int(s) for s in sys.argv[1:]] or (ROWS,)
+    for size in sizes:
+        run(size)
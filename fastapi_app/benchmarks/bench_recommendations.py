@@ -0,0 +1,83 @@
+"""
+Recommendation scoring throughput against catalog size.
+
+Scores random profiles against synthetic catalogs with the cached feature
+matrix, one profile at a time (a matrix-vector product plus a top-k) and as a
+batch (chunked profiles x programs matrix products). On the smaller
+catalogs a per-row Python scorer is run as a reference; its scores must agree
+before timings are reported.
+"""
+
+import sys
+
+import numpy as np
+
+from api.schemas.college import BUDGET_BOUNDS, CONTINENT_COUNTRIES
+from api.services.recommendation_service import (
+    CatalogFeatures, BUDGET_WEIGHT, DEGREE_WEIGHT, INTERNATIONAL_PENALTY, LOCATION_WEIGHT, PROGRAM_WEIGHT,
+    budget_fit, degree_levels,
+)
+from benchmarks.common import synthetic_catalog, synthetic_profiles, timeit
+
+SIZES = (1_000, 10_000, 100_000, 1_000_000)
+PROFILES = 100
+K = 20
+REFERENCE_MAX_SIZE = 10_000
+
+
+def reference_scores(catalog, profile) -> np.ndarray:
+    """Row-at-a-time scorer with the same weights"""
+    levels = degree_levels(profile)
+    countries = CONTINENT_COUNTRIES.get(profile.location_preference)
+    bounds = BUDGET_BOUNDS.get(profile.budget_range)
+    scores = np.empty(catalog.size)
+    for i in range(catalog.size):
+        score = PROGRAM_WEIGHT * (catalog.columns["program_type"][i] == profile.program_interest)
+        if bounds is not None:
+            fit = budget_fit(catalog.tuition_min[i:i + 1], catalog.tuition_max[i:i + 1], *bounds)[0]
+            score += BUDGET_WEIGHT * fit
+        if countries is None:
+            score += LOCATION_WEIGHT
+        elif catalog.columns["location_country"][i] in countries:
+            score += LOCATION_WEIGHT
+        elif profile.include_international == "false":
+            score -= INTERNATIONAL_PENALTY
+        score += DEGREE_WEIGHT * (not levels or catalog.columns["degree_level"][i] in levels)
+        scores[i] = score
+    return scores
+
+
+def run(size: int):
+    catalog = synthetic_catalog(size)
+    profiles = synthetic_profiles(PROFILES)
+
+    build_ms = timeit(lambda: CatalogFeatures(catalog), repeat=1)
+    features = CatalogFeatures(catalog)
+
+    def score_all():
+        for profile in profiles:
+            features.top_k(features.scores(profile), K)
+
+    score_ms = timeit(score_all, repeat=3) / len(profiles)
+    batch_ms = timeit(lambda: list(features.match_chunks(profiles, K)), repeat=3) / len(profiles)
+    line = (
+        f"{size:>10,} programs | features {build_ms:8.1f} ms | {score_ms:7.3f} ms/profile"
+        f" | {1000 / score_ms:8.0f} profiles/s | {size * 1000 / score_ms / 1e6:7.1f} M programs/s"
+        f" | batch {1000 / batch_ms:8.0f} profiles/s"
+    )
+
+    if size <= REFERENCE_MAX_SIZE:
+        sample = profiles[:10]
+        for profile in sample:
+            if not np.allclose(reference_scores(catalog, profile), features.scores(profile), atol=1e-4):
+                raise AssertionError(f"Score mismatch for {profile.email}")
+        python_ms = timeit(lambda: [reference_scores(catalog, p) for p in sample], repeat=1) / len(sample)
+        line += f" | python {python_ms:8.1f} ms/profile"
+    print(line)
+
+
+if __name__ == "__main__":
+    sizes = [int(s) for s in sys.argv[1:]] or SIZES
+    print(f"{PROFILES} random profiles, top-{K} per profile")
+    for size in sizes:
+        run(size)
@@ -0,0 +1,54 @@
+"""
+Search latency: SQL path vs in-memory columnar catalog.
+
+Every combination of program_type x budget_range x location is run through both
+paths; the results are checked for identical ids before timings are reported.
+"""
+
+import itertools
+import os
+import sys
+
+from api.schemas.college import CollegeSearchRequest, PROGRAM_TYPES, BUDGET_RANGES, LOCATIONS
+from api.services.catalog_service import CatalogService
+from api.services.college_service import CollegeService, SEARCH_LIMIT
+from benchmarks.common import make_database, timeit
+
+SIZES = (100, 10_000, 1_000_000)
+
+
+def requests():
+    for program_type, budget, location in itertools.product(
+        (None,) + PROGRAM_TYPES, (None,) + BUDGET_RANGES, (None,) + LOCATIONS
+    ):
+        yield CollegeSearchRequest(program_type=program_type, budget_range=budget, location=location)
+
+
+def run(size: int):
+    engine, Session, path = make_database(size)
+    db = Session()
+    try:
+        catalog = CatalogService.build(db)
+        payloads = list(requests())
+
+        for payload in payloads:
+            expected = [c["id"] for c in CollegeService.search_colleges_sql(db, payload)]
+            actual = [r["id"] for r in catalog.search(payload, limit=SEARCH_LIMIT)]
+            if expected != actual:
+                raise AssertionError(f"Result mismatch for {payload}")
+
+        repeat = 1 if size >= 1_000_000 else 3
+        sql_ms = timeit(lambda: [CollegeService.search_colleges_sql(db, p) for p in payloads], repeat) / len(payloads)
+        mem_ms = timeit(lambda: [catalog.search(p, limit=SEARCH_LIMIT) for p in payloads], repeat) / len(payloads)
+        print(f"{size:>10,} programs | sql {sql_ms:8.3f} ms | catalog {mem_ms:8.3f} ms | speedup {sql_ms / mem_ms:6.1f}x")
+    finally:
+        db.close()
+        engine.dispose()
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    sizes = [int(s) for s in sys.argv[1:]] or SIZES
+    print(f"{len(list(requests()))} search requests per size, mean latency per request")
+    for size in sizes:
+        run(size)
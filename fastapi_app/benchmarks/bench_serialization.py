@@ -0,0 +1,75 @@
+"""
+Response encoding cost for college lists: response_model vs the fast path.
+
+The response_model path loads ORM objects and runs FastAPI's own
+serialize_response (Pydantic validation with from_attributes, then
+jsonable_encoder) before JSONResponse renders the result. The fast path
+selects the response columns as tuples and encodes the row dicts with
+json_encoding.dumps (orjson). Both must produce identical bytes; the report
+splits query and encoding time per page.
+"""
+
+import asyncio
+import os
+import sys
+from typing import List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from database import models
+from api.schemas.college import CollegeResponse
+from api.services.college_service import CollegeService
+from api.services.json_encoding import college_dicts, dumps, orjson
+from benchmarks.common import make_database, timeit
+
+ROWS = 20_000
+PAGE_SIZES = (20, 50, 200)
+
+_field = create_response_field(name="Response_list_colleges", type_=List[CollegeResponse])
+
+
+def response_model_bytes(colleges) -> bytes:
+    content = asyncio.run(serialize_response(field=_field, response_content=colleges))
+    return JSONResponse(content).body
+
+
+def fast_bytes(rows) -> bytes:
+    return dumps(college_dicts(rows))
+
+
+def run(page_size: int, db):
+    def orm_page():
+        return db.query(models.College).order_by(*CollegeService.order_by("name_asc")).limit(page_size).all()
+
+    def row_page():
+        return CollegeService.list_colleges_sql(db, limit=page_size)
+
+    orm, rows = orm_page(), row_page()
+    if response_model_bytes(orm) != fast_bytes(rows):
+        raise AssertionError(f"Encodings differ for a page of {page_size}")
+
+    orm_query_ms = timeit(lambda: (orm_page(), db.expunge_all()))
+    row_query_ms = timeit(row_page)
+    model_ms = timeit(lambda: response_model_bytes(orm))
+    fast_ms = timeit(lambda: fast_bytes(rows))
+    print(
+        f"  {page_size:>4} rows | response_model: query {orm_query_ms:6.2f} ms + encode {model_ms:6.2f} ms"
+        f" | fast: query {row_query_ms:6.2f} ms + encode {fast_ms:6.3f} ms"
+        f" | {(orm_query_ms + model_ms) / (row_query_ms + fast_ms):5.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    sizes = [int(s) for s in sys.argv[1:]] or PAGE_SIZES
+    engine, Session, path = make_database(ROWS)
+    db = Session()
+    try:
+        print(f"{ROWS:,} programs, encoder: {'orjson' if orjson else 'json'}")
+        for size in sizes:
+            run(size, db)
+    finally:
+        db.close()
+        engine.dispose()
+        os.remove(path)
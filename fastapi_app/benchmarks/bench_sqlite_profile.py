@@ -0,0 +1,121 @@
+"""
+Mixed read/import workload: default SQLite engine vs the production profile.
+
+Reader threads run SQL searches and list pages, each on a fresh session as a
+request would, while an Excel import rewrites the catalog. In the default
+profile (rollback journal, no pragmas, readers on the write engine) the
+importer's write transaction locks readers out once it spills to the database
+file; with the tuned profile (WAL, synchronous=NORMAL, cache/mmap/busy_timeout
+pragmas, readers on a separate read-only engine) they keep reading the last
+committed state. Reports read latency and lock errors during the import, and
+the import time with and without readers (readers that are not locked out
+compete with the importer for CPU).
+
+    python -m benchmarks.bench_sqlite_profile [catalog_rows] [import_rows]
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from api.schemas.college import BUDGET_RANGES, PROGRAM_TYPES, CollegeSearchRequest
+from api.services.college_service import CollegeService
+from api.services.excel_service import ExcelImportService
+from benchmarks.common import build_workbook, make_database
+from database.database import read_only_url, tune_sqlite
+
+CATALOG_ROWS = 50_000
+IMPORT_ROWS = 50_000
+READERS = 4
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))] if ordered else float("nan")
+
+
+def reader(Session, latencies, errors, stop, seed):
+    i = seed
+    while not stop.is_set():
+        i += 1
+        payload = CollegeSearchRequest(
+            program_type=PROGRAM_TYPES[i % len(PROGRAM_TYPES)], budget_range=BUDGET_RANGES[i % len(BUDGET_RANGES)]
+        )
+        start = time.perf_counter()
+        db = Session()
+        try:
+            CollegeService.search_colleges_sql(db, payload)
+            CollegeService.list_colleges_sql(db, limit=50, offset=(i * 997) % 10_000)
+            latencies.append((time.perf_counter() - start) * 1000)
+        except OperationalError:
+            errors.append((time.perf_counter() - start) * 1000)
+        finally:
+            db.close()
+
+
+def run(profile: str, catalog_rows: int, xlsx_path: str, readers: int = READERS):
+    seed_engine, _, path = make_database(catalog_rows)
+    seed_engine.dispose()
+    url = f"sqlite:///{path}"
+    engine = create_engine(url, connect_args={"check_same_thread": False})
+    if profile == "tuned":
+        read_engine = create_engine(read_only_url(url), connect_args={"check_same_thread": False})
+        tune_sqlite(engine)
+        tune_sqlite(read_engine, read_only=True)
+        engine.connect().close()  # switch the file to WAL before readers open it
+    else:
+        read_engine = engine
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    ReadSession = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+    latencies, errors, stop = [], [], threading.Event()
+    threads = [
+        threading.Thread(target=reader, args=(ReadSession, latencies, errors, stop, n)) for n in range(readers)
+    ]
+    for thread in threads:
+        thread.start()
+    db = Session()
+    start = time.perf_counter()
+    try:
+        report = ExcelImportService.import_excel(xlsx_path, db)
+    finally:
+        import_s = time.perf_counter() - start
+        stop.set()
+        for thread in threads:
+            thread.join()
+        db.close()
+        read_engine.dispose()
+        engine.dispose()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+    if not readers:
+        print(f"  {profile:<8} | import {import_s:6.2f} s without readers")
+        return
+    print(
+        f"  {profile:<8} | import {import_s:6.2f} s ({report['updated']:,} updated, {report['inserted']:,} inserted)"
+        f" | {len(latencies):>5} reads, p50 {percentile(latencies, 50):7.1f} ms, p99 {percentile(latencies, 99):7.1f} ms,"
+        f" max {max(latencies, default=float('nan')):7.1f} ms | {len(errors)} lock errors"
+    )
+
+
+if __name__ == "__main__":
+    catalog_rows = int(sys.argv[1]) if len(sys.argv) > 1 else CATALOG_ROWS
+    import_rows = int(sys.argv[2]) if len(sys.argv) > 2 else IMPORT_ROWS
+    fd, xlsx_path = tempfile.mkstemp(suffix=".xlsx")
+    os.close(fd)
+    try:
+        build_workbook(import_rows, xlsx_path, seed=7)
+        print(f"{catalog_rows:,} programs, importing {import_rows:,} rows with {READERS} concurrent readers")
+        for profile in ("default", "tuned"):
+            run(profile, catalog_rows, xlsx_path, readers=0)
+            run(profile, catalog_rows, xlsx_path)
+    finally:
+        os.remove(xlsx_path)
@@ -0,0 +1,98 @@
+"""
+Suggestion latency against catalog size.
+
+Builds the suggestion index from synthetic programs (without a database) and
+times typed prefixes of school and program names, multi-word queries,
+diacritic-free spellings and typos (dropped and swapped letters). Reports build time and p50/p99 latency.
+On the smaller sizes results are first checked against a linear scan.
+"""
+
+import random
+import sys
+import time
+from collections import Counter
+
+from api.services.suggest_service import SuggestIndex, fold
+from benchmarks.common import synthetic_rows
+
+SIZES = (10_000, 100_000, 1_000_000)
+QUERIES = 2000
+REFERENCE_MAX_SIZE = 100_000
+
+
+def entries(size: int):
+    names, programs = Counter(), Counter()
+    for row in synthetic_rows(size):
+        names[row["name"]] += 1
+        programs[row["program_name"]] += 1
+    return [(t, "name", n) for t, n in names.items()] + [(t, "program_name", n) for t, n in programs.items()]
+
+
+def typo(word: str, rng: random.Random) -> str:
+    """Drop a letter, or swap two adjacent ones"""
+    if len(word) > 3 and rng.random() < 0.5:
+        i = rng.randrange(1, len(word) - 1)
+        return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+    i = rng.randrange(1, len(word)) if len(word) > 2 else 0
+    return word[:i] + word[i + 1:]
+
+
+def queries(index: SuggestIndex, count: int, seed: int = 3):
+    rng = random.Random(seed)
+    fixed = ["Parson", "Umea", "Bauhaus Weimar", "p", "gr", "royal col", "ume inst", "Parsns", "Bauhaus Wiemar"]
+    out = list(fixed)
+    while len(out) < count:
+        words = rng.choice(index.texts).split()
+        kind = rng.random()
+        if kind < 0.5:
+            text = " ".join(words)[: rng.randint(1, 12)]
+        elif kind < 0.8:
+            text = " ".join(w[: rng.randint(2, 5)] for w in rng.sample(words, min(2, len(words))))
+        else:
+            text = typo(max(words, key=len), rng)
+        out.append(text)
+    return out
+
+
+def reference(index: SuggestIndex, query: str, limit: int):
+    """Linear scan over all suggestions in rank order"""
+    tokens = [index._token(w) for w in dict.fromkeys(fold(query).split())]
+    if not tokens or None in tokens:
+        return []
+    found = [
+        text for text, folded in zip(index.texts, index.folded)
+        if all(any(n in folded for n in needles) for _, needles in tokens)
+    ]
+    return found[:limit]
+
+
+def run(size: int):
+    data = entries(size)
+    start = time.perf_counter()
+    index = SuggestIndex(data)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    if size <= REFERENCE_MAX_SIZE:
+        for q in queries(index, 200, seed=11):
+            if [s["text"] for s in index.suggest(q, 10)] != reference(index, q, 10):
+                raise AssertionError(f"Suggestion mismatch for {q!r}")
+
+    latencies = []
+    for q in queries(index, QUERIES):
+        start = time.perf_counter()
+        index.suggest(q, 10)
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2]
+    p99 = latencies[int(len(latencies) * 0.99)]
+    print(
+        f"{size:>10,} programs | {len(index):>9,} suggestions | {len(index.words):>9,} words"
+        f" | build {build_ms:8.0f} ms | p50 {p50:6.3f} ms | p99 {p99:6.3f} ms | max {latencies[-1]:7.2f} ms"
+    )
+
+
+if __name__ == "__main__":
+    sizes = [int(s) for s in sys.argv[1:]] or SIZES
+    print(f"{QUERIES} queries per size, top-10 suggestions")
+    for size in sizes:
+        run(size)
@@ -0,0 +1,137 @@
+"""
+Shared helpers for the benchmark scripts.
+
+Benchmarks run against a throw-away SQLite file seeded with synthetic programs
+built from the seed_colleges.py schools, so they never touch data/app.db.
+Run them from the fastapi_app directory, e.g. ``python -m benchmarks.bench_search``.
+"""
+
+import json
+import os
+import random
+import tempfile
+import time
+from typing import Callable, Iterator, List
+
+from openpyxl import Workbook
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from database.database import Base
+from database.models import College, UserProfile
+from data.seed_colleges import SCHOOLS, PROGRAMS, REGION_TUITION
+
+EXTRA_PROGRAM_TYPES = ("Architecture", "Animation")
+
+
+def synthetic_rows(count: int, seed: int = 42) -> Iterator[dict]:
+    """Yield ``count`` unique college rows derived from the seed schools."""
+    rng = random.Random(seed)
+    program_types = [p[1] for p in PROGRAMS] + list(EXTRA_PROGRAM_TYPES)
+    for i in range(count):
+        name, city, country = SCHOOLS[i % len(SCHOOLS)]
+        tmin, tmax = REGION_TUITION.get(country, (15000, 30000))
+        program_type = rng.choice(program_types)
+        yield {
+            "name": f"{name} {i // len(SCHOOLS)}" if i >= len(SCHOOLS) else name,
+            "location_city": city,
+            "location_country": country,
+            "program_name": f"{program_type} Studio {i}",
+            "program_type": program_type,
+            "degree_level": rng.choice(("Bachelor", "Master", "PhD")),
+            "tuition_min": None if rng.random() < 0.02 else float(tmin + rng.randint(-5000, 5000)),
+            "tuition_max": None if rng.random() < 0.02 else float(tmax + rng.randint(-5000, 25000)),
+            "program_description": f"A {program_type.lower()} program at {name} in {city}.",
+            "admission_requirements": "Portfolio, statement of purpose and two references.",
+        }
+
+
+WORKBOOK_COLUMNS = (
+    "name",
+    "location_city",
+    "location_country",
+    "program_name",
+    "program_type",
+    "degree_level",
+    "tuition_min",
+    "tuition_max",
+    "program_description",
+    "admission_requirements",
+)
+
+
+def build_workbook(count: int, path: str, seed: int = 42) -> str:
+    """Write an enlarged seed_colleges.py-style workbook with ``count`` rows."""
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("colleges")
+    ws.append(list(WORKBOOK_COLUMNS))
+    for row in synthetic_rows(count, seed=seed):
+        ws.append([row[c] for c in WORKBOOK_COLUMNS])
+    wb.save(path)
+    return path
+
+
+def temp_database_path() -> str:
+    fd, path = tempfile.mkstemp(suffix=".db", prefix="bench_")
+    os.close(fd)
+    return path
+
+
+def make_database(count: int, chunk_size: int = 50_000, path: str = None):
+    """Create a temporary SQLite database with ``count`` programs; returns (engine, Session, path)."""
+    path = path or temp_database_path()
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    rows: List[dict] = []
+    with engine.begin() as conn:
+        for row in synthetic_rows(count):
+            rows.append(row)
+            if len(rows) >= chunk_size:
+                conn.execute(insert(College), rows)
+                rows = []
+        if rows:
+            conn.execute(insert(College), rows)
+    return engine, sessionmaker(autocommit=False, autoflush=False, bind=engine), path
+
+
+def synthetic_catalog(count: int, seed: int = 42):
+    """A ColumnarCatalog of ``count`` synthetic programs, built without a database."""
+    from api.services.catalog_service import ColumnarCatalog, RESPONSE_COLUMNS
+
+    rows = [
+        tuple(i + 1 if c == "id" else row.get(c) for c in RESPONSE_COLUMNS)
+        for i, row in enumerate(synthetic_rows(count, seed=seed))
+    ]
+    return ColumnarCatalog(rows)
+
+
+def synthetic_profiles(count: int, seed: int = 7) -> List[UserProfile]:
+    """``count`` transient user profiles with random preferences."""
+    from api.schemas.college import PROGRAM_TYPES, BUDGET_RANGES, LOCATIONS
+
+    rng = random.Random(seed)
+    degrees = ("Bachelor", "Master", "PhD")
+    return [
+        UserProfile(
+            id=i + 1,
+            name=f"Student {i}",
+            email=f"student{i}@example.edu",
+            education_level="High School",
+            program_interest=rng.choice(PROGRAM_TYPES),
+            budget_range=rng.choice(BUDGET_RANGES),
+            location_preference=rng.choice(LOCATIONS),
+            degree_level=json.dumps(rng.sample(degrees, rng.randint(0, 2))),
+            include_international=rng.choice(("true", "false")),
+        )
+        for i in range(count)
+    ]
+
+
+def timeit(fn: Callable, repeat: int = 5) -> float:
+    """Best-of-``repeat`` wall time of ``fn()`` in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
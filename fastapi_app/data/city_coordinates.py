@@ -0,0 +1,155 @@
+"""
+Offline coordinates for the cities design programs are located in.
+
+Keys use the same country names as the importer and CONTINENT_COUNTRIES; the
+importer fills College.latitude/longitude from this table by (location_city,
+location_country). Coordinates are city centres in decimal degrees (WGS 84).
+"""
+
+# Alternative spellings of countries mapped to the names used as keys below
+COUNTRY_ALIASES = {
+    "United States": "USA",
+    "United States of America": "USA",
+    "US": "USA",
+    "United Kingdom": "UK",
+    "Great Britain": "UK",
+    "England": "UK",
+    "Scotland": "UK",
+    "Wales": "UK",
+    "Korea": "South Korea",
+    "Republic of Korea": "South Korea",
+    "The Netherlands": "Netherlands",
+}
+
+CITY_COORDINATES = {
+    # North America
+    ("New York", "USA"): (40.7128, -74.0060),
+    ("Brooklyn", "USA"): (40.6782, -73.9442),
+    ("Providence", "USA"): (41.8240, -71.4128),
+    ("Valencia", "USA"): (34.4433, -118.6090),
+    ("Pasadena", "USA"): (34.1478, -118.1445),
+    ("Los Angeles", "USA"): (34.0522, -118.2437),
+    ("San Francisco", "USA"): (37.7749, -122.4194),
+    ("Savannah", "USA"): (32.0809, -81.0912),
+    ("Baltimore", "USA"): (39.2904, -76.6122),
+    ("Pittsburgh", "USA"): (40.4406, -79.9959),
+    ("Chicago", "USA"): (41.8781, -87.6298),
+    ("Boston", "USA"): (42.3601, -71.0589),
+    ("Cambridge", "USA"): (42.3736, -71.1097),
+    ("Philadelphia", "USA"): (39.9526, -75.1652),
+    ("Washington", "USA"): (38.9072, -77.0369),
+    ("Detroit", "USA"): (42.3314, -83.0458),
+    ("Bloomfield Hills", "USA"): (42.5836, -83.2455),
+    ("Cincinnati", "USA"): (39.1031, -84.5120),
+    ("Minneapolis", "USA"): (44.9778, -93.2650),
+    ("Seattle", "USA"): (47.6062, -122.3321),
+    ("Austin", "USA"): (30.2672, -97.7431),
+    ("Atlanta", "USA"): (33.7490, -84.3880),
+    ("Miami", "USA"): (25.7617, -80.1918),
+    ("Toronto", "Canada"): (43.6532, -79.3832),
+    ("Montreal", "Canada"): (45.5017, -73.5673),
+    ("Vancouver", "Canada"): (49.2827, -123.1207),
+    ("Halifax", "Canada"): (44.6488, -63.5752),
+    ("Mexico City", "Mexico"): (19.4326, -99.1332),
+    ("Guadalajara", "Mexico"): (20.6597, -103.3496),
+    # Europe
+    ("London", "UK"): (51.5074, -0.1278),
+    ("Edinburgh", "UK"): (55.9533, -3.1883),
+    ("Glasgow", "UK"): (55.8642, -4.2518),
+    ("Manchester", "UK"): (53.4808, -2.2426),
+    ("Leeds", "UK"): (53.8008, -1.5491),
+    ("Birmingham", "UK"): (52.4862, -1.8904),
+    ("Loughborough", "UK"): (52.7721, -1.2062),
+    ("Cambridge", "UK"): (52.2053, 0.1218),
+    ("Oxford", "UK"): (51.7520, -1.2577),
+    ("Brighton", "UK"): (50.8225, -0.1372),
+    ("Bournemouth", "UK"): (50.7192, -1.8808),
+    ("Falmouth", "UK"): (50.1526, -5.0663),
+    ("Dundee", "UK"): (56.4620, -2.9707),
+    ("Dublin", "Ireland"): (53.3498, -6.2603),
+    ("Copenhagen", "Denmark"): (55.6761, 12.5683),
+    ("Aarhus", "Denmark"): (56.1629, 10.2039),
+    ("Kolding", "Denmark"): (55.4904, 9.4722),
+    ("Milan", "Italy"): (45.4642, 9.1900),
+    ("Rome", "Italy"): (41.9028, 12.4964),
+    ("Florence", "Italy"): (43.7696, 11.2558),
+    ("Turin", "Italy"): (45.0703, 7.6869),
+    ("Venice", "Italy"): (45.4408, 12.3155),
+    ("Delft", "Netherlands"): (52.0116, 4.3571),
+    ("Amsterdam", "Netherlands"): (52.3676, 4.9041),
+    ("Eindhoven", "Netherlands"): (51.4416, 5.4697),
+    ("Rotterdam", "Netherlands"): (51.9244, 4.4777),
+    ("The Hague", "Netherlands"): (52.0705, 4.3007),
+    ("Umeå", "Sweden"): (63.8258, 20.2630),
+    ("Stockholm", "Sweden"): (59.3293, 18.0686),
+    ("Gothenburg", "Sweden"): (57.7089, 11.9746),
+    ("Lund", "Sweden"): (55.7047, 13.1910),
+    ("Helsinki", "Finland"): (60.1699, 24.9384),
+    ("Espoo", "Finland"): (60.2055, 24.6559),
+    ("Oslo", "Norway"): (59.9139, 10.7522),
+    ("Bergen", "Norway"): (60.3913, 5.3221),
+    ("Zurich", "Switzerland"): (47.3769, 8.5417),
+    ("Basel", "Switzerland"): (47.5596, 7.5886),
+    ("Geneva", "Switzerland"): (46.2044, 6.1432),
+    ("Lausanne", "Switzerland"): (46.5197, 6.6323),
+    ("Lucerne", "Switzerland"): (47.0502, 8.3093),
+    ("Weimar", "Germany"): (50.9795, 11.3235),
+    ("Berlin", "Germany"): (52.5200, 13.4050),
+    ("Munich", "Germany"): (48.1351, 11.5820),
+    ("Hamburg", "Germany"): (53.5511, 9.9937),
+    ("Stuttgart", "Germany"): (48.7758, 9.1829),
+    ("Cologne", "Germany"): (50.9375, 6.9603),
+    ("Dessau", "Germany"): (51.8330, 12.2420),
+    ("Offenbach", "Germany"): (50.0956, 8.7761),
+    ("Karlsruhe", "Germany"): (49.0069, 8.4037),
+    ("Paris", "France"): (48.8566, 2.3522),
+    ("Lyon", "France"): (45.7640, 4.8357),
+    ("Strasbourg", "France"): (48.5734, 7.7521),
+    ("Saint-Étienne", "France"): (45.4397, 4.3872),
+    ("Barcelona", "Spain"): (41.3851, 2.1734),
+    ("Madrid", "Spain"): (40.4168, -3.7038),
+    ("Valencia", "Spain"): (39.4699, -0.3763),
+    ("Brussels", "Belgium"): (50.8503, 4.3517),
+    ("Antwerp", "Belgium"): (51.2194, 4.4025),
+    ("Ghent", "Belgium"): (51.0543, 3.7174),
+    ("Lisbon", "Portugal"): (38.7223, -9.1393),
+    ("Porto", "Portugal"): (41.1579, -8.6291),
+    ("Vienna", "Austria"): (48.2082, 16.3738),
+    ("Linz", "Austria"): (48.3069, 14.2858),
+    ("Warsaw", "Poland"): (52.2297, 21.0122),
+    ("Kraków", "Poland"): (50.0647, 19.9450),
+    # Asia
+    ("Hong Kong", "Hong Kong"): (22.3193, 114.1694),
+    ("Beijing", "China"): (39.9042, 116.4074),
+    ("Shanghai", "China"): (31.2304, 121.4737),
+    ("Shenzhen", "China"): (22.5431, 114.0579),
+    ("Guangzhou", "China"): (23.1291, 113.2644),
+    ("Hangzhou", "China"): (30.2741, 120.1551),
+    ("Singapore", "Singapore"): (1.3521, 103.8198),
+    ("Tokyo", "Japan"): (35.6762, 139.6503),
+    ("Osaka", "Japan"): (34.6937, 135.5023),
+    ("Kyoto", "Japan"): (35.0116, 135.7681),
+    ("Seoul", "South Korea"): (37.5665, 126.9780),
+    ("Busan", "South Korea"): (35.1796, 129.0756),
+    ("Taipei", "Taiwan"): (25.0330, 121.5654),
+    ("Ahmedabad", "India"): (23.0225, 72.5714),
+    ("Mumbai", "India"): (19.0760, 72.8777),
+    ("New Delhi", "India"): (28.6139, 77.2090),
+    ("Bangalore", "India"): (12.9716, 77.5946),
+    ("Pune", "India"): (18.5204, 73.8567),
+    ("Bangkok", "Thailand"): (13.7563, 100.5018),
+    ("Kuala Lumpur", "Malaysia"): (3.1390, 101.6869),
+    ("Jakarta", "Indonesia"): (-6.2088, 106.8456),
+    ("Bandung", "Indonesia"): (-6.9175, 107.6191),
+    ("Manila", "Philippines"): (14.5995, 120.9842),
+    ("Ho Chi Minh City", "Vietnam"): (10.8231, 106.6297),
+    ("Hanoi", "Vietnam"): (21.0278, 105.8342),
+    # Australia
+    ("Melbourne", "Australia"): (-37.8136, 144.9631),
+    ("Sydney", "Australia"): (-33.8688, 151.2093),
+    ("Brisbane", "Australia"): (-27.4698, 153.0251),
+    ("Adelaide", "Australia"): (-34.9285, 138.6007),
+    ("Perth", "Australia"): (-31.9505, 115.8605),
+    ("Auckland", "New Zealand"): (-36.8485, 174.7633),
+    ("Wellington", "New Zealand"): (-41.2865, 174.7762),
+}
@@ -1,26 +1,159 @@
-from sqlalchemy import create_engine
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
+import importlib.util
 import os
 
-DB_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "data")
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+DB_DIR = os.path.join(PROJECT_ROOT, "data")
 os.makedirs(DB_DIR, exist_ok=True)
-DB_PATH = os.path.abspath(os.path.join(DB_DIR, "app.db"))
-SQLALCHEMY_DATABASE_URL = f"sqlite:///{DB_PATH}"
+DB_PATH = os.path.join(DB_DIR, "app.db")
+
+# Driver the async request path uses for each supported database
+ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg"}
+
+
+def project_path(path: str) -> str:
+    """``path`` with a relative path resolved against the project root rather than the working directory"""
+    return os.path.normpath(os.path.join(PROJECT_ROOT, path))
+
+
+def database_url(url: str) -> str:
+    """Validate a DATABASE_URL and resolve a relative SQLite path against the project root
+
+    The result no longer depends on the working directory the app is started
+    from. ``postgres://`` (as set by Heroku) is accepted as ``postgresql://``.
+    """
+    if url.startswith("postgres://"):
+        url = "postgresql://" + url[len("postgres://"):]
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"Unsupported DATABASE_URL backend {backend!r}; use one of: {', '.join(ASYNC_DRIVERS)}")
+    database = parsed.database
+    if backend == "sqlite" and database not in (None, "", ":memory:") and not database.startswith("file:"):
+        parsed = parsed.set(database=project_path(database))
+    return parsed.render_as_string(hide_password=False)
+
+
+def async_url(url: str) -> str:
+    """The same database through its async driver"""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    driver = ASYNC_DRIVERS[backend]
+    if importlib.util.find_spec(driver) is None:
+        raise ImportError(f"DATABASE_URL points to a {backend} database; install {driver} for the async request path")
+    return parsed.set(drivername=f"{backend}+{driver}").render_as_string(hide_password=False)
+
+
+def _connect_args(url: str) -> dict:
+    # SQLite connections are shared with the threadpool; other drivers take no such flag
+    return {"check_same_thread": False} if make_url(url).get_backend_name() == "sqlite" else {}
+
+
+SQLALCHEMY_DATABASE_URL = database_url(os.getenv("DATABASE_URL", f"sqlite:///{DB_PATH}"))
+
+# SQLite production profile: WAL lets readers run alongside the importer's
+# write transaction, and the pragmas below are set on every new connection
+SQLITE_TUNED = os.getenv("SQLITE_TUNED", "true").lower() == "true"
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536"))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+
+
+def read_only_url(url: str) -> str:
+    """The same SQLite file opened read-only; other databases are returned unchanged"""
+    parsed = make_url(url)
+    if parsed.get_backend_name() != "sqlite" or parsed.database in (None, "", ":memory:"):
+        return url
+    read_only = parsed.set(database=f"file:{parsed.database}", query={**parsed.query, "mode": "ro", "uri": "true"})
+    return read_only.render_as_string(hide_password=False)
+
+
+def tune_sqlite(engine: Engine, read_only: bool = False) -> None:
+    """Apply the production pragmas to every connection a SQLite engine opens"""
+    if engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        if not read_only:
+            # Persistent in the database file; a read-only connection cannot switch modes
+            cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}")
+        cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+        cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+        cursor.close()
+
+
+# Read-only connections for routes that only query; a replica URL can be given instead
+SQLALCHEMY_READ_DATABASE_URL = (
+    database_url(os.environ["DATABASE_READ_URL"]) if os.getenv("DATABASE_READ_URL")
+    else read_only_url(SQLALCHEMY_DATABASE_URL)
+)
+# Same databases through the async driver, used by the async request path
+ASYNC_DATABASE_URL = async_url(SQLALCHEMY_DATABASE_URL)
+ASYNC_READ_DATABASE_URL = async_url(SQLALCHEMY_READ_DATABASE_URL)
 
 engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+    SQLALCHEMY_DATABASE_URL, connect_args=_connect_args(SQLALCHEMY_DATABASE_URL)
 )
+read_engine = create_engine(
+    SQLALCHEMY_READ_DATABASE_URL, connect_args=_connect_args(SQLALCHEMY_READ_DATABASE_URL)
+)
+async_engine = create_async_engine(ASYNC_DATABASE_URL)
+async_read_engine = create_async_engine(ASYNC_READ_DATABASE_URL)
+if SQLITE_TUNED:
+    tune_sqlite(engine)
+    tune_sqlite(async_engine.sync_engine)
+    tune_sqlite(read_engine, read_only=True)
+    tune_sqlite(async_read_engine.sync_engine, read_only=True)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+AsyncReadSessionLocal = async_sessionmaker(async_read_engine, autoflush=False, expire_on_commit=False)
 
 Base = declarative_base()
 
 # Dependency
-from typing import Generator
+from typing import AsyncGenerator, Callable, Generator, TypeVar
+
+T = TypeVar("T")
 
 def get_db() -> Generator:
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_async_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """Session on the read-only engine, for routes that never write"""
+    async with AsyncReadSessionLocal() as db:
+        yield db
+
+
+async def run_in_session(session_factory: sessionmaker, fn: Callable[..., T], *args, **kwargs) -> T:
+    """Call ``fn(db, *args, **kwargs)`` with its own sync Session on a threadpool thread
+
+    AsyncSession.run_sync runs its function on the event loop and only awaits
+    the driver, so service calls that also do CPU-heavy work (feature matrices,
+    scoring, index builds) go through here instead. As with the async sessions,
+    returned objects stay loaded after the call commits.
+    """
+    def call() -> T:
+        with session_factory(expire_on_commit=False) as db:
+            return fn(db, *args, **kwargs)
+
+    return await run_in_threadpool(call)
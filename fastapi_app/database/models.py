@@ -1,7 +1,20 @@
-from sqlalchemy import Column, Integer, String, Float, Text, DateTime, Date, ForeignKey, UniqueConstraint, func
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Float, Text, DateTime, Date, ForeignKey, UniqueConstraint, Index, func
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.orm import deferred, relationship
 from .database import Base
 
+# CURRENT_TIMESTAMP has second precision; binding datetimes in the same format
+# keeps SQLite's text comparisons correct for keyset cursors and "changed since"
+# filters on these columns.
+Timestamp = DateTime().with_variant(
+    sqlite.DATETIME(storage_format="%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d"),
+    "sqlite",
+)
+
+# Deferred group of the large free-text College columns; ORM loads skip them
+# unless a query asks for them with undefer_group(TEXT_GROUP)
+TEXT_GROUP = "text"
+
 class College(Base):
     __tablename__ = "colleges"
 
@@ -15,15 +28,42 @@ class College(Base):
     tuition_min = Column(Float)
     tuition_max = Column(Float)
     application_deadline = Column(Date, nullable=True)
-    program_description = Column(Text, nullable=True)
-    admission_requirements = Column(Text, nullable=True)
+    program_description = deferred(Column(Text, nullable=True), group=TEXT_GROUP)
+    admission_requirements = deferred(Column(Text, nullable=True), group=TEXT_GROUP)
     contact_email = Column(String, nullable=True)
     website_url = Column(String, nullable=True)
-    created_at = Column(DateTime, server_default=func.current_timestamp())
-    updated_at = Column(DateTime, onupdate=func.current_timestamp())
+    # City coordinates in decimal degrees (see data/city_coordinates.py)
+    latitude = Column(Float, nullable=True)
+    longitude = Column(Float, nullable=True)
+    created_at = Column(Timestamp, server_default=func.current_timestamp())
+    updated_at = Column(Timestamp, onupdate=func.current_timestamp())
 
     __table_args__ = (
         UniqueConstraint("name", "program_name", "location_country", name="uq_college_program_country"),
+        # Keyset pagination order for list_colleges
+        Index("ix_colleges_name_id", "name", "id"),
+        # Remaining sort orders (see SORT_KEYS); descending orders scan these backwards
+        Index("ix_colleges_tuition_min_name_id", "tuition_min", "name", "id"),
+        Index("ix_colleges_location_name_id", "location_city", "location_country", "name", "id"),
+        Index("ix_colleges_program_type_name_id", "program_type", "name", "id"),
+    )
+
+class CollegeChange(Base):
+    """Catalog change log, written by triggers on colleges (see ChangeLogService)
+
+    version increases with every insert, update and delete; only the latest
+    change of each college is kept once an import has finished.
+    """
+    __tablename__ = "college_changes"
+
+    version = Column(Integer, primary_key=True)
+    college_id = Column(Integer, nullable=False)
+    op = Column(String, nullable=False)  # insert | update | delete
+
+    __table_args__ = (
+        Index("ix_college_changes_college_version", "college_id", "version"),
+        # AUTOINCREMENT: versions are never reused, whatever compaction removes
+        {"sqlite_autoincrement": True},
     )
 
 class UserProfile(Base):
@@ -38,7 +78,12 @@ class UserProfile(Base):
     location_preference = Column(String, nullable=False)
     degree_level = Column(Text, nullable=True)  # JSON string for list of degree levels
     include_international = Column(String, nullable=True, default="true")  # Store as string
-    created_at = Column(DateTime, server_default=func.current_timestamp())
+    created_at = Column(Timestamp, server_default=func.current_timestamp())
+
+    __table_args__ = (
+        # Keyset pagination order for list_user_profiles (newest first)
+        Index("ix_user_profiles_created_at_id", "created_at", "id"),
+    )
 
 class UserFavorite(Base):
     __tablename__ = "user_favorites"
@@ -52,4 +97,25 @@ class UserFavorite(Base):
 
     __table_args__ = (
         UniqueConstraint("user_email", "college_id", name="uq_favorite_user_college"),
-    ) 
\ No newline at end of file
+    )
+
+class FacetCount(Base):
+    """Maintained unfiltered facet counts over colleges (see FacetService)"""
+    __tablename__ = "college_facet_counts"
+
+    facet = Column(String, primary_key=True)
+    value = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+class ProfileMatch(Base):
+    """Materialized profile x college scores at or above the match threshold (see ProfileMatchService)"""
+    __tablename__ = "profile_matches"
+
+    profile_id = Column(Integer, ForeignKey("user_profiles.id"), primary_key=True)
+    college_id = Column(Integer, ForeignKey("colleges.id"), primary_key=True, index=True)
+    score = Column(Float, nullable=False)
+
+    __table_args__ = (
+        # Best matches first for one profile: scanned backwards by list_matches
+        Index("ix_profile_matches_profile_score", "profile_id", "score", "college_id"),
+    )
@@ -1,11 +1,37 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy import inspect, text
 
 from api.routes import health, colleges, admin, user_profiles
-from database.database import Base, engine
+from database.database import Base, engine, SessionLocal
+from api.services.catalog_service import CatalogService
+from api.services.change_log_service import ChangeLogService
+from api.services.college_service import MISSING_IDS_HEADER
+from api.services.facet_service import FacetService
+from api.services.geo_service import GeoService
+from api.services.profile_match_service import ProfileMatchService
+from api.services.suggest_service import SuggestService
+from api.services.pagination import NEXT_CURSOR_HEADER
+from api.services.text_search_service import TextSearchService
 
 # Create tables on startup if not exist
 Base.metadata.create_all(bind=engine)
+# create_all skips existing tables, so add nullable columns introduced since they were created
+_inspector = inspect(engine)
+for table in Base.metadata.sorted_tables:
+    existing = {column["name"] for column in _inspector.get_columns(table.name)}
+    for column in table.columns:
+        if column.name not in existing:
+            with engine.begin() as conn:
+                conn.execute(text(
+                    f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column.type.compile(engine.dialect)}"
+                ))
+# create_all skips existing tables, so add indexes introduced since they were created
+for table in Base.metadata.sorted_tables:
+    for index in table.indexes:
+        index.create(bind=engine, checkfirst=True)
+TextSearchService.ensure_index(engine)
+ChangeLogService.ensure(engine)
 
 app = FastAPI(title="College Design Programs API", version="0.1.0")
 
@@ -21,6 +47,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, MISSING_IDS_HEADER, "ETag"],
 )
 
 # Routers
@@ -30,6 +57,21 @@ app.include_router(admin.router, prefix="/api/admin", tags=["admin"])
 app.include_router(user_profiles.router, prefix="/api/user-profiles", tags=["user-profiles"]) 
 
 
+@app.on_event("startup")
+def load_catalog():
+    # Build the in-memory search catalog and suggestion index (and facet counts,
+    # coordinates and profile matches on first run) before serving requests
+    db = SessionLocal()
+    try:
+        FacetService.ensure(db)
+        GeoService.ensure(db)
+        CatalogService.load(db)
+        SuggestService.refresh(db)
+        ProfileMatchService.ensure(db)
+    finally:
+        db.close()
+
+
 @app.get("/", tags=["health"]) 
 async def root():
     return {"message": "College Design Programs API is running"}
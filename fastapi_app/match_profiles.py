@@ -0,0 +1,60 @@
+"""
+Batch-match user profiles against the college catalog from the command line.
+
+Writes the same NDJSON as POST /api/user-profiles/matches, one line per profile.
+Read-only: it scores against a private catalog built from the database and
+never publishes a catalog snapshot. Run from the fastapi_app directory, e.g.
+
+    python match_profiles.py --emails-file class_of_2026.txt --k 20 -o matches.ndjson
+    python match_profiles.py --program-interest Fashion --location-preference Europe
+"""
+
+import argparse
+import json
+import sys
+
+from database.database import ReadSessionLocal
+from api.schemas.recommendation import ProfileFilter
+from api.services.catalog_service import CatalogService
+from api.services.recommendation_service import CatalogFeatures, RecommendationService
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--email", action="append", dest="emails", help="profile email (repeatable)")
+    parser.add_argument("--emails-file", help="file with one profile email per line")
+    for field in ProfileFilter.model_fields:
+        parser.add_argument(f"--{field.replace('_', '-')}", dest=field, help=f"only profiles with this {field}")
+    parser.add_argument("--k", type=int, default=10, help="matches per profile (default 10)")
+    parser.add_argument("--min-score", type=float, default=None, help="drop matches scoring below this")
+    parser.add_argument("-o", "--output", help="output file (default stdout)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+
+    emails = list(args.emails or [])
+    if args.emails_file:
+        with open(args.emails_file, encoding="utf-8") as f:
+            emails.extend(line.strip() for line in f if line.strip())
+    filters = ProfileFilter(**{field: getattr(args, field) for field in ProfileFilter.model_fields})
+
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    db = ReadSessionLocal()
+    try:
+        # A local catalog: refresh() would publish a snapshot over the one the API workers map
+        features = CatalogFeatures(CatalogService.build(db))
+        for result in RecommendationService.batch_matches(
+            db, emails or None, filters, k=args.k, min_score=args.min_score, features=features
+        ):
+            out.write(json.dumps(result) + "\n")
+    finally:
+        db.close()
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,64 @@
+"""
+Shared fixtures: the app running against a throwaway SQLite database
+
+DATABASE_URL has to be set before database.database is imported, so this
+module configures the environment before importing the app.
+"""
+
+import os
+import sys
+import tempfile
+from datetime import date
+
+_DB_DIR = tempfile.mkdtemp(prefix="college-api-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_DB_DIR, 'app.db')}"
+os.environ["CATALOG_SNAPSHOT_DIR"] = ""
+os.environ["IMPORT_JOBS_DIR"] = os.path.join(_DB_DIR, "import_jobs")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from fastapi.testclient import TestClient
+
+from database.database import SessionLocal
+from database.models import College
+
+# Graphic design programs in London, one of them with an application deadline
+COLLEGES = [
+    dict(
+        name="Royal College of Art", location_city="London", location_country="UK",
+        program_name="MA Visual Communication", program_type="Graphic Design", degree_level="Master",
+        tuition_min=25000, tuition_max=35000, application_deadline=date(2027, 1, 15),
+        program_description="Visual communication and typography studio",
+    ),
+    dict(
+        name="Central Saint Martins", location_city="London", location_country="UK",
+        program_name="BA Graphic Communication Design", program_type="Graphic Design", degree_level="Bachelor",
+        tuition_min=22000, tuition_max=30000,
+        program_description="Graphic communication design studio",
+    ),
+]
+
+
+@pytest.fixture(scope="session")
+def client():
+    import main
+
+    db = SessionLocal()
+    try:
+        db.add_all(College(**college) for college in COLLEGES)
+        db.commit()
+    finally:
+        db.close()
+    with TestClient(main.app) as client:
+        yield client
+
+
+@pytest.fixture(scope="session")
+def deadline_college(client) -> dict:
+    """The seeded college with an application deadline, with its id"""
+    db = SessionLocal()
+    try:
+        college_id = db.query(College.id).filter(College.name == COLLEGES[0]["name"]).scalar()
+    finally:
+        db.close()
+    return {**COLLEGES[0], "id": college_id}
@@ -0,0 +1,45 @@
+"""
+A catalog snapshot published by another worker's import
+"""
+
+import os
+
+from database.database import SessionLocal
+from database.models import College
+from api.services import catalog_service
+from api.services.catalog_service import GENERATION_FILE, RESPONSE_COLUMNS, CatalogService
+from api.services.catalog_snapshot import write_snapshot
+
+SEARCH = {"program_type": "Product Design"}
+
+
+def publish_as_other_worker(directory: str) -> None:
+    """Add a college and publish the rebuilt catalog the way CatalogService._publish does"""
+    db = SessionLocal()
+    try:
+        db.add(College(
+            name="Yarrow Institute", location_city="Dublin", location_country="Ireland",
+            program_name="BSc Product Design", program_type="Product Design", degree_level="Bachelor",
+        ))
+        db.commit()
+        version = CatalogService.compute_version(db)
+        catalog = CatalogService.build(db)
+    finally:
+        db.close()
+    write_snapshot(os.path.join(directory, "catalog-other.snap"), catalog, RESPONSE_COLUMNS, (version.etag, None))
+    with open(os.path.join(directory, GENERATION_FILE), "w") as fh:
+        fh.write("catalog-other.snap")
+
+
+def test_published_snapshot_reaches_derived_state(client, tmp_path, monkeypatch):
+    monkeypatch.setattr(catalog_service, "SNAPSHOT_DIR", str(tmp_path))
+    monkeypatch.setattr(catalog_service, "_snapshot_name", "catalog-own.snap")
+    # Cached before the other worker's import
+    assert client.post("/api/colleges/search", json=SEARCH).json() == []
+    assert client.get("/api/colleges/suggest", params={"q": "Yarrow"}).json() == []
+
+    publish_as_other_worker(str(tmp_path))
+    monkeypatch.setattr(catalog_service, "_next_poll", 0.0)
+
+    assert [c["name"] for c in client.post("/api/colleges/search", json=SEARCH).json()] == ["Yarrow Institute"]
+    assert [s["text"] for s in client.get("/api/colleges/suggest", params={"q": "Yarrow"}).json()] == ["Yarrow Institute"]
@@ -0,0 +1,91 @@
+"""
+College routes that validate rows against CollegeResponse
+
+application_deadline is a Date column; these cover a row that has one set.
+"""
+
+
+def test_detail_with_deadline(client, deadline_college):
+    response = client.get(f"/api/colleges/{deadline_college['id']}")
+    assert response.status_code == 200
+    assert response.json()["application_deadline"] == deadline_college["application_deadline"].isoformat()
+
+
+def test_near_with_deadline(client, deadline_college):
+    response = client.get("/api/colleges/near", params={"city": "London", "radius_km": 50})
+    assert response.status_code == 200
+    nearby = {c["id"]: c for c in response.json()}
+    # Encoded the same way as the list path
+    listed = client.get("/api/colleges/", params={"ids": str(deadline_college["id"])}).json()[0]
+    assert nearby[deadline_college["id"]]["application_deadline"] == listed["application_deadline"]
+    assert listed["application_deadline"] == deadline_college["application_deadline"].isoformat()
+
+
+def test_text_search_with_deadline(client, deadline_college):
+    response = client.get("/api/colleges/text-search", params={"q": "typography"})
+    assert response.status_code == 200
+    results = response.json()
+    assert [r["id"] for r in results] == [deadline_college["id"]]
+    assert results[0]["application_deadline"] == deadline_college["application_deadline"].isoformat()
+
+
+def test_suggestions_follow_catalog_generation(client):
+    from api.services.catalog_service import CatalogService
+    from database.database import SessionLocal
+    from database.models import College
+
+    assert client.get("/api/colleges/suggest", params={"q": "Zetland"}).json() == []
+    db = SessionLocal()
+    try:
+        db.add(College(
+            name="Zetland School of Design", location_city="Oslo", location_country="Norway",
+            program_name="BA Interaction Design", program_type="UX/UI", degree_level="Bachelor",
+        ))
+        db.commit()
+        # What a worker does when it maps the snapshot another worker's import published
+        CatalogService.refresh(db)
+    finally:
+        db.close()
+    suggestions = client.get("/api/colleges/suggest", params={"q": "Zetland"}).json()
+    assert [s["text"] for s in suggestions] == ["Zetland School of Design"]
+
+
+def test_malformed_cursor_is_rejected_before_revalidation(client):
+    etag = client.get("/api/colleges/").headers["etag"]
+    response = client.get("/api/colleges/", params={"cursor": "not-a-cursor"}, headers={"If-None-Match": etag})
+    assert response.status_code == 400
+
+
+def test_list_etag_tracks_sql_without_in_memory_catalog(client, monkeypatch):
+    from api.services import catalog_service
+    from database.database import SessionLocal
+    from database.models import College
+
+    monkeypatch.setattr(catalog_service, "CATALOG_ENABLED", False)
+    monkeypatch.setattr(catalog_service, "_catalog", None)
+    etag = client.get("/api/colleges/").headers["etag"]
+    assert client.get("/api/colleges/", headers={"If-None-Match": etag}).status_code == 304
+
+    # Written by another worker: this process's cached catalog version does not move
+    db = SessionLocal()
+    try:
+        db.add(College(
+            name="Aalborg Design Lab", location_city="Aalborg", location_country="Denmark",
+            program_name="MSc Service Design", program_type="UX/UI", degree_level="Master",
+        ))
+        db.commit()
+    finally:
+        db.close()
+    response = client.get("/api/colleges/", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert "Aalborg Design Lab" in [c["name"] for c in response.json()]
+
+
+def test_export_respects_refused_gzip(client):
+    refused = client.get("/api/colleges/export", params={"format": "csv"}, headers={"Accept-Encoding": "gzip;q=0, identity"})
+    assert refused.status_code == 200
+    assert "content-encoding" not in refused.headers
+    assert "Royal College of Art" in refused.text
+
+    accepted = client.get("/api/colleges/export", params={"format": "csv"}, headers={"Accept-Encoding": "br, gzip;q=0.5"})
+    assert accepted.headers["content-encoding"] == "gzip"
@@ -0,0 +1,47 @@
+"""
+Background import job state, shared between workers through IMPORT_JOBS_DIR
+"""
+
+from api.services import import_job_service
+from api.services.import_job_service import ImportJob, ImportJobService
+
+ADMIN = {"X-Admin-Token": "test"}
+
+
+def test_status_of_a_job_accepted_by_another_worker(client):
+    # Written the way the worker that accepted the upload records it
+    job = ImportJob("colleges.xlsx", {"bulk": True})
+    job.status = "completed"
+    job.report = {"inserted": 3, "updated": 1, "skipped": 0}
+    ImportJobService._save(job)
+
+    response = client.get("/api/admin/colleges/import-status", params={"job_id": job.id}, headers=ADMIN)
+    assert response.status_code == 200
+    assert response.json()["job"]["status"] == "completed"
+    assert response.json()["job"]["report"] == job.report
+
+
+def test_unknown_job(client):
+    response = client.get("/api/admin/colleges/import-status", params={"job_id": "../../etc/passwd"}, headers=ADMIN)
+    assert response.status_code == 404
+
+
+def test_eviction_keeps_unfinished_jobs(monkeypatch):
+    monkeypatch.setattr(import_job_service, "MAX_TRACKED_JOBS", 2)
+    running = ImportJob("running.xlsx", {})
+    running.status = "running"
+    ImportJobService._save(running)
+    for _ in range(3):
+        finished = ImportJob("done.xlsx", {})
+        finished.status = "failed"
+        ImportJobService._save(finished)
+
+    ImportJobService._evict()
+    jobs = ImportJobService._jobs()
+    assert len(jobs) == 2
+    assert running.id in {job.id for job in jobs}
+    assert jobs[-1].id == finished.id
+
+
+def test_status_requires_admin(client):
+    assert client.get("/api/admin/colleges/import-status").status_code == 401
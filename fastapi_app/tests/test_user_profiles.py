@@ -0,0 +1,55 @@
+"""
+Profile routes that return catalog programs, and profile writes
+"""
+
+import pytest
+
+PROFILE = {
+    "name": "Test User",
+    "education_level": "Undergraduate",
+    "program_interest": "Graphic Design",
+    "budget_range": "20k-40k",
+    "location_preference": "Europe",
+    "degree_level": ["Bachelor", "Master"],
+    "include_international": True,
+}
+
+
+def create_profile(client, email: str) -> dict:
+    response = client.post("/api/user-profiles/", json={**PROFILE, "email": email})
+    assert response.status_code == 201
+    return response.json()
+
+
+def test_recommendations_with_deadline(client, deadline_college):
+    create_profile(client, "recommend@example.com")
+    response = client.get("/api/user-profiles/recommend@example.com/recommendations")
+    assert response.status_code == 200
+    recommended = {r["id"]: r for r in response.json()}
+    assert recommended[deadline_college["id"]]["application_deadline"] == deadline_college["application_deadline"].isoformat()
+
+
+def test_matches_with_deadline(client, deadline_college):
+    create_profile(client, "matches@example.com")
+    response = client.get("/api/user-profiles/matches@example.com/matches")
+    assert response.status_code == 200
+    matches = {m["id"]: m for m in response.json()}
+    assert matches[deadline_college["id"]]["application_deadline"] == deadline_college["application_deadline"].isoformat()
+
+
+def test_failed_match_refresh_keeps_profile_unchanged(client, monkeypatch):
+    from api.services.profile_match_service import ProfileMatchService
+
+    create_profile(client, "atomic@example.com")
+    matches = client.get("/api/user-profiles/atomic@example.com/matches").json()
+
+    def fail(db, profile):
+        raise RuntimeError("rescore failed")
+
+    monkeypatch.setattr(ProfileMatchService, "refresh_profile", fail)
+    with pytest.raises(RuntimeError):
+        client.put("/api/user-profiles/atomic@example.com", json={"program_interest": "Fashion"})
+    monkeypatch.undo()
+
+    assert client.get("/api/user-profiles/atomic@example.com").json()["program_interest"] == "Graphic Design"
+    assert client.get("/api/user-profiles/atomic@example.com/matches").json() == matches
@@ -139,38 +139,24 @@ def location_matches(college: Dict[str, Any], location: str) -> bool:
     
     return True
 
+# Sort labels and the matching ``sort`` value of the API search/list endpoints,
+# which return results already in that order
+SORT_OPTIONS = {
+    "Name (A-Z)": "name_asc",
+    "Name (Z-A)": "name_desc",
+    "Tuition (Low to High)": "tuition_asc",
+    "Tuition (High to Low)": "tuition_desc",
+    "Location (A-Z)": "location",
+    "Program Type (A-Z)": "program_type",
+}
+
 def create_sort_options():
     """Create sorting options for results"""
     
     sort_by = st.selectbox(
         "Sort by",
-        [
-            "Name (A-Z)",
-            "Name (Z-A)", 
-            "Tuition (Low to High)",
-            "Tuition (High to Low)",
-            "Location (A-Z)",
-            "Program Type (A-Z)"
-        ],
+        list(SORT_OPTIONS),
         index=0
     )
     
     return sort_by
-
-def sort_results(results: List[Dict[str, Any]], sort_by: str) -> List[Dict[str, Any]]:
-    """Sort results based on criteria"""
-    
-    if sort_by == "Name (A-Z)":
-        return sorted(results, key=lambda x: x.get('name', ''))
-    elif sort_by == "Name (Z-A)":
-        return sorted(results, key=lambda x: x.get('name', ''), reverse=True)
-    elif sort_by == "Tuition (Low to High)":
-        return sorted(results, key=lambda x: x.get('tuition_min', 0))
-    elif sort_by == "Tuition (High to Low)":
-        return sorted(results, key=lambda x: x.get('tuition_min', 0), reverse=True)
-    elif sort_by == "Location (A-Z)":
-        return sorted(results, key=lambda x: f"{x.get('location_city', '')}, {x.get('location_country', '')}")
-    elif sort_by == "Program Type (A-Z)":
-        return sorted(results, key=lambda x: x.get('program_type', ''))
-    
-    return results 
\ No newline at end of file
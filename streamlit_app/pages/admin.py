@@ -3,10 +3,15 @@ Admin page for data management and Excel file upload.
 Allows administrators to upload college data and view system status.
 """
 
+import time
+import requests
 import streamlit as st
 import pandas as pd
 from io import BytesIO
-from utils.config import get_admin_headers
+from email.utils import parsedate_to_datetime
+from utils.config import get_admin_headers, get_api_headers, get_api_url
+
+IMPORT_POLL_INTERVAL = 1.0  # seconds between import-status requests
 
 def show():
     """Display the admin page"""
@@ -68,48 +73,37 @@ def show():
     st.markdown("---")
     st.markdown('<h2 class="sub-header">📈 System Status</h2>', unsafe_allow_html=True)
     
-    # Mock status for now (replace with API calls later)
+    facets = fetch_facets()
+    last_update = fetch_last_update()
+    
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        st.metric("Total Colleges", "100+")
+        st.metric("Total Colleges", f"{facets['total']:,}" if facets else "—")
     
     with col2:
-        st.metric("Last Update", "2024-01-15")
+        st.metric("Last Update", last_update.strftime("%Y-%m-%d %H:%M UTC") if last_update else "—")
     
     with col3:
-        st.metric("System Status", "🟢 Online")
+        st.metric("System Status", "🟢 Online" if facets else "🔴 Offline")
     
     # Data statistics
     st.markdown('<h3>📊 Data Statistics</h3>', unsafe_allow_html=True)
     
-    stats_col1, stats_col2 = st.columns(2)
-    
-    with stats_col1:
-        st.markdown("### Program Types")
-        program_stats = {
-            "Graphic Design": 25,
-            "UX/UI": 20,
-            "Fashion": 15,
-            "Product Design": 18,
-            "Architecture": 12,
-            "Animation": 10
-        }
+    if not facets:
+        st.warning("Could not load statistics from the API.")
+    else:
+        stats_col1, stats_col2 = st.columns(2)
         
-        for program, count in program_stats.items():
-            st.markdown(f"• **{program}:** {count} programs")
-    
-    with stats_col2:
-        st.markdown("### Locations")
-        location_stats = {
-            "North America": 45,
-            "Europe": 35,
-            "Asia": 15,
-            "Australia": 5
-        }
+        with stats_col1:
+            st.markdown("### Program Types")
+            for program, count in facets["program_type"].items():
+                st.markdown(f"• **{program}:** {count} programs")
         
-        for location, count in location_stats.items():
-            st.markdown(f"• **{location}:** {count} programs")
+        with stats_col2:
+            st.markdown("### Locations")
+            for location, count in facets["continent"].items():
+                st.markdown(f"• **{location}:** {count} programs")
     
     # Help section
     with st.expander("ℹ️ Excel File Format"):
@@ -172,27 +166,86 @@ def show():
         - Contact system administrator
         """)
 
+def fetch_facets():
+    """Catalog-wide counts from the API, or None if it is unreachable"""
+    try:
+        response = requests.get(get_api_url("/api/colleges/facets"), headers=get_api_headers(), timeout=10)
+        response.raise_for_status()
+        return response.json()
+    except (requests.RequestException, ValueError):
+        return None
+
+def fetch_last_update():
+    """When the catalog last changed (the list endpoint's Last-Modified), or None if unknown"""
+    try:
+        response = requests.get(
+            get_api_url("/api/colleges/"), params={"limit": 1, "fields": "id"},
+            headers=get_api_headers(), timeout=10
+        )
+        response.raise_for_status()
+        last_modified = response.headers.get("Last-Modified")
+        return parsedate_to_datetime(last_modified) if last_modified else None
+    except (requests.RequestException, TypeError, ValueError):
+        return None
+
 def upload_to_database(file):
-    """Upload file to database (placeholder for API integration)"""
+    """Upload file to the API and poll the background import until it finishes"""
+    
+    headers = get_admin_headers()
+    headers.pop('Content-Type', None)  # requests sets the multipart boundary
+    
+    try:
+        response = requests.post(
+            get_api_url("/api/admin/colleges/import-excel"),
+            headers=headers,
+            files={"file": (file.name, file.getvalue())},
+            timeout=60,
+        )
+        response.raise_for_status()
+    except requests.RequestException as e:
+        st.error(f"❌ Upload failed: {str(e)}")
+        return
+    
+    status_url = get_api_url(response.json()["status_url"])
+    progress_text = st.empty()
+    
+    with st.spinner("Importing data into the database..."):
+        while True:
+            try:
+                job = requests.get(status_url, headers=headers, timeout=10).json()["job"]
+            except (requests.RequestException, KeyError, ValueError) as e:
+                st.error(f"❌ Could not fetch import status: {str(e)}")
+                return
+            
+            if job["status"] in ("completed", "failed", "post_processing_failed"):
+                break
+            
+            progress_text.info(
+                f"Processed {job['rows_processed']:,} rows ({job['rows_per_second']:,.0f} rows/s) - "
+                f"{job['inserted']:,} new, {job['updated']:,} updated, {job['skipped']:,} skipped"
+            )
+            time.sleep(IMPORT_POLL_INTERVAL)
     
-    with st.spinner("Uploading data to database..."):
-        # Simulate upload process
-        import time
-        time.sleep(2)
-        
-        # Mock response (replace with actual API call)
-        st.success("✅ Data uploaded successfully!")
-        st.info("Uploaded 100 new college programs to the database.")
-        
-        # Show upload summary
-        st.markdown("### 📊 Upload Summary")
-        
-        summary_col1, summary_col2 = st.columns(2)
-        
-        with summary_col1:
-            st.metric("New Programs", "100")
-            st.metric("Updated Programs", "0")
-        
-        with summary_col2:
-            st.metric("Skipped", "0")
-            st.metric("Errors", "0") 
\ No newline at end of file
+    progress_text.empty()
+    
+    if job["status"] == "failed":
+        st.error(f"❌ Import failed: {job['error']}")
+        return
+    if job["status"] == "post_processing_failed":
+        st.warning(f"⚠️ {job['error']}")
+    
+    report = job["report"]
+    st.success("✅ Data uploaded successfully!")
+    st.info(f"Imported {job['rows_processed']:,} rows at {job['rows_per_second']:,.0f} rows/s.")
+    
+    # Show upload summary
+    st.markdown("### 📊 Upload Summary")
+    
+    summary_col1, summary_col2 = st.columns(2)
+    
+    with summary_col1:
+        st.metric("New Programs", report["inserted"])
+        st.metric("Updated Programs", report["updated"])
+    
+    with summary_col2:
+        st.metric("Skipped", report["skipped"])
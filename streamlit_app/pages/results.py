@@ -3,22 +3,26 @@ Results page for displaying college search results.
 Shows matching colleges with filtering options and college cards.
 """
 
+import requests
 import streamlit as st
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
+from utils.config import get_api_headers, get_api_url
 from utils.session_state import (
-    get_search_results, get_search_filters, set_selected_college,
+    get_search_filters, set_search_results, set_selected_college,
     add_to_favorites, remove_from_favorites, is_favorite
 )
 from components.cards import create_college_card
-from components.filters import create_results_filter
+from components.filters import SORT_OPTIONS, create_results_filter, create_sort_options
+
+SEARCH_CACHE_TTL = 60  # seconds a fetched result list is reused across reruns
+TUITION_SLIDER_MAX = 100000  # slider value meaning "no tuition limit"
 
 def show():
     """Display the search results page"""
     
     st.markdown('<h1 class="main-header">📋 Search Results</h1>', unsafe_allow_html=True)
     
-    # Get current search results and filters
-    results = get_search_results()
+    # Get current search filters
     filters = get_search_filters()
     
     # Check if user has searched
@@ -41,13 +45,22 @@ def show():
     # Results filter section
     st.markdown('<h2 class="sub-header">Filter Results</h2>', unsafe_allow_html=True)
     
-    # Mock results for now (replace with API call later)
-    if not results:
-        # Generate mock results for demonstration
-        results = generate_mock_results(filters)
-    
-    # Apply additional filters
-    filtered_results = apply_filters(results)
+    # The API filters and sorts the results
+    sort_by = create_sort_options()
+    degree_levels, max_tuition = additional_filters()
+    filtered_results = fetch_results(
+        filters.get('program_type'), filters.get('budget_range'), filters.get('location'),
+        tuple(degree_levels), max_tuition, SORT_OPTIONS[sort_by]
+    )
+    if filtered_results is None:
+        st.warning("Could not reach the API; showing example programs instead.")
+        filtered_results = [
+            r for r in generate_mock_results(filters)
+            if (not degree_levels or r.get('degree_level') in degree_levels)
+            and (max_tuition is None or (r.get('tuition_max') or 0) <= max_tuition)
+        ]
+    else:
+        set_search_results(filtered_results)
     
     # Display results count
     st.markdown(f"### Found {len(filtered_results)} matching programs")
@@ -82,6 +95,33 @@ def show():
             if st.button("📧 Email Results", use_container_width=True):
                 st.info("Email functionality will be implemented later.")
 
+@st.cache_data(ttl=SEARCH_CACHE_TTL, show_spinner=False)
+def fetch_results(
+    program_type: Optional[str],
+    budget_range: Optional[str],
+    location: Optional[str],
+    degree_levels: Tuple[str, ...],
+    max_tuition: Optional[int],
+    sort: str,
+) -> Optional[List[Dict[str, Any]]]:
+    """Matching programs from POST /api/colleges/search/multi in ``sort`` order, or None if the API is unreachable"""
+    payload = {
+        "program_types": [program_type] if program_type else [],
+        "budget_ranges": [budget_range] if budget_range else [],
+        "locations": [location] if location else [],
+        "degree_levels": list(degree_levels),
+        "max_tuition": max_tuition,
+        "sort": sort,
+    }
+    try:
+        response = requests.post(
+            get_api_url("/api/colleges/search/multi"), json=payload, headers=get_api_headers(), timeout=10
+        )
+        response.raise_for_status()
+        return response.json()
+    except (requests.RequestException, ValueError):
+        return None
+
 def show_favorites():
     """Display favorites page"""
     
@@ -108,33 +148,20 @@ def show_favorites():
 def display_results(results: List[Dict[str, Any]]):
     """Display search results as cards"""
     
-    # Sort options
-    col1, col2 = st.columns([3, 1])
-    
-    with col1:
-        sort_by = st.selectbox(
-            "Sort by",
-            ["Name (A-Z)", "Name (Z-A)", "Tuition (Low to High)", "Tuition (High to Low)"],
-            index=0
-        )
-    
-    with col2:
-        results_per_page = st.selectbox("Results per page", [10, 20, 50], index=1)
-    
-    # Sort results
-    sorted_results = sort_results(results, sort_by)
+    # Results arrive already sorted by the API
+    results_per_page = st.selectbox("Results per page", [10, 20, 50], index=1)
     
     # Pagination
-    total_results = len(sorted_results)
+    total_results = len(results)
     total_pages = (total_results + results_per_page - 1) // results_per_page
     
     if total_pages > 1:
         page = st.selectbox(f"Page (1-{total_pages})", range(1, total_pages + 1), index=0)
         start_idx = (page - 1) * results_per_page
         end_idx = min(start_idx + results_per_page, total_results)
-        page_results = sorted_results[start_idx:end_idx]
+        page_results = results[start_idx:end_idx]
     else:
-        page_results = sorted_results
+        page_results = results
     
     # Display results
     for i, college in enumerate(page_results):
@@ -142,8 +169,8 @@ def display_results(results: List[Dict[str, Any]]):
             create_college_card(college)
             st.markdown("---")
 
-def apply_filters(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Apply additional filters to results"""
+def additional_filters() -> Tuple[List[str], Optional[int]]:
+    """Degree level and tuition filters; returns (degree levels, max tuition or None for no limit)"""
     
     # Additional filter options
     st.markdown("### Additional Filters")
@@ -161,34 +188,12 @@ def apply_filters(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         tuition_filter = st.slider(
             "Max Tuition (per year)",
             min_value=0,
-            max_value=100000,
-            value=100000,
+            max_value=TUITION_SLIDER_MAX,
+            value=TUITION_SLIDER_MAX,
             step=5000
         )
     
-    # Apply filters
-    filtered = results.copy()
-    
-    if degree_filter:
-        filtered = [r for r in filtered if r.get('degree_level') in degree_filter]
-    
-    filtered = [r for r in filtered if r.get('tuition_max', 0) <= tuition_filter]
-    
-    return filtered
-
-def sort_results(results: List[Dict[str, Any]], sort_by: str) -> List[Dict[str, Any]]:
-    """Sort results based on criteria"""
-    
-    if sort_by == "Name (A-Z)":
-        return sorted(results, key=lambda x: x.get('name', ''))
-    elif sort_by == "Name (Z-A)":
-        return sorted(results, key=lambda x: x.get('name', ''), reverse=True)
-    elif sort_by == "Tuition (Low to High)":
-        return sorted(results, key=lambda x: x.get('tuition_min', 0))
-    elif sort_by == "Tuition (High to Low)":
-        return sorted(results, key=lambda x: x.get('tuition_min', 0), reverse=True)
-    
-    return results
+    return degree_filter, None if tuition_filter == TUITION_SLIDER_MAX else tuition_filter
 
 def generate_mock_results(filters: Dict[str, Any]) -> List[Dict[str, Any]]:
     """Generate mock results for demonstration (replace with API call later)"""